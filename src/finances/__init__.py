@@ -1,8 +1,16 @@
 """Finance-related utilities geared toward United States tax law."""
 
 from .metadata import VERSION as __version__
-from .earnings import Earnings, EarningsTaxPolicy, EarningsType, TaxCategory
+from .earnings import (
+    Earnings,
+    EarningsBatch,
+    EarningsTaxPolicy,
+    EarningsType,
+    TaxCategory,
+)
 from .money import Money
+from .money_array import MoneyArray
 from .utilities import Addable, AddableComparable, Comparable, Growable, Range
 from .value import Value
-from . import tax
+from .value_array import ValueArray
+from . import inflation, tax
@@ -3,11 +3,13 @@
 """An example script that uses this module to calculate income tax."""
 
 import sys
+from argparse import ArgumentParser, FileType
+from typing import Callable, cast, Dict, List, Optional, TextIO
 
+from .batch import DEFAULT_CHUNK_SIZE, INPUT_FORMATS, run_batch
 from .earnings import Earnings, TaxCategory
 from .money import Money
-from .tax import FederalIncomeTax, FICATax, FilingStatus
-from .tax.state.mi import MichiganIncomeTax
+from .tax import DEFAULT_TAX_SYSTEM, FilingStatus
 
 
 def print_taxes(
@@ -30,9 +32,6 @@ def print_taxes(
         deductions - The deductions for the year.
         personal_exemption - The Michigan personal exemption for the year.
     """
-    fed_income_tax = FederalIncomeTax(year, FilingStatus.SINGLE)
-    mi_income_tax = MichiganIncomeTax(year)
-    fica = FICATax(year, FilingStatus.SINGLE)
     income = Earnings(
         gross_income=gross_income,
         adjustments={
@@ -48,18 +47,13 @@ def print_taxes(
             TaxCategory.STATE: Money.ZERO,
         },
     )
-    taxes = sum(
-        [
-            fed_income_tax.calculate(income),
-            mi_income_tax.calculate(income),
-            fica.calculate(income),
-        ],
-        start=Money.ZERO,
-    )
+    taxes = DEFAULT_TAX_SYSTEM.compiled_stack(
+        year, FilingStatus.SINGLE, "MI"
+    ).calculate(income)
     print(f"{year} taxes on {gross_income}: {taxes}")
 
 
-def main() -> int:
+def interactive() -> int:
     """Prints the amount of federal taxes on some money in 2021 and 2022."""
     gross_income = Money.parse(input("Gross income: "))
     adjustments = Money.parse(input("Adjustments: "))
@@ -81,5 +75,206 @@ def main() -> int:
     return 0
 
 
+def batch(arguments: List[str]) -> int:
+    """Evaluates a file of taxpayers, as described by --help."""
+    parser = ArgumentParser(
+        prog="finances batch",
+        description="Calculate the taxes of a CSV or JSONL file of taxpayers.",
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        type=FileType("r", encoding="utf-8"),
+        default=sys.stdin,
+        help="The file of taxpayers to read (default: stdin)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=FileType("w", encoding="utf-8"),
+        default=sys.stdout,
+        help="The file to write results to (default: stdout)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=INPUT_FORMATS,
+        help="The input and output format (default: from the input's name)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        metavar="ROWS",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="The number of rows to evaluate at once",
+    )
+    parser.add_argument(
+        "--workers",
+        metavar="N",
+        type=int,
+        default=0,
+        help="The number of worker processes (default: none)",
+    )
+    args = parser.parse_args(arguments)
+
+    input_file = cast(TextIO, args.input)
+    input_format = cast(Optional[str], args.format)
+    if input_format is None:
+        is_jsonl = input_file.name.endswith((".jsonl", ".ndjson"))
+        input_format = "jsonl" if is_jsonl else "csv"
+    try:
+        run_batch(
+            input_file,
+            cast(TextIO, args.output),
+            input_format,
+            cast(int, args.chunk_size),
+            cast(int, args.workers),
+        )
+    except ValueError as error:
+        print(f"finances batch: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _add_address_arguments(parser: ArgumentParser) -> None:
+    """Adds the arguments that choose a daemon's address."""
+    # pylint: disable-next=import-outside-toplevel
+    from .daemon import DEFAULT_HOST, DEFAULT_PORT
+
+    parser.add_argument(
+        "--host", default=DEFAULT_HOST, help="The daemon's TCP address"
+    )
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help="The daemon's TCP port"
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="The daemon's Unix socket, instead of TCP",
+    )
+
+
+def daemon(arguments: List[str]) -> int:
+    """Runs a tax evaluation daemon, as described by --help."""
+    # The daemon and asyncio are only imported by the subcommands using them
+    # pylint: disable-next=import-outside-toplevel
+    import asyncio
+
+    # pylint: disable-next=import-outside-toplevel
+    from .daemon import DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY, TaxDaemon
+
+    parser = ArgumentParser(
+        prog="finances daemon",
+        description="Serve tax calculations over HTTP, in micro-batches.",
+    )
+    _add_address_arguments(parser)
+    parser.add_argument(
+        "--workers",
+        metavar="N",
+        type=int,
+        default=0,
+        help="The number of worker processes (default: one worker thread)",
+    )
+    parser.add_argument(
+        "--max-batch",
+        metavar="ROWS",
+        type=int,
+        default=DEFAULT_MAX_BATCH,
+        help="The most rows to evaluate in one batch",
+    )
+    parser.add_argument(
+        "--max-delay-ms",
+        metavar="MS",
+        type=float,
+        default=DEFAULT_MAX_DELAY * 1000,
+        help="The longest a row waits for its batch to fill up",
+    )
+    args = parser.parse_args(arguments)
+
+    try:
+        server = TaxDaemon(
+            cast(int, args.max_batch),
+            cast(float, args.max_delay_ms) / 1000,
+            cast(int, args.workers),
+        )
+        asyncio.run(
+            server.serve(
+                cast(str, args.host),
+                cast(int, args.port),
+                cast(Optional[str], args.socket),
+            )
+        )
+    except ValueError as error:
+        print(f"finances daemon: {error}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def loadgen(arguments: List[str]) -> int:
+    """Sends sample requests to a running daemon, as described by --help."""
+    # pylint: disable-next=import-outside-toplevel
+    import asyncio
+
+    # pylint: disable-next=import-outside-toplevel
+    from .daemon import connector, generate_load, SAMPLE_ROWS
+
+    parser = ArgumentParser(
+        prog="finances loadgen",
+        description="Measure a running finances daemon's latency.",
+    )
+    _add_address_arguments(parser)
+    parser.add_argument(
+        "--requests",
+        metavar="N",
+        type=int,
+        default=10000,
+        help="The number of requests to send",
+    )
+    parser.add_argument(
+        "--concurrency",
+        metavar="N",
+        type=int,
+        default=64,
+        help="The number of concurrent clients",
+    )
+    args = parser.parse_args(arguments)
+
+    connect = connector(
+        cast(str, args.host),
+        cast(int, args.port),
+        cast(Optional[str], args.socket),
+    )
+    try:
+        report = asyncio.run(
+            generate_load(
+                connect,
+                SAMPLE_ROWS,
+                cast(int, args.requests),
+                cast(int, args.concurrency),
+            )
+        )
+    except OSError as error:
+        print(f"finances loadgen: {error}", file=sys.stderr)
+        return 1
+    print(report)
+    return 0
+
+
+# Subcommands by name, each given the arguments after its name
+SUBCOMMANDS: Dict[str, Callable[[List[str]], int]] = {
+    "batch": batch,
+    "daemon": daemon,
+    "loadgen": loadgen,
+}
+
+
+def main() -> int:
+    """Runs the subcommand if given, or else prompts for one income."""
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        return SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+    return interactive()
+
+
 if __name__ == "__main__":
     sys.exit(main())
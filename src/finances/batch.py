@@ -0,0 +1,354 @@
+"""Contains a streaming tax evaluator for files of taxpayers."""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from .earnings import Earnings, TaxCategory
+from .money import Money
+from .tax import CompiledTax, DEFAULT_TAX_SYSTEM, FilingStatus
+from .tax.federal.income import BRACKETS_BY_YEAR
+
+INPUT_FORMATS = ("csv", "jsonl")
+
+# Columns that every row must have
+REQUIRED_FIELDS = (
+    "gross_income",
+    "adjustments",
+    "deductions",
+    "year",
+    "filing_status",
+)
+
+# Columns that are optional: an ID to copy to the output, the state's postal
+# code (no state income tax if empty), and deductions for the state income tax
+OPTIONAL_FIELDS = ("id", "state", "state_deductions")
+
+OUTPUT_FIELDS = ("id", "tax", "net_income")
+
+DEFAULT_CHUNK_SIZE = 10000
+
+Row = Mapping[str, object]
+# The number of the chunk's first row, and the chunk's rows
+Chunk = Tuple[int, List[Row]]
+ResultRow = Dict[str, str]
+
+# The year, filing status, and state (or None) of a taxpayer's tax stack
+StackKey = Tuple[int, FilingStatus, Optional[str]]
+Taxpayer = Tuple[StackKey, Earnings]
+
+# Filing statuses by their names in lowercase and uppercase
+_FILING_STATUSES: Dict[str, FilingStatus] = {
+    **{status.name: status for status in FilingStatus},
+    **{status.name.lower(): status for status in FilingStatus},
+}
+
+
+def read_rows(stream: Iterable[str], input_format: str) -> Iterator[Row]:
+    """
+    Reads taxpayer rows from a stream, one at a time.
+
+    Arguments:
+        stream - The stream (or other iterable of lines) to read.
+        input_format - "csv" for a CSV file with a header row, or "jsonl" for a
+            file with one JSON object per line.
+    Return value: An iterator over the rows.
+    """
+    if input_format == "csv":
+        yield from csv.DictReader(stream)
+    elif input_format == "jsonl":
+        for line in stream:
+            if line.strip():
+                row: object = json.loads(line)  # type: ignore[misc]
+                if not isinstance(row, dict):
+                    raise ValueError(f"Expected a JSON object, got {line!r}")
+                yield row
+    else:
+        raise ValueError(f"Unknown input format {input_format}")
+
+
+def _parse_money(value: object) -> Money:
+    """
+    Parses an amount like "$1.50", "1.50", "-1", or 1.5.
+
+    Strings follow Money.parse's rules (whole dollars, or dollars and exactly
+    two digits of cents), except that the "$" is optional. JSON numbers are
+    rounded to the cent, and must be finite.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid amount {value!r}")
+    if isinstance(value, int):
+        return Money.of(value)
+    if isinstance(value, float):
+        all_cents = value * 100
+        if not math.isfinite(all_cents):
+            raise ValueError(f"Invalid amount {value!r}")
+        return Money(round(all_cents))
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid amount {value!r}")
+
+    # This is on the hot path, so avoid Money.parse's extra validation layers
+    text = value.strip()
+    negate = text.startswith("-")
+    if negate:
+        text = text[1:]
+    dollars, dot, cents = (
+        text[1:].partition(".") if text.startswith("$") else text.partition(".")
+    )
+    if not _is_digits(dollars) or (
+        dot and not (len(cents) == 2 and _is_digits(cents))
+    ):
+        raise ValueError(f"Invalid amount {value!r}")
+    amount = int(dollars) * 100 + (int(cents) if dot else 0)
+    return Money(-amount if negate else amount)
+
+
+def _is_digits(text: str) -> bool:
+    """Returns whether text is one or more ASCII digits, like Money.parse."""
+    return text.isascii() and text.isdigit()
+
+
+def parse_taxpayer(row: Row) -> Taxpayer:
+    """
+    Parses a row into its tax stack's key and its earnings.
+
+    Arguments:
+        row - The row. See REQUIRED_FIELDS and OPTIONAL_FIELDS for its fields.
+    Return value: The row's (year, filing status, state) and earnings. Raises
+        ValueError if the row is invalid.
+    """
+    for field in REQUIRED_FIELDS:
+        if row.get(field) in (None, ""):
+            raise ValueError(f"Missing {field}")
+
+    status_name = str(row["filing_status"])
+    filing_status = _FILING_STATUSES.get(status_name)
+    if filing_status is None:
+        try:
+            filing_status = FilingStatus[status_name.strip().upper()]
+        except KeyError:
+            raise ValueError(f"Invalid filing status {status_name}") from None
+
+    state = str(row.get("state") or "").strip().upper() or None
+    adjustments = _parse_money(row["adjustments"])
+    state_deductions = row.get("state_deductions")
+    earnings = Earnings(
+        gross_income=_parse_money(row["gross_income"]),
+        adjustments={
+            TaxCategory.FEDERAL: adjustments,
+            TaxCategory.STATE: adjustments,
+        },
+        deductions={
+            TaxCategory.FEDERAL: _parse_money(row["deductions"]),
+            TaxCategory.STATE: _parse_money(state_deductions)
+            if state_deductions not in (None, "")
+            else Money.ZERO,
+        },
+        magi_additions={
+            TaxCategory.FEDERAL: Money.ZERO,
+            TaxCategory.STATE: Money.ZERO,
+        },
+    )
+    return ((int(str(row["year"])), filing_status, state), earnings)
+
+
+def compiled_stack(key: StackKey) -> CompiledTax:
+    """
+    Returns the shared compiled tax stack for a (year, filing status, state).
+
+    Raises ValueError if there is no tax data for the key.
+    """
+    if key[0] not in BRACKETS_BY_YEAR:
+        raise ValueError(f"No tax data for year {key[0]}")
+    try:
+        return DEFAULT_TAX_SYSTEM.compiled_stack(*key)
+    except (AssertionError, LookupError) as error:
+        # Taxes check for missing data with assert statements, so under
+        # python -O, missing data is a failed lookup instead
+        raise ValueError(f"No tax data for {key}: {error}") from error
+
+
+def calculate_taxes(
+    taxpayers: Sequence[Taxpayer], first_row: int = 1
+) -> List[Money]:
+    """
+    Calculates the taxes of parsed taxpayers.
+
+    Taxpayers that share a year, filing status, and state are evaluated
+    together with that stack's shared compiled tax.
+
+    Arguments:
+        taxpayers - The taxpayers, as returned by parse_taxpayer.
+        first_row - The row number of the first taxpayer, for error messages.
+    Return value: The tax of each taxpayer, in order. Raises ValueError, naming
+        the row number, if there is no tax data for a taxpayer.
+    """
+    groups: Dict[StackKey, List[int]] = {}
+    for index, (key, _) in enumerate(taxpayers):
+        groups.setdefault(key, []).append(index)
+
+    taxes: List[Money] = [Money.ZERO] * len(taxpayers)
+    for key, indices in groups.items():
+        try:
+            compiled = compiled_stack(key)
+        except ValueError as error:
+            raise ValueError(
+                f"Row {first_row + indices[0]}: {error}"
+            ) from error
+        group_taxes = compiled.calculate_many(
+            [taxpayers[index][1] for index in indices]
+        )
+        for index, tax in zip(indices, group_taxes):
+            taxes[index] = tax
+    return taxes
+
+
+def evaluate_chunk(chunk: Chunk) -> List[ResultRow]:
+    """
+    Calculates the taxes of a chunk of rows.
+
+    Arguments:
+        chunk - The number of the first row (starting at 1) and the rows.
+    Return value: The output row of each input row, in order. Raises
+        ValueError, naming the row number, if a row is invalid.
+    """
+    first_row, rows = chunk
+    taxpayers: List[Taxpayer] = []
+    for index, row in enumerate(rows):
+        try:
+            taxpayers.append(parse_taxpayer(row))
+        except ValueError as error:
+            raise ValueError(f"Row {first_row + index}: {error}") from error
+    taxes = calculate_taxes(taxpayers, first_row)
+    return [
+        result_row(row, earnings, tax, first_row + index)
+        for index, (row, (_, earnings), tax) in enumerate(
+            zip(rows, taxpayers, taxes)
+        )
+    ]
+
+
+def result_row(
+    row: Row, earnings: Earnings, tax: Money, row_number: int
+) -> ResultRow:
+    """Returns the output row for an input row with the given tax."""
+    return {
+        "id": str(row.get("id") or row_number),
+        "tax": str(tax),
+        "net_income": str(earnings.gross_income - tax),
+    }
+
+
+def _chunks(rows: Iterable[Row], chunk_size: int) -> Iterator[Chunk]:
+    """Splits rows into numbered chunks of at most chunk_size rows."""
+    iterator = iter(rows)
+    first_row = 1
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield (first_row, chunk)
+        first_row += len(chunk)
+
+
+def _evaluate_in_pool(
+    chunks: Iterator[Chunk], workers: int
+) -> Iterator[List[ResultRow]]:
+    """
+    Evaluates chunks in a process pool, yielding results in order.
+
+    At most two chunks per worker are in flight, so memory use does not grow
+    with the input.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future[List[ResultRow]]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(evaluate_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _Writer:
+    """Writes output rows in a format."""
+
+    def __init__(self, stream: TextIO, output_format: str):
+        self._stream = stream
+        self._csv: Optional[csv.DictWriter[str]] = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(
+                stream, fieldnames=OUTPUT_FIELDS, lineterminator="\n"
+            )
+            self._csv.writeheader()
+
+    def write(self, results: List[ResultRow]) -> None:
+        """Writes results and flushes them."""
+        if self._csv is not None:
+            self._csv.writerows(results)
+        else:
+            self._stream.writelines(
+                json.dumps(result) + "\n" for result in results
+            )
+        self._stream.flush()
+
+
+def run_batch(
+    input_stream: Iterable[str],
+    output_stream: TextIO,
+    input_format: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 0,
+) -> int:
+    """
+    Streams taxpayer rows from input_stream and writes their taxes.
+
+    Rows are read and evaluated chunk_size at a time, and each chunk's results
+    are written before more rows are read, so memory use does not depend on
+    the size of the input.
+
+    Arguments:
+        input_stream - The rows to evaluate. See REQUIRED_FIELDS and
+            OPTIONAL_FIELDS for the columns.
+        output_stream - Where to write the id, tax, and net income of each
+            row, in order and in the input format.
+        input_format - One of INPUT_FORMATS.
+        chunk_size - The number of rows to evaluate at once.
+        workers - The number of worker processes, or 0 to evaluate in this
+            process.
+    Return value: The number of rows evaluated.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+    if workers < 0:
+        raise ValueError("Number of workers must not be negative")
+
+    writer = _Writer(output_stream, input_format)
+    chunks = _chunks(read_rows(input_stream, input_format), chunk_size)
+    results: Iterable[List[ResultRow]] = (
+        _evaluate_in_pool(chunks, workers)
+        if workers > 0
+        else map(evaluate_chunk, chunks)
+    )
+    count = 0
+    for chunk_results in results:
+        writer.write(chunk_results)
+        count += len(chunk_results)
+    return count
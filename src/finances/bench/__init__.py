@@ -0,0 +1 @@
+"""Benchmarks of this package's performance-sensitive code."""
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""Runs one or more of this package's benchmarks."""
+
+import sys
+from typing import Callable, Dict
+
+from . import (
+    batch,
+    brackets,
+    compiled,
+    cube,
+    daemon,
+    earnings,
+    grossup,
+    parameters,
+    piecewise,
+    scenario,
+    slots,
+    suite,
+    sweep,
+)
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "batch": batch.main,
+    "brackets": brackets.main,
+    "compiled": compiled.main,
+    "cube": cube.main,
+    "daemon": daemon.main,
+    "earnings": earnings.main,
+    "grossup": grossup.main,
+    "parameters": parameters.main,
+    "piecewise": piecewise.main,
+    "scenario": scenario.main,
+    "slots": slots.main,
+    "sweep": sweep.main,
+}
+
+
+def main() -> None:
+    """
+    Runs the benchmarks named on the command line, or all of them.
+
+    "suite" runs the micro-benchmark suite instead, with its own arguments.
+    """
+    if sys.argv[1:2] == ["suite"]:
+        sys.exit(suite.main(sys.argv[2:]))
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark {name}", file=sys.stderr)
+            sys.exit(1)
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measures the throughput and memory use of the batch evaluator."""
+
+from __future__ import annotations
+
+import io
+import random
+import time
+import tracemalloc
+from typing import Iterator
+
+from ..batch import run_batch
+
+_STATUSES = ["single", "married_filing_jointly", "head_of_household"]
+
+
+def _generate(rows: int) -> Iterator[str]:
+    """Generates the lines of a CSV file of random taxpayers."""
+    generator = random.Random(0)
+    yield "gross_income,adjustments,deductions,year,filing_status,state\n"
+    for _ in range(rows):
+        yield (
+            f"{generator.randrange(0, 50000000) / 100:.2f},"
+            f"{generator.randrange(0, 500000) / 100:.2f},12950,"
+            f"{generator.choice([2021, 2022])},"
+            f"{generator.choice(_STATUSES)},"
+            f"{generator.choice(['MI', ''])}\n"
+        )
+
+
+class _NullOutput(io.StringIO):
+    """An output stream that discards everything written to it."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _rows_per_minute(rows: int, workers: int) -> float:
+    start = time.perf_counter()
+    run_batch(_generate(rows), _NullOutput(), workers=workers)
+    return rows / (time.perf_counter() - start) * 60
+
+
+def _peak_memory(rows: int) -> float:
+    """Returns the peak memory, in MiB, traced while evaluating rows."""
+    tracemalloc.start()
+    run_batch(_generate(rows), _NullOutput())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def main() -> None:
+    """
+    Prints rows per minute and peak memory for growing inputs.
+
+    The rows are generated as they are read, so if memory use is constant, the
+    peak stays the same as the inputs grow.
+    """
+    print(f"{'Rows':>10}{'Workers':>9}{'Rows/minute':>16}")
+    for rows, workers in [(100000, 0), (400000, 0), (400000, 2)]:
+        print(
+            f"{rows:>10,}{workers:>9}{_rows_per_minute(rows, workers):>16,.0f}"
+        )
+    print(f"{'Rows':>10}{'Peak memory (MiB)':>27}")
+    for rows in [25000, 100000]:
+        print(f"{rows:>10,}{_peak_memory(rows):>27.1f}")
+
+
+if __name__ == "__main__":
+    main()
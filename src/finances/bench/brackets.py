@@ -0,0 +1,110 @@
+"""
+Compares BracketTax.calculate against the original bracket-walking algorithm.
+
+Also compares calculating taxes one at a time against calculate_many.
+"""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+from typing import Callable, List, Tuple
+
+from ..earnings import Earnings, TaxCategory
+from ..money import Money
+from ..tax import FederalIncomeTax, FilingStatus
+from ..tax.bracket import BracketTax
+from ..tax.federal import MedicareTax
+
+_CALLS = 100000
+_BATCH_SIZE = 100000
+
+
+def _walk_brackets(tax: BracketTax, earnings: Earnings) -> Money:
+    """
+    Calculates a BracketTax by walking every bracket from the top.
+
+    This is the original BracketTax.calculate algorithm, which calculate must
+    match exactly.
+    """
+    result = Money.ZERO
+    taxable_income = earnings.taxable_income(tax.policy)
+    for bracket in tax.brackets:
+        if taxable_income > bracket.threshold:
+            result += (taxable_income - bracket.threshold).grow_and_round(
+                bracket.marginal_rate
+            )
+            taxable_income = bracket.threshold
+    return result
+
+
+def _earnings(gross_income: Money) -> Earnings:
+    return Earnings(
+        gross_income=gross_income,
+        adjustments={TaxCategory.FEDERAL: Money.of(1000)},
+        deductions={TaxCategory.FEDERAL: Money.of(12950)},
+        magi_additions={TaxCategory.FEDERAL: Money.ZERO},
+    )
+
+
+def _calculate_each(tax: BracketTax, batch: List[Earnings]) -> List[Money]:
+    return [tax.calculate(earnings) for earnings in batch]
+
+
+def calls_per_second(calculate: Callable[[], Money]) -> float:
+    """Returns how many times per second calculate can be called."""
+    seconds = min(timeit.repeat(calculate, number=_CALLS, repeat=3))
+    return _CALLS / seconds
+
+
+def _cases() -> List[Tuple[str, BracketTax]]:
+    return [
+        (
+            "FederalIncomeTax",
+            FederalIncomeTax(2022, FilingStatus.MARRIED_FILING_JOINTLY),
+        ),
+        ("MedicareTax", MedicareTax(2022, FilingStatus.SINGLE)),
+    ]
+
+
+def main() -> None:
+    """Prints the speed of both algorithms for several taxes and incomes."""
+    print(f"{'Tax':<20}{'Gross':>12}{'Walk calls/s':>16}{'Search calls/s':>18}")
+    for name, tax in _cases():
+        for gross_income in [Money.of(30000), Money.of(750000)]:
+            earnings = _earnings(gross_income)
+            assert tax.calculate(earnings) == _walk_brackets(tax, earnings)
+            walk = calls_per_second(partial(_walk_brackets, tax, earnings))
+            search = calls_per_second(partial(tax.calculate, earnings))
+            print(
+                f"{name:<20}{str(gross_income):>12}{walk:>16,.0f}"
+                f"{search:>18,.0f}"
+            )
+
+    print()
+    print(f"{'Tax':<20}{'Taxpayers/s':>16}{'Batch taxpayers/s':>20}")
+    batch = [
+        _earnings(Money.of(1000 * (index % 1000)))
+        for index in range(_BATCH_SIZE)
+    ]
+    for name, tax in _cases():
+        one_at_a_time = min(
+            timeit.repeat(
+                partial(_calculate_each, tax, batch),
+                number=1,
+                repeat=3,
+            )
+        )
+        many = min(
+            timeit.repeat(
+                partial(tax.calculate_many, batch), number=1, repeat=3
+            )
+        )
+        print(
+            f"{name:<20}{_BATCH_SIZE / one_at_a_time:>16,.0f}"
+            f"{_BATCH_SIZE / many:>20,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Compares calculating a full tax stack as a tree and as a CompiledTax."""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+from typing import List, Tuple
+
+from ..earnings import Earnings, TaxCategory
+from ..money import Money
+from ..tax import (
+    compile_tax,
+    CompositeTax,
+    FederalIncomeTax,
+    FICATax,
+    FilingStatus,
+    IncomeTax,
+)
+from ..tax.state.mi import MichiganIncomeTax
+
+CALLS = 100000
+BATCH_SIZE = 100000
+
+
+def sample_earnings(gross_income: Money) -> Earnings:
+    """Returns single earnings with typical adjustments and deductions."""
+    return Earnings(
+        gross_income=gross_income,
+        adjustments=dict.fromkeys(TaxCategory, Money.of(1000)),
+        deductions={
+            TaxCategory.FEDERAL: Money.of(12950),
+            TaxCategory.STATE: Money.of(5000),
+        },
+        magi_additions=dict.fromkeys(TaxCategory, Money.ZERO),
+    )
+
+
+def sample_stack() -> IncomeTax:
+    """Returns a federal, Michigan, and FICA tax stack for 2022."""
+    return CompositeTax(
+        [
+            FederalIncomeTax(2022, FilingStatus.SINGLE),
+            MichiganIncomeTax(2022),
+            FICATax(2022, FilingStatus.SINGLE),
+        ]
+    )
+
+
+def print_row(name: str, seconds: float, batch_seconds: float) -> None:
+    """Prints the speed of CALLS calls and of a batch of BATCH_SIZE."""
+    print(
+        f"{name:<20}{CALLS / seconds:>16,.0f}"
+        f"{BATCH_SIZE / batch_seconds:>20,.0f}"
+    )
+
+
+def main() -> None:
+    """Prints the speed of a federal, state, and FICA stack both ways."""
+    tax = sample_stack()
+    compiled = compile_tax(tax)
+    earnings = sample_earnings(Money.of(85000))
+    assert compiled.calculate(earnings) == tax.calculate(earnings)
+
+    print(f"{'Evaluator':<20}{'Calls/s':>16}{'Batch taxpayers/s':>20}")
+    batch = [
+        sample_earnings(Money.of(1000 * (index % 1000)))
+        for index in range(BATCH_SIZE)
+    ]
+    evaluators: List[Tuple[str, IncomeTax]] = [
+        ("Tree", tax),
+        ("Compiled", compiled),
+    ]
+    for name, evaluator in evaluators:
+        seconds = min(
+            timeit.repeat(
+                partial(evaluator.calculate, earnings), number=CALLS, repeat=3
+            )
+        )
+        batch_seconds = min(
+            timeit.repeat(
+                partial(evaluator.calculate_many, batch), number=1, repeat=3
+            )
+        )
+        print_row(name, seconds, batch_seconds)
+
+
+if __name__ == "__main__":
+    main()
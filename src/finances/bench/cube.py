@@ -0,0 +1,55 @@
+"""Compares evaluating a cube of tax stacks cell by cell and all at once."""
+
+from __future__ import annotations
+
+import array
+import random
+import timeit
+from functools import partial
+from typing import Optional, Tuple
+
+from ..earnings import EarningsBatch
+from ..tax import DEFAULT_TAX_SYSTEM, evaluate_cube, FilingStatus
+from .compiled import BATCH_SIZE
+from .earnings import _columns
+
+_YEARS = (2021, 2022)
+_STATES: Tuple[Optional[str], ...] = (None, "MI")
+
+
+def _cell_by_cell(batch: EarningsBatch) -> None:
+    for year in _YEARS:
+        for status in FilingStatus:
+            for state in _STATES:
+                DEFAULT_TAX_SYSTEM.compiled_stack(
+                    year, status, state
+                ).calculate_many(batch)
+
+
+def _cube(batch: EarningsBatch) -> None:
+    evaluate_cube(batch, _YEARS, states=_STATES)
+
+
+def main() -> None:
+    """Prints the speed of every year, filing status, and state both ways."""
+    generator = random.Random(0)
+    batch = _columns(
+        array.array(
+            "q", [generator.randrange(50000000) for _ in range(BATCH_SIZE)]
+        )
+    )
+    cells = len(_YEARS) * len(FilingStatus) * len(_STATES)
+    print(f"{cells} cells of {BATCH_SIZE:,} taxpayers")
+    print(f"{'Method':<20}{'Cell-taxpayers/s':>20}")
+    for name, evaluate in [
+        ("Cell by cell", _cell_by_cell),
+        ("Cube", _cube),
+    ]:
+        seconds = min(
+            timeit.repeat(partial(evaluate, batch), number=1, repeat=3)
+        )
+        print(f"{name:<20}{cells * BATCH_SIZE / seconds:>20,.0f}")
+
+
+if __name__ == "__main__":
+    main()
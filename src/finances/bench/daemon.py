@@ -0,0 +1,61 @@
+"""Measures the latency and throughput of the tax evaluation daemon."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ..daemon import connector, generate_load, LoadReport, SAMPLE_ROWS
+
+
+def _measure(max_batch: int, concurrency: int, requests: int) -> LoadReport:
+    """Starts a daemon in another process and sends it requests."""
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = Path(directory) / "daemon.sock"
+        command = [sys.executable, "-m", "finances", "daemon"]
+        with subprocess.Popen(
+            command
+            + ["--socket", str(socket_path), "--max-batch", str(max_batch)]
+        ) as daemon:
+            try:
+                while not socket_path.exists():
+                    time.sleep(0.01)
+                return asyncio.run(
+                    generate_load(
+                        connector(socket_path=str(socket_path)),
+                        SAMPLE_ROWS,
+                        requests,
+                        concurrency,
+                    )
+                )
+            finally:
+                daemon.terminate()
+
+
+def main() -> None:
+    """
+    Prints latency percentiles and throughput for growing concurrency.
+
+    Without batching (a max_batch of 1), each request pays for its own trip to
+    the worker; with batching, concurrent requests share one.
+    """
+    print(
+        f"{'Max batch':>10}{'Clients':>9}{'Requests/s':>12}"
+        f"{'p50 (ms)':>10}{'p99 (ms)':>10}{'Mean batch':>12}"
+    )
+    for max_batch, concurrency in [(1, 64), (512, 1), (512, 64), (512, 256)]:
+        report = _measure(max_batch, concurrency, 20000)
+        print(
+            f"{max_batch:>10}{concurrency:>9}"
+            f"{report.requests / report.seconds:>12,.0f}"
+            f"{report.p50_ms:>10.2f}{report.p99_ms:>10.2f}"
+            f"{report.requests / report.server_stats['batches']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compares lists of Earnings with columnar EarningsBatches."""
+
+from __future__ import annotations
+
+import array
+import random
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+from ..earnings import Earnings, EarningsBatch, TaxCategory
+from ..money import Money
+from ..tax import compile_tax
+from .compiled import BATCH_SIZE, sample_earnings, sample_stack
+
+
+def _traced_bytes(create: Callable[[], object]) -> int:
+    """Returns the memory allocated by create that its result keeps alive."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = create()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def _columns(gross_cents: array.array[int]) -> EarningsBatch:
+    """Creates a batch like sample_earnings from gross incomes, in cents."""
+
+    def full(cents: int) -> array.array[int]:
+        return array.array("q", [cents]) * len(gross_cents)
+
+    return EarningsBatch(
+        gross_cents,
+        dict.fromkeys(TaxCategory, full(100000)),
+        {TaxCategory.FEDERAL: full(1295000), TaxCategory.STATE: full(500000)},
+        dict.fromkeys(TaxCategory, full(0)),
+    )
+
+
+def main() -> None:
+    """Prints the memory per taxpayer and the speed of a full tax stack."""
+    generator = random.Random(0)
+    gross_cents = array.array(
+        "q", [generator.randrange(50000000) for _ in range(BATCH_SIZE)]
+    )
+    earnings: List[Earnings] = [
+        sample_earnings(Money(cents)) for cents in gross_cents
+    ]
+    batch = _columns(gross_cents)
+    compiled = compile_tax(sample_stack())
+    assert compiled.calculate_many(batch).equals(
+        compiled.calculate_many(earnings)
+    )
+
+    list_bytes = _traced_bytes(
+        lambda: [sample_earnings(Money(cents)) for cents in gross_cents]
+    )
+    batch_bytes = _traced_bytes(lambda: _columns(array.array("q", gross_cents)))
+    list_seconds = min(
+        timeit.repeat(lambda: compiled.calculate_many(earnings), number=1)
+    )
+    # A fresh batch each time, so that no cached AGIs are reused
+    batch_seconds = min(
+        timeit.repeat(
+            lambda: compiled.calculate_many(_columns(gross_cents)), number=1
+        )
+    )
+    print(f"{'Representation':<20}{'Bytes/taxpayer':>16}{'Taxpayers/s':>16}")
+    for name, size, seconds in [
+        ("list of Earnings", list_bytes, list_seconds),
+        ("EarningsBatch", batch_bytes, batch_seconds),
+    ]:
+        print(
+            f"{name:<20}{size / BATCH_SIZE:>16,.0f}"
+            f"{BATCH_SIZE / seconds:>16,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
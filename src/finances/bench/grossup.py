@@ -0,0 +1,69 @@
+"""Compares grossing up by bisection with the GrossUpSolver."""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+
+from ..money import Money
+from ..money_array import MoneyArray
+from ..tax import compile_tax, GrossUpSolver, IncomeTax
+from .compiled import sample_earnings, sample_stack
+
+_CALLS = 1000
+_BATCH_SIZE = 100000
+
+
+def bisect_gross_up(tax: IncomeTax, net_income: Money) -> Money:
+    """
+    Grosses up net_income by bisecting over full tax calculations.
+
+    This assumes that net income never decreases as gross income increases.
+    """
+    low, high = Money.ZERO, Money.of(1)
+    while high - tax.calculate(sample_earnings(high)) < net_income:
+        low, high = high, high * 2
+    while high - low > Money(1):
+        middle = Money((low.all_cents() + high.all_cents()) // 2)
+        if middle - tax.calculate(sample_earnings(middle)) < net_income:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def main() -> None:
+    """Prints the speed of grossing up under a federal, state, and FICA stack."""
+    compiled = compile_tax(sample_stack())
+    solver = GrossUpSolver(compiled.piecewise(sample_earnings(Money.ZERO)))
+    net_income = Money.of(65000)
+    assert solver.gross_up(net_income) == bisect_gross_up(compiled, net_income)
+
+    targets = MoneyArray.from_money(
+        [Money.of(100 * (index % 10000)) for index in range(_BATCH_SIZE)]
+    )
+    bisect_seconds = min(
+        timeit.repeat(
+            partial(bisect_gross_up, compiled, net_income),
+            number=_CALLS,
+            repeat=3,
+        )
+    )
+    solver_seconds = min(
+        timeit.repeat(
+            partial(solver.gross_up, net_income), number=_CALLS, repeat=3
+        )
+    )
+    batch_seconds = min(
+        timeit.repeat(
+            partial(solver.gross_up_many, targets), number=1, repeat=3
+        )
+    )
+    print(f"{'Method':<20}{'Targets/s':>16}")
+    print(f"{'Bisection':<20}{_CALLS / bisect_seconds:>16,.0f}")
+    print(f"{'Solver':<20}{_CALLS / solver_seconds:>16,.0f}")
+    print(f"{'Solver, batch':<20}{_BATCH_SIZE / batch_seconds:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Reports import time and peak memory use with lazily loaded tax parameters.
+
+Each scenario runs in a fresh interpreter so that nothing is already imported.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List, Tuple
+
+from ..tax.parameters import CACHE_DIR_VARIABLE
+
+_RUNS = 5
+
+# Prints the seconds taken by the statements and the peak RSS in KiB
+_TEMPLATE = """
+import resource, time
+start = time.perf_counter()
+{statements}
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+_IMPORT = "import finances"
+
+_ONE_YEAR = """
+import finances
+from finances.tax import FederalIncomeTax, FICATax, FilingStatus
+from finances.tax.state.mi import MichiganIncomeTax
+FederalIncomeTax(2022, FilingStatus.SINGLE)
+FICATax(2022, FilingStatus.SINGLE)
+MichiganIncomeTax(2022)
+"""
+
+
+def _measure(statements: str, cache_dir: str) -> Tuple[float, int]:
+    """Returns the best time and peak RSS of running statements."""
+    environment = dict(os.environ, **{CACHE_DIR_VARIABLE: cache_dir})
+    results: List[Tuple[float, int]] = []
+    for _ in range(_RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", _TEMPLATE.format(statements=statements)],
+            check=True,
+            capture_output=True,
+            env=environment,
+            text=True,
+        ).stdout.split()
+        results.append((float(output[0]), int(output[1])))
+    return (
+        min(seconds for seconds, _ in results),
+        max(rss for _, rss in results),
+    )
+
+
+def main() -> None:
+    """Prints import time and peak RSS with and without the data cache."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scenarios = [
+            ("Import only", _IMPORT, ""),
+            ("One year, no cache", _ONE_YEAR, ""),
+            ("One year, cached", _ONE_YEAR, cache_dir),
+        ]
+        print(f"{'Scenario':<24}{'Time (ms)':>12}{'Peak RSS (KiB)':>16}")
+        for name, statements, directory in scenarios:
+            seconds, rss = _measure(statements, directory)
+            print(f"{name:<24}{seconds * 1000:>12.1f}{rss:>16,}")
+
+
+if __name__ == "__main__":
+    main()
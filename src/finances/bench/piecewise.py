@@ -0,0 +1,53 @@
+"""Compares a CompiledTax with the PiecewiseLinearTax compiled from it."""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+
+from ..money import Money
+from ..money_array import MoneyArray
+from ..tax import compile_tax
+from .compiled import (
+    BATCH_SIZE,
+    CALLS,
+    sample_earnings,
+    print_row,
+    sample_stack,
+)
+
+
+def main() -> None:
+    """Prints the speed of a federal, state, and FICA stack both ways."""
+    compiled = compile_tax(sample_stack())
+    template = sample_earnings(Money.ZERO)
+    piecewise = compiled.piecewise(template)
+    gross_income = Money.of(85000)
+    earnings = sample_earnings(gross_income)
+    assert piecewise.tax(gross_income) == compiled.calculate(earnings)
+    print(f"{piecewise.segment_count()} segments")
+
+    incomes = [Money.of(1000 * (index % 1000)) for index in range(BATCH_SIZE)]
+    batch = [sample_earnings(income) for income in incomes]
+    array = MoneyArray.from_money(incomes)
+    rows = [
+        (
+            "Compiled",
+            partial(compiled.calculate, earnings),
+            partial(compiled.calculate_many, batch),
+        ),
+        (
+            "Piecewise",
+            partial(piecewise.tax, gross_income),
+            partial(piecewise.tax_many, array),
+        ),
+    ]
+    print(f"{'Evaluator':<20}{'Calls/s':>16}{'Batch incomes/s':>20}")
+    for name, call, batch_call in rows:
+        seconds = min(timeit.repeat(call, number=CALLS, repeat=3))
+        batch_seconds = min(timeit.repeat(batch_call, number=1, repeat=3))
+        print_row(name, seconds, batch_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compares recalculating a what-if change incrementally and from scratch."""
+
+from __future__ import annotations
+
+import timeit
+from typing import Callable, List
+
+from ..earnings import Earnings, EarningsTaxPolicy, EarningsType, TaxCategory
+from ..money import Money
+from ..tax import compile_tax, CompositeTax, FlatTax, IncomeTax, Scenario
+from .compiled import sample_stack
+
+_CHANGES = 20000
+_LOCAL_TAXES = 200
+
+
+def _large_stack() -> IncomeTax:
+    """Returns a federal, state, and FICA stack plus many local taxes."""
+    types = list(EarningsType)
+    local: List[IncomeTax] = [
+        FlatTax(
+            0.001 * (1 + index % 20),
+            EarningsTaxPolicy(types[index % len(types)], TaxCategory.LOCAL),
+        )
+        for index in range(_LOCAL_TAXES)
+    ]
+    return CompositeTax([sample_stack(), CompositeTax(local)])
+
+
+def main() -> None:
+    """Prints the time to recalculate after changing a federal deduction."""
+    tax = _large_stack()
+    compiled = compile_tax(tax)
+    amounts = [Money.of(12950), Money.of(20000)]
+    variants = [
+        Earnings(
+            Money.of(85000),
+            dict.fromkeys(TaxCategory, Money.of(1000)),
+            {
+                **dict.fromkeys(TaxCategory, Money.of(5000)),
+                TaxCategory.FEDERAL: amount,
+            },
+            dict.fromkeys(TaxCategory, Money.ZERO),
+        )
+        for amount in amounts
+    ]
+    scenario = Scenario(tax, variants[0])
+    counter = iter(range(10**9))
+
+    def incremental() -> None:
+        index = next(counter) % 2
+        scenario.update(deductions={TaxCategory.FEDERAL: amounts[index]})
+
+    def from_scratch(calculate: Callable[..., Money]) -> Callable[[], None]:
+        def run() -> None:
+            calculate(variants[next(counter) % 2])
+
+        return run
+
+    print(f"{compiled.leaf_count()} leaf taxes")
+    print(f"{'Method':<20}{'Microseconds':>16}")
+    for name, call in [
+        ("Tree", from_scratch(tax.calculate)),
+        ("Compiled", from_scratch(compiled.calculate)),
+        ("Scenario", incremental),
+    ]:
+        seconds = min(timeit.repeat(call, number=_CHANGES, repeat=3))
+        print(f"{name:<20}{seconds / _CHANGES * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
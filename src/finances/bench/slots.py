@@ -0,0 +1,127 @@
+"""
+Compares the compact value classes against their original representations.
+
+The "before" classes below replicate the original plain frozen dataclasses.
+"""
+
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Callable, List, Tuple
+
+from simulate.probability import Probability
+
+from ..money import _of_cents, Money
+from ..utilities.range import Range
+from ..value import Value
+
+_INSTANCES = 100000
+_CONSTRUCTIONS = 200000
+
+
+@dataclass(frozen=True, order=True)
+class _DictMoney:
+    _cents: int
+
+
+@dataclass(frozen=True, order=True)
+class _DictValue:
+    _year_2000_usd_cents: int
+
+
+@dataclass(frozen=True)
+class _DictRange:
+    start: int
+    end: int
+
+    def __post_init__(self) -> None:
+        if self.start > self.end:
+            raise ValueError(f"Start {self.start} is after end {self.end}")
+
+
+@dataclass(frozen=True, order=True)
+class _DictProbability:
+    _value: Fraction
+
+    def __post_init__(self) -> None:
+        if self._value < 0 or self._value > 1:
+            raise ValueError(f"Invalid probability {self._value}")
+
+    def __mul__(self, other: _DictProbability) -> _DictProbability:
+        return _DictProbability(self._value * other._value)
+
+
+def bytes_per_instance(create: Callable[[int], object]) -> float:
+    """
+    Measures the memory used by each object that create returns.
+
+    Arguments:
+        create - Creates a distinct object from each int passed to it. Each int
+            is large enough that it is not cached by the interpreter.
+    Return value: The average number of bytes allocated per object.
+    """
+    # Allocate the ints first so that only the objects are measured
+    arguments = list(range(10**6, 10**6 + _INSTANCES))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances: List[object] = [create(arg) for arg in arguments]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list itself holds one pointer per instance
+    list_bytes = 8 * len(instances)
+    return (after - before - list_bytes) / len(instances)
+
+
+def constructions_per_second(create: Callable[[int], object]) -> float:
+    """Returns how many times per second create(12345) can be called."""
+    seconds = min(
+        timeit.repeat(lambda: create(12345), number=_CONSTRUCTIONS, repeat=3)
+    )
+    return _CONSTRUCTIONS / seconds
+
+
+def _cases() -> List[Tuple[str, Callable[[int], object]]]:
+    # Probabilities share their Fractions so that only they are measured
+    fractions = [Fraction(1, denominator) for denominator in range(1, 1001)]
+    dict_half = _DictProbability(Fraction(1, 2))
+    half = Probability(Fraction(1, 2))
+    return [
+        ("Money (before)", _DictMoney),
+        ("Money", Money),
+        ("Money (internal)", _of_cents),
+        ("Value (before)", _DictValue),
+        ("Value", Value),
+        ("Range (before)", lambda start: _DictRange(start, start + 1)),
+        ("Range", lambda start: Range(start, start + 1)),
+        (
+            "Range (internal)",
+            lambda start: Range._make(  # pylint: disable=protected-access
+                start, start + 1
+            ),
+        ),
+        (
+            "Probability (before)",
+            lambda index: _DictProbability(fractions[index % 1000]),
+        ),
+        ("Probability", lambda index: Probability(fractions[index % 1000])),
+        ("Product (before)", lambda _: dict_half * dict_half),
+        ("Product", lambda _: half * half),
+    ]
+
+
+def main() -> None:
+    """Prints the memory use and construction speed of each class."""
+    print(f"{'Class':<24}{'Bytes/instance':>16}{'Constructions/s':>18}")
+    for name, create in _cases():
+        memory = bytes_per_instance(create)
+        speed = constructions_per_second(create)
+        print(f"{name:<24}{memory:>16.1f}{speed:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+A suite of micro-benchmarks with a JSON baseline to catch regressions.
+
+Usage:
+    python -m finances.bench suite
+    python -m finances.bench suite --record baseline.json
+    python -m finances.bench suite --compare baseline.json --tolerance 0.2
+
+python -m simulate.bench suite runs the same suite with simulate's cases added.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import sys
+import timeit
+import tracemalloc
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from typing import Callable, cast, Dict, List, Optional, Sequence
+
+from ..earnings import Earnings, EarningsBatch, TaxCategory
+from ..money import Money
+from ..money_array import MoneyArray
+from ..tax import FederalIncomeTax, FICATax, FilingStatus
+from ..utilities import Range
+from .compiled import sample_earnings, sample_stack
+
+# Cases are timed in repeats of at least this long, and the best is kept
+_MIN_SECONDS = 0.1
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.2
+# Memory grows by at least this many bytes or blocks before it is a
+# regression, so that small results (e.g. one Money) are not flagged by the
+# relative tolerance alone
+MEMORY_FLOOR_BYTES = 1024
+RETAINED_BLOCK_FLOOR = 8
+
+_BATCH_SIZE = 10000
+
+
+@dataclass(frozen=True)
+class Case:
+    """A benchmark: a call that performs operations operations each time."""
+
+    name: str
+    call: Callable[[], object]
+    operations: int = 1
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    """
+    A case's speed and memory use.
+
+    retained_blocks is the number of memory blocks that one call allocated and
+    still held when it returned (e.g. its result and anything it cached).
+    Blocks that the call freed before returning are not counted. peak_bytes is
+    the most memory that the call had allocated at once. Both are traced by
+    tracemalloc and do not depend on the machine's speed.
+    """
+
+    operations_per_second: float
+    retained_blocks: int
+    peak_bytes: int
+
+    def to_dict(self) -> Dict[str, object]:
+        """Returns this result as a JSON-compatible dict."""
+        return {
+            "operations_per_second": self.operations_per_second,
+            "retained_blocks": self.retained_blocks,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+def _fresh_projection() -> Money:
+    earnings = Earnings(
+        Money.of(85000),
+        {TaxCategory.FEDERAL: Money.of(1000)},
+        {TaxCategory.FEDERAL: Money.of(12950)},
+        {TaxCategory.FEDERAL: Money.ZERO},
+    )
+    return earnings.agi_with_deductions(TaxCategory.FEDERAL)
+
+
+def cases() -> List[Case]:
+    """Returns every case in the suite, in order."""
+    one, two = Money.of(1234, 56), Money.of(78, 9)
+    earnings = sample_earnings(Money.of(85000))
+    federal = FederalIncomeTax(2022, FilingStatus.SINGLE)
+    fica = FICATax(2022, FilingStatus.SINGLE)
+    stack = sample_stack()
+    batch = EarningsBatch.of(
+        [sample_earnings(Money(index * 997)) for index in range(_BATCH_SIZE)]
+    )
+    strings = "\n".join(
+        f"${index}.{index % 100:02}" for index in range(1000)
+    ).encode()
+    first, second = Range[int](0, 100), Range[int](50, 150)
+    return [
+        Case("money.add", lambda: one + two),
+        Case("money.multiply", lambda: one * 3),
+        Case("money.grow_and_round", lambda: one.grow_and_round(0.0765)),
+        Case("money.parse", lambda: Money.parse("$1234.56")),
+        Case("money_array.parse", lambda: MoneyArray.parse(strings), 1000),
+        Case("tax.bracket", lambda: federal.calculate(earnings)),
+        Case("tax.fica", lambda: fica.calculate(earnings)),
+        Case("tax.composite", lambda: stack.calculate(earnings)),
+        Case(
+            "tax.composite_many",
+            lambda: stack.calculate_many(batch),
+            _BATCH_SIZE,
+        ),
+        Case("earnings.projection", _fresh_projection),
+        Case("range.union", lambda: first.union(second)),
+        Case("range.intersection", lambda: first.intersection(second)),
+    ]
+
+
+def measure(case: Case, repeat: int = DEFAULT_REPEAT) -> CaseResult:
+    """
+    Measures a case's speed and peak memory.
+
+    Arguments:
+        case - The case to measure.
+        repeat - The number of timing repeats. The fastest is kept.
+    Return value: The case's result.
+    """
+    timer = timeit.Timer(case.call)
+    number = 1
+    while timer.timeit(number) < _MIN_SECONDS:
+        number *= 2
+    seconds = min(timer.repeat(repeat, number)) / number
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = case.call()
+        peak = tracemalloc.get_traced_memory()[1]
+        # Every trace was allocated during the call, since tracing started
+        # just before it
+        retained_blocks = sum(
+            statistic.count
+            for statistic in tracemalloc.take_snapshot().statistics("filename")
+        )
+    finally:
+        tracemalloc.stop()
+    del result
+    return CaseResult(
+        case.operations / seconds, retained_blocks, max(peak - before, 0)
+    )
+
+
+def run_suite(
+    names: Optional[List[str]] = None,
+    repeat: int = DEFAULT_REPEAT,
+    extra_cases: Sequence[Case] = (),
+) -> Dict[str, CaseResult]:
+    """
+    Measures the cases named in names, or every case.
+
+    Arguments:
+        names - The cases to measure, or None or [] for every case.
+        repeat - The number of timing repeats per case.
+        extra_cases - Cases to add after this package's cases, such as those
+            of packages that depend on this one.
+    Return value: The result of each measured case, in case order.
+    Raises ValueError if a name is not a case.
+    """
+    selected = [*cases(), *extra_cases]
+    if names:
+        known = {case.name for case in selected}
+        for name in names:
+            if name not in known:
+                raise ValueError(f"Unknown case {name}")
+        selected = [case for case in selected if case.name in names]
+    return {case.name: measure(case, repeat) for case in selected}
+
+
+def to_baseline(results: Dict[str, CaseResult]) -> Dict[str, object]:
+    """Returns results as a JSON-compatible baseline, with the platform."""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {name: result.to_dict() for name, result in results.items()},
+    }
+
+
+def load_baseline(text: str) -> Dict[str, CaseResult]:
+    """
+    Parses a baseline written by to_baseline.
+
+    Raises ValueError if the baseline is malformed, or if a speed is not
+    positive or a count is negative.
+    """
+    baseline: object = json.loads(text)  # type: ignore[misc]
+    if not isinstance(baseline, dict):
+        raise ValueError("Expected a JSON object")
+    entries = cast(Dict[str, object], baseline).get("results")
+    if not isinstance(entries, dict):
+        raise ValueError("Expected a results object")
+
+    results: Dict[str, CaseResult] = {}
+    for name, entry in cast(Dict[str, object], entries).items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"Expected an object for {name}")
+        fields = cast(Dict[str, object], entry)
+        speed = fields.get("operations_per_second")
+        retained_blocks = fields.get("retained_blocks")
+        peak = fields.get("peak_bytes")
+        if (
+            not isinstance(speed, (int, float))
+            or not isinstance(retained_blocks, int)
+            or not isinstance(peak, int)
+            or any(
+                isinstance(value, bool)
+                for value in (speed, retained_blocks, peak)
+            )
+        ):
+            raise ValueError(f"Invalid result for {name}")
+        if not (math.isfinite(speed) and speed > 0):
+            raise ValueError(f"Invalid speed for {name}: {speed}")
+        if retained_blocks < 0 or peak < 0:
+            raise ValueError(f"Negative memory use for {name}")
+        results[name] = CaseResult(float(speed), retained_blocks, peak)
+    return results
+
+
+def compare(
+    baseline: Dict[str, CaseResult],
+    current: Dict[str, CaseResult],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """
+    Compares results with a baseline.
+
+    Arguments:
+        baseline - The baseline results.
+        current - The results to check.
+        tolerance - The fraction by which speed may drop, or retained blocks
+            or peak memory may grow, before a case is a regression. Memory
+            must also grow by RETAINED_BLOCK_FLOOR or MEMORY_FLOOR_BYTES.
+    Return value: A description of each regression, in case order.
+    """
+    regressions: List[str] = []
+    for name, result in current.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        speed = result.operations_per_second / old.operations_per_second
+        if speed < 1 - tolerance:
+            regressions.append(f"{name}: {1 - speed:.0%} slower")
+        if _grew(
+            old.retained_blocks,
+            result.retained_blocks,
+            tolerance,
+            RETAINED_BLOCK_FLOOR,
+        ):
+            regressions.append(
+                f"{name}: retained blocks grew from {old.retained_blocks} to "
+                f"{result.retained_blocks}"
+            )
+        if _grew(
+            old.peak_bytes, result.peak_bytes, tolerance, MEMORY_FLOOR_BYTES
+        ):
+            regressions.append(
+                f"{name}: peak memory grew from {old.peak_bytes} to "
+                f"{result.peak_bytes} bytes"
+            )
+    return regressions
+
+
+def _grew(old: int, new: int, tolerance: float, floor: int) -> bool:
+    """Returns whether new exceeds old by both tolerance and floor."""
+    return new - old > max(old * tolerance, floor)
+
+
+def _print_results(
+    results: Dict[str, CaseResult], baseline: Dict[str, CaseResult]
+) -> None:
+    print(
+        f"{'Case':<24}{'Ops/s':>16}{'Retained':>13}{'Peak bytes':>12}"
+        f"{'vs baseline':>13}"
+    )
+    for name, result in results.items():
+        old = baseline.get(name)
+        change = (
+            f"{result.operations_per_second / old.operations_per_second:.2f}x"
+            if old is not None
+            else "new"
+        )
+        print(
+            f"{name:<24}{result.operations_per_second:>16,.0f}"
+            f"{result.retained_blocks:>13,}{result.peak_bytes:>12,}"
+            f"{change:>13}"
+        )
+
+
+def main(
+    arguments: Optional[List[str]] = None,
+    extra_cases: Sequence[Case] = (),
+    prog: str = "python -m finances.bench suite",
+) -> int:
+    """
+    Runs the suite as described by --help and returns an exit code.
+
+    Arguments:
+        arguments - The command-line arguments, or None for sys.argv.
+        extra_cases - Cases to add to the suite, as in run_suite.
+        prog - The command to show in help and error messages.
+    Return value: 0 on success, or 1 on a regression or invalid input.
+    """
+    parser = ArgumentParser(
+        prog=prog,
+        description="Measure micro-benchmarks and compare them to a baseline.",
+    )
+    parser.add_argument("cases", nargs="*", help="The cases to run (all)")
+    parser.add_argument(
+        "--record", metavar="FILE", help="Write the results to a baseline"
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="Compare the results to a baseline and fail on regressions",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="The fraction of slowdown or memory growth that is allowed",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="The number of timing repeats per case",
+    )
+    args = parser.parse_args(arguments)
+    compare_path = cast(Optional[str], args.compare)
+    record_path = cast(Optional[str], args.record)
+
+    baseline: Dict[str, CaseResult] = {}
+    try:
+        if compare_path is not None:
+            with open(compare_path, encoding="utf-8") as file:
+                baseline = load_baseline(file.read())
+        results = run_suite(
+            cast(List[str], args.cases), cast(int, args.repeat), extra_cases
+        )
+    except ValueError as error:
+        print(f"{prog}: {error}", file=sys.stderr)
+        return 1
+    _print_results(results, baseline)
+
+    if record_path is not None:
+        with open(record_path, "w", encoding="utf-8") as file:
+            json.dump(to_baseline(results), file, indent=2)
+            file.write("\n")
+    if compare_path is not None:
+        regressions = compare(baseline, results, cast(float, args.tolerance))
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
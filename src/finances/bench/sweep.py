@@ -0,0 +1,66 @@
+"""Compares ways of tabulating a tax stack over a fine grid of incomes."""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+from typing import List
+
+from ..earnings import Earnings
+from ..money import Money
+from ..money_array import MoneyArray
+from ..tax import compile_tax, CompiledTax, PiecewiseLinearTax
+from .compiled import sample_earnings, sample_stack
+
+_STOP = Money.of(1000000)
+_STEP = Money.of(1)
+_SAMPLES = 10000
+
+
+def _per_point(compiled: CompiledTax, samples: List[Earnings]) -> None:
+    for earnings in samples:
+        compiled.calculate(earnings)
+
+
+def _tabulate(piecewise: PiecewiseLinearTax, grid: MoneyArray) -> None:
+    piecewise.tax_many(grid)
+    piecewise.marginal_rate_many(grid)
+    piecewise.effective_rate_many(grid)
+
+
+def _sweep(piecewise: PiecewiseLinearTax) -> None:
+    for _ in piecewise.sweep(Money.ZERO, _STOP, _STEP):
+        pass
+
+
+def main() -> None:
+    """Prints the speed of tabulating $0 to $1M in $1 steps three ways."""
+    compiled = compile_tax(sample_stack())
+    piecewise = compiled.piecewise(sample_earnings(Money.ZERO))
+    points = _STOP.all_cents() // _STEP.all_cents()
+    grid = MoneyArray.from_money(Money.of(dollars) for dollars in range(points))
+
+    # Per-point evaluation is too slow to run over the whole grid, so time a
+    # sample and extrapolate
+    samples = [
+        sample_earnings(Money.of(index * (points // _SAMPLES)))
+        for index in range(_SAMPLES)
+    ]
+    rows = [
+        (
+            "Per point",
+            partial(_per_point, compiled, samples),
+            points / _SAMPLES,
+        ),
+        ("*_many", partial(_tabulate, piecewise, grid), 1.0),
+        ("sweep", partial(_sweep, piecewise), 1.0),
+    ]
+    print(f"{points:,} points")
+    print(f"{'Method':<20}{'Seconds':>16}")
+    for name, call, scale in rows:
+        seconds = min(timeit.repeat(call, number=1, repeat=3)) * scale
+        print(f"{name:<20}{seconds:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
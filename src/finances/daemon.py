@@ -0,0 +1,502 @@
+"""Contains a long-running tax evaluation server that batches requests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import socket
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Awaitable,
+    Callable,
+    cast,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .batch import (
+    calculate_taxes,
+    compiled_stack,
+    parse_taxpayer,
+    result_row,
+    ResultRow,
+    Row,
+    Taxpayer,
+)
+from .money import Money
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+DEFAULT_MAX_BATCH = 512
+DEFAULT_MAX_DELAY = 0.002
+
+# The number of connections that may wait to be accepted
+BACKLOG = 1024
+
+# The number of recent request latencies kept for percentiles
+LATENCY_WINDOW = 10000
+
+_Streams = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+_Pending = Tuple[Taxpayer, "asyncio.Future[Money]"]
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    500: "Internal Server Error",
+}
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Returns a percentile of values, using the nearest-rank method.
+
+    Arguments:
+        sorted_values - The values, in ascending order.
+        fraction - The percentile as a fraction, e.g. 0.99 for p99.
+    Return value: The percentile, or 0 if there are no values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class TaxDaemon:
+    """
+    Evaluates taxes for many concurrent requests, in micro-batches.
+
+    Each request's rows are parsed and checked as they arrive, then queued.
+    Once a worker is free, a batcher waits until max_batch rows are queued or
+    max_delay seconds have passed, then evaluates the queued rows together
+    with calculate_taxes in the worker, so the event loop stays free for I/O.
+    While every worker is busy, rows queue up for the next batch, so batches
+    grow with the load. Compiled tax stacks stay warm in each worker for the
+    daemon's lifetime.
+
+    Requests are HTTP/1.1 over TCP or a Unix socket:
+        POST /tax - The body is a row as accepted by finances batch, or a list
+            of rows. The response is the result row(s), with the tax and net
+            income of each row.
+        GET /stats - The response has request and batch counts, the current
+            queue depth, and p50 and p99 latency in milliseconds.
+
+    Example: asyncio.run(TaxDaemon().serve(port=8765))
+    """
+
+    def __init__(
+        self,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        workers: int = 0,
+    ):
+        """
+        Creates a TaxDaemon.
+
+        Arguments:
+            max_batch - The most rows to evaluate in one batch.
+            max_delay - The longest a row waits, in seconds, for a batch to
+                fill up.
+            workers - The number of worker processes, or 0 to evaluate in a
+                single worker thread.
+        """
+        if max_batch <= 0:
+            raise ValueError("Batch size must be positive")
+        if workers < 0:
+            raise ValueError("Number of workers must not be negative")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.workers = workers
+        self._pending: Deque[_Pending] = deque()
+        # Set when the first row is queued or a batch fills up, or None if the
+        # daemon is not running
+        self._wakeup: Optional[asyncio.Event] = None
+        self._counts = dict.fromkeys(
+            ("requests", "rows", "batches", "errors", "in_flight"), 0
+        )
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def _enqueue(self, taxpayer: Taxpayer) -> asyncio.Future[Money]:
+        """Queues a parsed row for the next batch and returns its future."""
+        if self._wakeup is None:
+            raise RuntimeError("The daemon is not running")
+        future: asyncio.Future[
+            Money
+        ] = asyncio.get_running_loop().create_future()
+        self._pending.append((taxpayer, future))
+        if len(self._pending) in (1, self.max_batch):
+            self._wakeup.set()
+        return future
+
+    async def evaluate(self, rows: Sequence[Row]) -> List[ResultRow]:
+        """
+        Calculates the taxes of rows in the next batch.
+
+        Arguments:
+            rows - The rows, as accepted by finances batch.
+        Return value: The result row of each row, in order. Raises ValueError,
+            naming the row number, if a row is invalid or has no tax data.
+        """
+        taxpayers: List[Taxpayer] = []
+        for number, row in enumerate(rows, 1):
+            try:
+                taxpayer = parse_taxpayer(row)
+                compiled_stack(taxpayer[0])
+            except ValueError as error:
+                raise ValueError(f"Row {number}: {error}") from error
+            taxpayers.append(taxpayer)
+        futures = [self._enqueue(taxpayer) for taxpayer in taxpayers]
+        taxes = [await future for future in futures]
+        return [
+            result_row(row, earnings, tax, number)
+            for number, (row, (_, earnings), tax) in enumerate(
+                zip(rows, taxpayers, taxes), 1
+            )
+        ]
+
+    async def _batches(self, executor: Executor) -> None:
+        """Evaluates queued rows in batches until cancelled."""
+        wakeup = self._wakeup
+        assert wakeup is not None
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(max(self.workers, 1))
+        while True:
+            await slots.acquire()
+            while not self._pending:
+                wakeup.clear()
+                await wakeup.wait()
+            if len(self._pending) < self.max_batch and self.max_delay > 0:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            batch = [
+                self._pending.popleft()
+                for _ in range(min(len(self._pending), self.max_batch))
+            ]
+            self._counts["in_flight"] += len(batch)
+            task = loop.create_task(self._evaluate_batch(executor, batch))
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _evaluate_batch(
+        self, executor: Executor, batch: List[_Pending]
+    ) -> None:
+        """Evaluates one batch and resolves each row's future."""
+        taxpayers: List[Taxpayer] = [taxpayer for taxpayer, _ in batch]
+        try:
+            taxes: List[
+                Money
+            ] = await asyncio.get_running_loop().run_in_executor(
+                executor, calculate_taxes, taxpayers
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for (_, future), tax in zip(batch, taxes):
+                if not future.done():
+                    future.set_result(tax)
+        finally:
+            self._counts["in_flight"] -= len(batch)
+            self._counts["batches"] += 1
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Returns request counts, queue depth, and latency percentiles."""
+        latencies = sorted(self._latencies)
+        return {
+            **self._counts,
+            "queue_depth": len(self._pending),
+            "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+        }
+
+    async def _respond(
+        self, method: str, path: str, body: bytes
+    ) -> Tuple[int, object]:
+        """Returns the status and JSON response for a request."""
+        if path == "/stats" and method == "GET":
+            return (200, self.stats())
+        if path != "/tax" or method != "POST":
+            return (404, {"error": f"No route for {method} {path}"})
+
+        start = time.perf_counter()
+        self._counts["requests"] += 1
+        try:
+            rows, is_list = _parse_rows(body)
+            results = await self.evaluate(rows)
+        except ValueError as error:
+            self._counts["errors"] += 1
+            return (400, {"error": str(error)})
+        except Exception as error:  # pylint: disable=broad-except
+            # E.g. the request's batch failed in the worker
+            self._counts["errors"] += 1
+            return (500, {"error": f"{type(error).__name__}: {error}"})
+        self._counts["rows"] += len(rows)
+        self._latencies.append(time.perf_counter() - start)
+        return (200, results if is_list else results[0])
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves HTTP requests on one connection until it closes."""
+        try:
+            while True:
+                request = await read_http_message(reader)
+                if request is None:
+                    break
+                start_line, headers, body = request
+                method, path = (start_line.split(" ") + ["", ""])[:2]
+                status, response = await self._respond(method, path, body)
+                write_http_message(
+                    writer,
+                    f"HTTP/1.1 {status} {_REASONS[status]}",
+                    json.dumps(response).encode(),
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # The client disconnected or sent a malformed message
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        socket_path: Optional[str] = None,
+        ready: Optional[Callable[[Sequence[socket.socket]], None]] = None,
+    ) -> None:
+        """
+        Serves requests until cancelled.
+
+        Arguments:
+            host - The address to listen on, if socket_path is None.
+            port - The port to listen on, if socket_path is None.
+            socket_path - The path of a Unix socket to listen on instead.
+            ready - Called with the listening sockets once the daemon is
+                accepting connections.
+        """
+        self._wakeup = asyncio.Event()
+        executor: Executor = (
+            ProcessPoolExecutor(self.workers)
+            if self.workers > 0
+            else ThreadPoolExecutor(1)
+        )
+        batcher = asyncio.get_running_loop().create_task(
+            self._batches(executor)
+        )
+        if socket_path is not None:
+            server = await asyncio.start_unix_server(
+                self.handle_connection, socket_path, backlog=BACKLOG
+            )
+        else:
+            server = await asyncio.start_server(
+                self.handle_connection, host, port, backlog=BACKLOG
+            )
+        try:
+            async with server:
+                if ready is not None:
+                    ready(server.sockets)
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            executor.shutdown(wait=False)
+            self._wakeup = None
+
+
+def _parse_rows(body: bytes) -> Tuple[List[Row], bool]:
+    """
+    Parses the JSON body of a POST /tax request.
+
+    Return value: The rows, and whether the body was a list of rows rather
+        than one row. Raises ValueError if the body is not valid.
+    """
+    request: object = json.loads(body)  # type: ignore[misc]
+    is_list = isinstance(request, list)
+    rows: List[Row] = []
+    for row in cast(List[object], request) if is_list else [request]:
+        if not isinstance(row, dict):
+            raise ValueError(f"Expected a JSON object, got {row!r}")
+        rows.append(row)
+    return (rows, is_list)
+
+
+async def read_http_message(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, Dict[str, str], bytes]]:
+    """
+    Reads an HTTP/1.1 request or response with a Content-Length body.
+
+    Return value: The start line, the headers (with lowercase names), and the
+        body, or None if the connection closed before a message started.
+    """
+    start_line = (await reader.readline()).decode("latin-1").strip()
+    if not start_line:
+        return None
+    headers: Dict[str, str] = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    body = await reader.readexactly(length) if length > 0 else b""
+    return (start_line, headers, body)
+
+
+def write_http_message(
+    writer: asyncio.StreamWriter, start_line: str, body: bytes
+) -> None:
+    """Writes an HTTP/1.1 request or response with a JSON body."""
+    writer.write(
+        f"{start_line}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """The results of a load test against a TaxDaemon."""
+
+    requests: int
+    errors: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+    server_stats: Dict[str, Union[int, float]]
+
+    def __str__(self) -> str:
+        """Summarizes this report."""
+        return (
+            f"{self.requests:,} requests ({self.errors:,} errors) in "
+            f"{self.seconds:.2f}s: {self.requests / self.seconds:,.0f}/s, "
+            f"p50 {self.p50_ms:.2f}ms, p99 {self.p99_ms:.2f}ms; "
+            f"server {json.dumps(self.server_stats)}"
+        )
+
+
+async def _request(
+    streams: _Streams, method: str, path: str, body: bytes
+) -> Tuple[int, bytes]:
+    """Sends one request on a connection and returns its status and body."""
+    reader, writer = streams
+    write_http_message(writer, f"{method} {path} HTTP/1.1", body)
+    await writer.drain()
+    response = await read_http_message(reader)
+    if response is None:
+        raise ConnectionError("The daemon closed the connection")
+    return (int(response[0].split(" ")[1]), response[2])
+
+
+async def _server_stats(streams: _Streams) -> Dict[str, Union[int, float]]:
+    """Requests a daemon's stats on a new connection, then closes it."""
+    try:
+        _, body = await _request(streams, "GET", "/stats", b"")
+    finally:
+        streams[1].close()
+    stats: object = json.loads(body)  # type: ignore[misc]
+    if not isinstance(stats, dict):
+        raise ValueError(f"Invalid stats {stats!r}")
+    return stats
+
+
+async def generate_load(
+    connect: Callable[[], Awaitable[_Streams]],
+    rows: Sequence[Row],
+    requests: int,
+    concurrency: int,
+) -> LoadReport:
+    """
+    Sends requests to a TaxDaemon from concurrent clients.
+
+    Arguments:
+        connect - Opens a connection to the daemon.
+        rows - The rows to send, one per request, in rotation.
+        requests - The total number of requests to send.
+        concurrency - The number of clients, each with its own connection,
+            sending one request at a time.
+    Return value: The client-side throughput and latency, and the daemon's
+        stats afterwards.
+    """
+    bodies = [json.dumps(row).encode() for row in rows]
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client() -> None:
+        nonlocal errors
+        streams = await connect()
+        try:
+            for index in counter:
+                start = time.perf_counter()
+                status, _ = await _request(
+                    streams, "POST", "/tax", bodies[index % len(bodies)]
+                )
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            streams[1].close()
+
+    start = time.perf_counter()
+    clients = [asyncio.ensure_future(client()) for _ in range(concurrency)]
+    await asyncio.wait(clients)
+    for finished in clients:
+        finished.result()
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return LoadReport(
+        requests=requests,
+        errors=errors,
+        seconds=seconds,
+        p50_ms=percentile(latencies, 0.5) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        server_stats=await _server_stats(await connect()),
+    )
+
+
+def connector(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+) -> Callable[[], Awaitable[_Streams]]:
+    """Returns a function that opens connections to a TaxDaemon."""
+
+    async def connect() -> _Streams:
+        if socket_path is not None:
+            return await asyncio.open_unix_connection(socket_path)
+        return await asyncio.open_connection(host, port)
+
+    return connect
+
+
+# Rows that the load generator sends by default
+SAMPLE_ROWS: List[Row] = [
+    {
+        "gross_income": f"{1000 * multiple}.00",
+        "adjustments": "1000.00",
+        "deductions": "12950.00",
+        "year": year,
+        "filing_status": status,
+        "state": "MI",
+        "state_deductions": "5000.00",
+    }
+    for multiple in range(1, 201)
+    for year in (2021, 2022)
+    for status in ("single", "married_filing_jointly")
+]
@@ -2,11 +2,25 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import auto, Enum
-from typing import Optional
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    overload,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
 
-from .money import Money
+import numpy as np
+
+from .money import _of_cents, Money
+from .money_array import CentsLike, MoneyArray
 
 
 class TaxCategory(Enum):
@@ -26,6 +40,27 @@ class EarningsType(Enum):
     AGI_WITH_DEDUCTIONS = auto()
 
 
+# Each category's first index in a derived earnings table, which has one entry
+# per (category, earnings type)
+_CATEGORY_SLOTS = {
+    category: index * len(EarningsType)
+    for index, category in enumerate(TaxCategory)
+}
+_TYPE_OFFSETS = {
+    earnings_type: index for index, earnings_type in enumerate(EarningsType)
+}
+_CATEGORIES = tuple(TaxCategory)
+_TABLE_SIZE = len(TaxCategory) * len(EarningsType)
+_GROSS_INCOME = _TYPE_OFFSETS[EarningsType.GROSS_INCOME]
+_MAGI = _TYPE_OFFSETS[EarningsType.MAGI]
+_AGI = _TYPE_OFFSETS[EarningsType.AGI]
+
+
+def _slot(category: TaxCategory, earnings_type: EarningsType) -> int:
+    """Returns the index of (category, earnings_type) in a derived table."""
+    return _CATEGORY_SLOTS[category] + _TYPE_OFFSETS[earnings_type]
+
+
 @dataclass(frozen=True)
 class EarningsTaxPolicy:
     """A specification of to which earnings a tax applies."""
@@ -34,20 +69,123 @@ class EarningsTaxPolicy:
     category: TaxCategory
     floor: Optional[Money] = None
     ceiling: Optional[Money] = None
+    # The index of this policy's earnings in each Earnings's derived table
+    derived_slot: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.floor is not None and self.ceiling is not None:
             assert self.floor <= self.ceiling, "floor must not exceed ceiling"
+        object.__setattr__(
+            self, "derived_slot", _slot(self.category, self.earnings_type)
+        )
+
+    def clamp(self, income: Money) -> Money:
+        """
+        Applies this policy's floor and ceiling to income.
+
+        Arguments:
+            income - Income of this policy's earnings type.
+        Return value: The taxable portion of income under this policy.
+        """
+        if self.floor is not None:
+            income = max(self.floor, income)
+        if self.ceiling is not None:
+            income = min(self.ceiling, income)
+        return income
+
+    def clamp_many(self, incomes: MoneyArray) -> MoneyArray:
+        """
+        Applies this policy's floor and ceiling to each of incomes.
+
+        Arguments:
+            incomes - Incomes of this policy's earnings type.
+        Return value: The taxable portion of each income under this policy.
+        """
+        if self.floor is not None:
+            incomes = incomes.maximum(self.floor)
+        if self.ceiling is not None:
+            incomes = incomes.minimum(self.ceiling)
+        return incomes
+
+
+# Earnings of each (category, type), indexed by _slot, or None if they have not
+# been calculated yet
+_DerivedTable = List[Optional[Money]]
 
 
 @dataclass(frozen=True)
 class Earnings:
-    """Information about an individual's taxable earnings for the year."""
+    """
+    Information about an individual's taxable earnings for the year.
+
+    Derived earnings (e.g. an AGI) are stored in a flat table with one slot
+    per (category, type) when first calculated, so each is calculated at most
+    once and later lookups are a list index. Like the rest of this class, the
+    adjustments, deductions, and MAGI additions must not be modified.
+    """
 
     gross_income: Money
     adjustments: dict[TaxCategory, Money]
     deductions: dict[TaxCategory, Money]
     magi_additions: dict[TaxCategory, Money]
+    if TYPE_CHECKING:
+        # Set by __post_init__, but not a field, so it is not part of
+        # fields(), asdict(), or astuple()
+        _derived: _DerivedTable
+
+    def __post_init__(self) -> None:
+        assert isinstance(
+            self.gross_income, Money
+        ), f"Gross income must be Money, not {self.gross_income!r}"
+        for component, amounts in (
+            ("adjustments", self.adjustments),
+            ("deductions", self.deductions),
+            ("MAGI additions", self.magi_additions),
+        ):
+            for category, amount in amounts.items():
+                assert isinstance(category, TaxCategory) and isinstance(
+                    amount, Money
+                ), f"Invalid {component} for {category!r}: {amount!r}"
+        object.__setattr__(self, "_derived", [None] * _TABLE_SIZE)
+
+    def _derive(self, slot: int) -> Money:
+        """
+        Calculates the derived earnings at slot in the table, and the AGI they
+        start from, and stores them in the table.
+        """
+        table = self._derived
+        category = _CATEGORIES[slot // len(EarningsType)]
+        offset = slot % len(EarningsType)
+        if offset == _GROSS_INCOME:
+            table[slot] = self.gross_income
+            return self.gross_income
+
+        agi = table[slot - offset + _AGI]
+        if agi is None:
+            adjustment = self.adjustments.get(category)
+            if adjustment is None:
+                raise AssertionError(f"no adjustments for {category}")
+            agi = _of_cents(
+                self.gross_income.all_cents() - adjustment.all_cents()
+            )
+            table[slot - offset + _AGI] = agi
+        if offset == _AGI:
+            return agi
+
+        # The MAGI adds MAGI additions, and the AGI with deductions subtracts
+        # deductions
+        if offset == _MAGI:
+            amount = self.magi_additions.get(category)
+            if amount is None:
+                raise AssertionError(f"no MAGI additions for {category}")
+            income = _of_cents(agi.all_cents() + amount.all_cents())
+        else:
+            amount = self.deductions.get(category)
+            if amount is None:
+                raise AssertionError(f"no deductions for {category}")
+            income = _of_cents(agi.all_cents() - amount.all_cents())
+        table[slot] = income
+        return income
 
     def taxable_income(self, policy: EarningsTaxPolicy) -> Money:
         """
@@ -57,14 +195,42 @@ class Earnings:
             policy - A tax policy to use to determine which earnings are taxable
         Return value: The amount of taxable income
         """
-        income = self.of_type(policy.category, policy.earnings_type)
+        income = self._derived[policy.derived_slot]
+        if income is None:
+            income = self._derive(policy.derived_slot)
+        return policy.clamp(income)
 
-        if policy.floor is not None:
-            income = max(policy.floor, income)
-        if policy.ceiling is not None:
-            income = min(policy.ceiling, income)
+    @staticmethod
+    def taxable_incomes(
+        earnings: Sequence[Earnings], policy: EarningsTaxPolicy
+    ) -> MoneyArray:
+        """
+        Calculates how much of each of earnings is taxable under policy.
 
-        return income
+        Arguments:
+            earnings - The earnings of each taxpayer.
+            policy - A tax policy to use to determine which earnings are taxable
+        Return value: The amount of taxable income of each of earnings, in
+            order, exactly as taxable_income would calculate it.
+        """
+        return EarningsBatch.of(earnings).taxable_income(policy)
+
+    @staticmethod
+    def of_type_many(
+        earnings: Sequence[Earnings],
+        category: TaxCategory,
+        earnings_type: EarningsType,
+    ) -> MoneyArray:
+        """
+        Calculates the amount of each of earnings of the specified type.
+
+        Arguments:
+            earnings - The earnings of each taxpayer.
+            category - The category to use to determine deductions, etc.
+            earnings_type - The type of earnings to retrieve
+        Return value: The earnings of the specified type, in order.
+        """
+        return EarningsBatch.of(earnings).of_type(category, earnings_type)
 
     def of_type(
         self,
@@ -79,14 +245,11 @@ class Earnings:
             earnings_type - The type of earnings to retrieve
         Return value: The earnings of the specified type
         """
-        if earnings_type is EarningsType.GROSS_INCOME:
-            return self.gross_income
-        elif earnings_type is EarningsType.MAGI:
-            return self.magi(category)
-        elif earnings_type is EarningsType.AGI:
-            return self.agi(category)
-        else:
-            return self.agi_with_deductions(category)
+        slot = _slot(category, earnings_type)
+        income = self._derived[slot]
+        if income is None:
+            income = self._derive(slot)
+        return income
 
     def agi_with_deductions(self, category: TaxCategory) -> Money:
         """
@@ -96,8 +259,7 @@ class Earnings:
             category - The category to use to determine deductions, etc.
         Return value: The AGI minus deductions
         """
-        assert category in self.deductions, f"no deductions for {category}"
-        return self.agi(category) - self.deductions[category]
+        return self.of_type(category, EarningsType.AGI_WITH_DEDUCTIONS)
 
     def agi(self, category: TaxCategory) -> Money:
         """
@@ -107,8 +269,7 @@ class Earnings:
             category - The category to use to determine adjustments, etc.
         Return value: The AGI
         """
-        assert category in self.adjustments, f"no adjustments for {category}"
-        return self.gross_income - self.adjustments[category]
+        return self.of_type(category, EarningsType.AGI)
 
     def magi(self, category: TaxCategory) -> Money:
         """
@@ -118,7 +279,268 @@ class Earnings:
             category - The category to use to determine deductions, etc.
         Return value: The MAGI
         """
-        assert (
-            category in self.magi_additions
-        ), f"no MAGI additions for {category}"
-        return self.agi(category) + self.magi_additions[category]
+        return self.of_type(category, EarningsType.MAGI)
+
+
+def gross_income_column(earnings: Sequence[Earnings]) -> MoneyArray:
+    """Gathers the gross income of each of earnings into a MoneyArray."""
+    return MoneyArray([each.gross_income.all_cents() for each in earnings])
+
+
+def category_column(
+    amounts: Sequence[Mapping[TaxCategory, Money]],
+    category: TaxCategory,
+    description: str,
+) -> MoneyArray:
+    """
+    Gathers the amount for category from each of amounts into a MoneyArray.
+
+    Arguments:
+        amounts - Each taxpayer's amounts by category (e.g. adjustments).
+        category - The category to gather.
+        description - A description of amounts for error messages.
+    Return value: The amount for category from each of amounts, in order.
+    """
+    try:
+        return MoneyArray([each[category].all_cents() for each in amounts])
+    except KeyError:
+        raise AssertionError(f"no {description} for {category}") from None
+
+
+# Cents for each TaxCategory: either a mapping from category to cents, or a
+# two-dimensional array with one row per category, in declaration order
+CategoryCents = Union[Mapping[TaxCategory, CentsLike], CentsLike]
+
+# The components of earnings that are kept per category, with descriptions
+# for error messages
+_COMPONENTS = {
+    "adjustments": "adjustments",
+    "deductions": "deductions",
+    "magi_additions": "MAGI additions",
+}
+
+
+class EarningsBatch(Sequence[Earnings]):
+    """
+    The earnings of many taxpayers, stored as columns of cents.
+
+    Gross income is one MoneyArray, and adjustments, deductions, and MAGI
+    additions are one MoneyArray per TaxCategory, so each calculation is a few
+    array operations over every taxpayer instead of a few dict lookups per
+    taxpayer. Results are identical to the corresponding Earnings methods.
+
+    An EarningsBatch is a Sequence of Earnings, so it can be passed to any
+    tax's calculate_many. Taxes use its columns directly.
+
+    Example: EarningsBatch(gross, {TaxCategory.FEDERAL: adjustments}, ...)
+    """
+
+    __slots__ = ("gross_income", "_columns", "_source")
+
+    gross_income: MoneyArray
+    # Gathered columns by (component, category), plus cached AGIs by
+    # ("agi", category)
+    _columns: Dict[Tuple[str, TaxCategory], MoneyArray]
+    # The Earnings that columns are gathered from, if not given as arrays
+    _source: Optional[Sequence[Earnings]]
+
+    def __init__(
+        self,
+        gross_income: CentsLike,
+        adjustments: CategoryCents,
+        deductions: CategoryCents,
+        magi_additions: CategoryCents,
+    ):
+        """
+        Creates an EarningsBatch from columns of cents.
+
+        Int64 NumPy arrays, and buffers of int64 (e.g. array.array("q") or a
+        memoryview cast to "q"), are used as-is without copying.
+
+        Arguments:
+            gross_income - The gross income of each taxpayer, in cents.
+            adjustments - The adjustments of each taxpayer, in cents, for each
+                category that has them.
+            deductions - The deductions, like adjustments.
+            magi_additions - The MAGI additions, like adjustments.
+        """
+        self.gross_income = MoneyArray(gross_income)
+        self._columns = {}
+        self._source = None
+        for component, cents in (
+            ("adjustments", adjustments),
+            ("deductions", deductions),
+            ("magi_additions", magi_additions),
+        ):
+            for category, column in _category_columns(cents).items():
+                assert len(column) == len(
+                    self.gross_income
+                ), f"{component} must have one amount per taxpayer"
+                self._columns[(component, category)] = column
+
+    @staticmethod
+    def of(earnings: Sequence[Earnings]) -> EarningsBatch:
+        """
+        Returns earnings as an EarningsBatch.
+
+        Arguments:
+            earnings - An EarningsBatch, which is returned as-is, or a sequence
+                of Earnings, whose columns are gathered as they are first used.
+        Return value: An EarningsBatch of earnings.
+        """
+        if isinstance(earnings, EarningsBatch):
+            return earnings
+        batch = object.__new__(EarningsBatch)
+        batch.gross_income = gross_income_column(earnings)
+        batch._columns = {}  # pylint: disable=protected-access
+        batch._source = earnings  # pylint: disable=protected-access
+        return batch
+
+    def _column(self, component: str, category: TaxCategory) -> MoneyArray:
+        """Returns one component's amounts for category, in cents."""
+        column = self._columns.get((component, category))
+        if column is None:
+            if self._source is None:
+                raise AssertionError(
+                    f"no {_COMPONENTS[component]} for {category}"
+                )
+            column = category_column(
+                [getattr(each, component) for each in self._source],
+                category,
+                _COMPONENTS[component],
+            )
+            self._columns[(component, category)] = column
+        return column
+
+    def __len__(self) -> int:
+        """Returns the number of taxpayers in this batch."""
+        return len(self.gross_income)
+
+    @overload
+    def __getitem__(self, index: int) -> Earnings:
+        """Returns the earnings of the taxpayer at index."""
+
+    @overload
+    def __getitem__(self, index: slice) -> EarningsBatch:
+        """Returns the earnings of the taxpayers in a slice."""
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Earnings, EarningsBatch]:
+        if isinstance(index, slice):
+            if self._source is not None:
+                return EarningsBatch.of(self._source[index])
+            batch = object.__new__(EarningsBatch)
+            batch.gross_income = self.gross_income[index]
+            # pylint: disable-next=protected-access
+            batch._columns = {
+                key: column[index]
+                for key, column in self._columns.items()
+                if key[0] in _COMPONENTS
+            }
+            batch._source = None  # pylint: disable=protected-access
+            return batch
+
+        if self._source is not None:
+            return self._source[index]
+        amounts: Dict[str, Dict[TaxCategory, Money]] = {
+            component: {} for component in _COMPONENTS
+        }
+        for (component, category), column in self._columns.items():
+            if component in amounts:
+                amounts[component][category] = column[index]
+        return Earnings(
+            gross_income=self.gross_income[index],
+            adjustments=amounts["adjustments"],
+            deductions=amounts["deductions"],
+            magi_additions=amounts["magi_additions"],
+        )
+
+    def __iter__(self) -> Iterator[Earnings]:
+        """Iterates over the earnings of each taxpayer."""
+        if self._source is not None:
+            return iter(self._source)
+        return (self[index] for index in range(len(self)))
+
+    def taxable_income(self, policy: EarningsTaxPolicy) -> MoneyArray:
+        """
+        Calculates how much of each taxpayer's earnings is taxable.
+
+        Arguments:
+            policy - A tax policy to use to determine which earnings are taxable
+        Return value: The taxable income of each taxpayer, in order.
+        """
+        return policy.clamp_many(
+            self.of_type(policy.category, policy.earnings_type)
+        )
+
+    def of_type(
+        self, category: TaxCategory, earnings_type: EarningsType
+    ) -> MoneyArray:
+        """
+        Calculates each taxpayer's earnings of the specified type.
+
+        Arguments:
+            category - The category to use to determine deductions, etc.
+            earnings_type - The type of earnings to retrieve
+        Return value: The earnings of the specified type, in order.
+        """
+        if earnings_type is EarningsType.GROSS_INCOME:
+            return self.gross_income
+        elif earnings_type is EarningsType.MAGI:
+            return self.magi(category)
+        elif earnings_type is EarningsType.AGI:
+            return self.agi(category)
+        else:
+            return self.agi_with_deductions(category)
+
+    def agi_with_deductions(self, category: TaxCategory) -> MoneyArray:
+        """
+        Calculates each taxpayer's AGI minus any deductions.
+
+        Arguments:
+            category - The category to use to determine deductions, etc.
+        Return value: The AGI minus deductions of each taxpayer
+        """
+        return self.agi(category) - self._column("deductions", category)
+
+    def agi(self, category: TaxCategory) -> MoneyArray:
+        """
+        Calculates each taxpayer's adjusted gross income for category.
+
+        The result is cached, since most calculations start from the AGI.
+
+        Arguments:
+            category - The category to use to determine adjustments, etc.
+        Return value: The AGI of each taxpayer
+        """
+        agi = self._columns.get(("agi", category))
+        if agi is None:
+            agi = self.gross_income - self._column("adjustments", category)
+            self._columns[("agi", category)] = agi
+        return agi
+
+    def magi(self, category: TaxCategory) -> MoneyArray:
+        """
+        Calculates each taxpayer's modified adjusted gross income.
+
+        Arguments:
+            category - The category to use to determine deductions, etc.
+        Return value: The MAGI of each taxpayer
+        """
+        return self.agi(category) + self._column("magi_additions", category)
+
+
+def _category_columns(cents: CategoryCents) -> Dict[TaxCategory, MoneyArray]:
+    """Splits cents for each category into one MoneyArray per category."""
+    if isinstance(cents, Mapping):
+        return {
+            category: MoneyArray(column) for category, column in cents.items()
+        }
+    rows = np.asarray(cents)
+    assert rows.ndim == 2 and len(rows) == len(
+        TaxCategory
+    ), "Expected one row of cents per tax category"
+    return {
+        category: MoneyArray(row) for category, row in zip(TaxCategory, rows)
+    }
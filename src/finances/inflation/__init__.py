@@ -0,0 +1,3 @@
+"""Price indexes for converting between nominal and inflation-adjusted money."""
+
+from .index import CPI_U, InflationIndex
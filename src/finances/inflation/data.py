@@ -0,0 +1,32 @@
+"""Price index data (e.g. annual average CPI levels)."""
+
+from __future__ import annotations
+
+# CPI-U, U.S. city average, all items, 1982-84=100 (BLS series CUUR0000SA0)
+CPI_U_ANNUAL_AVERAGES: dict[int, float] = {
+    2000: 172.2,
+    2001: 177.1,
+    2002: 179.9,
+    2003: 184.0,
+    2004: 188.9,
+    2005: 195.3,
+    2006: 201.6,
+    2007: 207.342,
+    2008: 215.303,
+    2009: 214.537,
+    2010: 218.056,
+    2011: 224.939,
+    2012: 229.594,
+    2013: 232.957,
+    2014: 236.736,
+    2015: 237.017,
+    2016: 240.007,
+    2017: 245.120,
+    2018: 251.107,
+    2019: 255.657,
+    2020: 258.811,
+    2021: 270.970,
+    2022: 292.655,
+    2023: 304.702,
+    2024: 313.689,
+}
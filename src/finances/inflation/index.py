@@ -0,0 +1,201 @@
+"""Contains a class for looking up cumulative inflation since 2000."""
+
+from __future__ import annotations
+
+from typing import Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from ..money import Money
+from ..money_array import MoneyArray
+from ..value import Value
+from ..value_array import ValueArray
+from .data import CPI_U_ANNUAL_AVERAGES
+
+BASE_YEAR = 2000
+
+MONTHS_PER_YEAR = 12
+
+YearsLike = Union[int, npt.NDArray[np.integer], Sequence[int]]
+MonthsLike = Union[int, npt.NDArray[np.integer], Sequence[int]]
+
+
+class InflationIndex:
+    """
+    Represents a price index, such as the CPI, over a contiguous range of years.
+
+    Levels are stored as dense per-year and per-month tables of cumulative
+    inflation since the 2000 annual average, so each lookup is a single index
+    operation. Months without their own level use their year's annual level.
+
+    Example: CPI_U.to_value(Money.of(100), 2022)
+    """
+
+    __slots__ = ("_first_year", "_annual", "_monthly")
+
+    def __init__(
+        self,
+        annual_levels: Mapping[int, float],
+        monthly_levels: Optional[Mapping[Tuple[int, int], float]] = None,
+    ):
+        """
+        Creates an InflationIndex from raw index levels.
+
+        Arguments:
+            annual_levels - The annual average level of the index in each year.
+                The years must be contiguous and include 2000.
+            monthly_levels - The level of the index in some months, keyed by
+                (year, month), where month is 1-12. Each year must also have an
+                annual level.
+        """
+        if BASE_YEAR not in annual_levels:
+            raise ValueError(f"Index has no level for {BASE_YEAR}")
+        first_year = min(annual_levels)
+        last_year = max(annual_levels)
+        if len(annual_levels) != last_year - first_year + 1:
+            raise ValueError("Index years must be contiguous")
+
+        base = annual_levels[BASE_YEAR]
+        annual = (
+            np.array(
+                [
+                    annual_levels[year]
+                    for year in range(first_year, last_year + 1)
+                ],
+                dtype=np.float64,
+            )
+            / base
+            - 1.0
+        )
+        monthly = np.repeat(annual[:, np.newaxis], MONTHS_PER_YEAR, axis=1)
+        for (year, month), level in (monthly_levels or {}).items():
+            if not first_year <= year <= last_year:
+                raise ValueError(f"Index has no annual level for {year}")
+            if not 1 <= month <= MONTHS_PER_YEAR:
+                raise ValueError(f"Invalid month {month}")
+            monthly[year - first_year, month - 1] = level / base - 1.0
+
+        annual.flags.writeable = False
+        monthly.flags.writeable = False
+        self._first_year = first_year
+        self._annual = annual
+        self._monthly = monthly
+
+    def years(self) -> range:
+        """Returns the years for which this index has levels."""
+        return range(self._first_year, self._first_year + len(self._annual))
+
+    def inflation_since_2000(
+        self, year: int, month: Optional[int] = None
+    ) -> float:
+        """
+        Looks up the cumulative inflation from 2000 to a point in time.
+
+        Arguments:
+            year - The year to look up.
+            month - The month (1-12) to look up, or None for the annual average.
+        Return value: The increase in the cost of goods since 2000, e.g. 0.5 if
+            costs are 50% higher. This is negative if costs have decreased.
+        """
+        index = year - self._first_year
+        if not 0 <= index < len(self._annual):
+            raise ValueError(f"Index has no data for {year}")
+        if month is None:
+            return float(self._annual[index])
+        if not 1 <= month <= MONTHS_PER_YEAR:
+            raise ValueError(f"Invalid month {month}")
+        return float(self._monthly[index, month - 1])
+
+    def inflation_since_2000_many(
+        self, years: YearsLike, months: Optional[MonthsLike] = None
+    ) -> npt.NDArray[np.float64]:
+        """
+        Looks up the cumulative inflation from 2000 to many points in time.
+
+        Arguments:
+            years - The years to look up.
+            months - The months (1-12) to look up, or None for annual averages.
+                This is broadcast against years.
+        Return value: An array of the increase in the cost of goods since 2000
+            at each point, as returned by inflation_since_2000.
+        """
+        indices = np.asarray(years, dtype=np.int64) - self._first_year
+        if indices.size > 0 and (
+            indices.min() < 0 or indices.max() >= len(self._annual)
+        ):
+            missing = indices[(indices < 0) | (indices >= len(self._annual))]
+            raise ValueError(
+                f"Index has no data for {int(missing[0]) + self._first_year}"
+            )
+        if months is None:
+            return np.asarray(self._annual[indices], dtype=np.float64)
+
+        month_indices = np.asarray(months, dtype=np.int64) - 1
+        if month_indices.size > 0 and (
+            month_indices.min() < 0 or month_indices.max() >= MONTHS_PER_YEAR
+        ):
+            invalid = month_indices[
+                (month_indices < 0) | (month_indices >= MONTHS_PER_YEAR)
+            ]
+            raise ValueError(f"Invalid month {int(invalid[0]) + 1}")
+        return np.asarray(
+            self._monthly[indices, month_indices], dtype=np.float64
+        )
+
+    def to_value(
+        self, money: Money, year: int, month: Optional[int] = None
+    ) -> Value:
+        """Converts nominal money at a point in time to a Value."""
+        return Value.of_inflated_money(
+            money, self.inflation_since_2000(year, month)
+        )
+
+    def to_money(
+        self, value: Value, year: int, month: Optional[int] = None
+    ) -> Money:
+        """Converts a Value to nominal money at a point in time."""
+        return value.inflate(self.inflation_since_2000(year, month))
+
+    def to_values(
+        self,
+        amounts: MoneyArray,
+        years: YearsLike,
+        months: Optional[MonthsLike] = None,
+    ) -> ValueArray:
+        """
+        Converts an array of nominal money to Values in one operation.
+
+        Arguments:
+            amounts - The amounts of money to convert.
+            years - Either the year of every amount or an array with the year
+                of each amount.
+            months - Optionally, the month (1-12) of every amount or of each
+                amount.
+        Return value: The Value of each amount, exactly as to_value returns.
+        """
+        return ValueArray.of_inflated_money(
+            amounts, self.inflation_since_2000_many(years, months)
+        )
+
+    def to_money_array(
+        self,
+        values: ValueArray,
+        years: YearsLike,
+        months: Optional[MonthsLike] = None,
+    ) -> MoneyArray:
+        """
+        Converts an array of Values to nominal money in one operation.
+
+        Arguments:
+            values - The Values to convert.
+            years - Either the year of every Value or an array with the year of
+                each Value.
+            months - Optionally, the month (1-12) of every Value or of each
+                Value.
+        Return value: The money each Value is worth, exactly as to_money returns.
+        """
+        return values.inflate(self.inflation_since_2000_many(years, months))
+
+
+CPI_U = InflationIndex(CPI_U_ANNUAL_AVERAGES)
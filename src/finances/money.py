@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import cast, ClassVar, Optional
+from typing import Callable, cast, ClassVar, Dict, Optional, Tuple
 
 CENTS_PER_DOLLAR = 100
 
+# Money.of returns a shared instance for whole-dollar amounts smaller than this
+_INTERNED_DOLLARS_LIMIT = 10000
+
 
 # The digits 0-9 as strings
 _DIGITS = frozenset(map(str, range(0, 10)))
@@ -42,6 +45,8 @@ def _parse_nonnegative_int(
 class Money:
     """Represents an amount of U.S. dollars, positive, negative, or zero."""
 
+    __slots__ = ("_cents",)
+
     _cents: int
 
     ZERO: ClassVar[Money]
@@ -67,11 +72,20 @@ class Money:
         is_negative_zero = dollars == _NEGATIVE_ZERO
         num_dollars = 0 if is_negative_zero else cast(int, dollars)
 
+        if cents == 0 and -_INTERNED_DOLLARS_LIMIT < num_dollars < (
+            _INTERNED_DOLLARS_LIMIT
+        ):
+            interned = _INTERNED.get(num_dollars)
+            if interned is None:
+                interned = _of_cents(num_dollars * CENTS_PER_DOLLAR)
+                _INTERNED[num_dollars] = interned
+            return interned
+
         if is_negative_zero or num_dollars < 0:
             # E.g. -4, 53 becomes -453
-            return Money(num_dollars * CENTS_PER_DOLLAR - cents)
+            return _of_cents(num_dollars * CENTS_PER_DOLLAR - cents)
         else:
-            return Money(num_dollars * CENTS_PER_DOLLAR + cents)
+            return _of_cents(num_dollars * CENTS_PER_DOLLAR + cents)
 
     @staticmethod
     def parse(money_string: str) -> Money:
@@ -108,7 +122,8 @@ class Money:
             raise ValueError("Too many dots in money")
 
         if negate:
-            dollars = -dollars
+            # -$0.XX must stay negative even though -0 == 0
+            return Money.of(-dollars if dollars else Money.NEGATIVE_ZERO, cents)
 
         return Money.of(dollars, cents)
 
@@ -150,15 +165,15 @@ class Money:
 
     def __add__(self, other: Money) -> Money:
         """Creates a new Money with the sum of this Money and other."""
-        return Money(self._cents + other._cents)
+        return _of_cents(self._cents + other._cents)
 
     def __sub__(self, other: Money) -> Money:
         """Creates a new Money with the difference of this Money and other."""
-        return Money(self._cents - other._cents)
+        return _of_cents(self._cents - other._cents)
 
     def __mul__(self, other: int) -> Money:
         """Creates a new Money with this Money's amount multiplied by other."""
-        return Money(self._cents * other)
+        return _of_cents(self._cents * other)
 
     def grow_and_round(self, ratio: float) -> Money:
         """
@@ -170,8 +185,33 @@ class Money:
             ratio: The number by which to multiply this Money's amount.
         Return value: A new Money representing this Money times ratio.
         """
-        return Money(round(self._cents * ratio))
+        return _of_cents(round(self._cents * ratio))
+
+    def __reduce__(self) -> Tuple[Callable[[int], Money], Tuple[int]]:
+        """Pickles this Money by its cents (frozen slots cannot be restored)."""
+        return (Money, (self._cents,))
+
+
+_new_money = object.__new__
+_set_cents = cast(
+    Callable[[Money, int], None],
+    Money.__dict__["_cents"].__set__,  # type: ignore[misc]
+)
+
+
+def _of_cents(cents: int) -> Money:
+    """
+    Creates Money with the given number of cents.
+
+    This is equivalent to Money(cents), but faster, since Money's frozen
+    __init__ is bypassed. Only use it with cents known to be an int.
+    """
+    money: Money = _new_money(Money)
+    _set_cents(money, cents)
+    return money
+
 
+_INTERNED: Dict[int, Money] = {}
 
 Money.ZERO = Money.of(0)
 Money.NEGATIVE_ZERO = _NEGATIVE_ZERO
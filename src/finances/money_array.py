@@ -0,0 +1,651 @@
+"""Classes for representing arrays of money in U.S. dollars."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from .money import _of_cents, Money
+
+# The range of values that fit in a packed (int64) cents buffer
+_INT64_MIN = int(np.iinfo(np.int64).min)
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+# Floats at or beyond these bounds do not fit in an int64 once rounded
+_FLOAT_INT64_MIN = float(_INT64_MIN)
+_FLOAT_INT64_MAX = float(2**63)
+
+# Either int64 cents or, if some cents do not fit in 64 bits, Python int cents
+_Cents = npt.NDArray[Any]
+
+_Bytes = npt.NDArray[np.uint8]
+
+CentsLike = Union[_Cents, Iterable[int]]
+RatioLike = Union[float, npt.NDArray[np.floating], Iterable[float]]
+MoneyStrings = Union[bytes, bytearray, memoryview, Iterable[str]]
+
+# Byte classes used by MoneyArray.parse. Anything else (e.g. non-ASCII
+# whitespace) is left to Money.parse.
+_NEWLINE = ord("\n")
+_IS_SPACE = np.zeros(256, dtype=np.bool_)
+_IS_SPACE[list(b" \t\r\x0b\x0c")] = True
+
+# Rows with more leading or trailing whitespace than this are left to
+# Money.parse
+_MAX_TRIMMED_SPACE = 4
+
+# Values with more digits than this may not fit in an int64 and are left to
+# Money.parse
+_MAX_PACKED_DIGITS = 18
+
+
+def _freeze(cents: _Cents) -> _Cents:
+    """Returns a read-only view of cents, leaving the original writeable."""
+    view = cents.view()
+    view.flags.writeable = False
+    return view
+
+
+def _fits(low: int, high: int) -> bool:
+    """Returns whether the range [low, high] fits in an int64."""
+    return _INT64_MIN <= low and high <= _INT64_MAX
+
+
+def _bounds(cents: _Cents) -> Tuple[int, int]:
+    """Returns the (minimum, maximum) of cents as Python ints."""
+    if cents.size == 0:
+        return (0, 0)
+    return (int(cents.min()), int(cents.max()))
+
+
+def _to_buffer(cents: CentsLike) -> _Cents:
+    """
+    Converts cents to a one-dimensional cents buffer.
+
+    The buffer is an int64 array if every element fits in 64 bits. Otherwise, it
+    is an object array of exact Python ints.
+    """
+    array = np.asarray(cents)
+    if array.ndim != 1:
+        array = array.reshape(-1)
+
+    if array.dtype == np.int64:
+        return array
+    if array.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if array.dtype.kind in "iub":
+        low, high = _bounds(array)
+        if _fits(low, high):
+            return array.astype(np.int64)
+        return array.astype(np.object_)
+    if array.dtype.kind == "O":
+        if not all(isinstance(cent, (int, np.integer)) for cent in array):
+            raise TypeError("Cents must be integers")
+        return _narrow(
+            np.array([int(cent) for cent in array], dtype=np.object_)
+        )
+    raise TypeError(f"Cents must be integers, not {array.dtype}")
+
+
+def _narrow(cents: _Cents) -> _Cents:
+    """Converts an object cents buffer to int64 if every element fits."""
+    if cents.dtype == np.int64:
+        return cents
+    low, high = _bounds(cents)
+    if _fits(low, high):
+        return cents.astype(np.int64)
+    return cents
+
+
+def _widen(cents: _Cents) -> _Cents:
+    """Converts a cents buffer to exact Python ints."""
+    return cents.astype(np.object_)
+
+
+class MoneyArray:
+    """
+    Represents an array of amounts of U.S. dollars.
+
+    Amounts are stored as a packed buffer of int64 cents, and all operations
+    have the same semantics as the corresponding Money operations, applied
+    element-wise. If a result would not fit in 64 bits, the array falls back to
+    storing exact Python ints rather than silently wrapping around.
+
+    Like Money, MoneyArray has immutable semantics.
+
+    Example: MoneyArray.from_money([Money.of(3, 14), Money.of(-2, 72)])
+    """
+
+    __slots__ = ("_buffer",)
+
+    _buffer: _Cents
+
+    def __init__(self, cents: CentsLike):
+        """
+        Creates a MoneyArray holding the given numbers of cents.
+
+        An int64 NumPy array is used as-is without copying.
+
+        Arguments:
+            cents - The number of cents in each element of the array.
+        """
+        self._buffer = _freeze(_to_buffer(cents))
+
+    @staticmethod
+    def _of_buffer(buffer: _Cents) -> MoneyArray:
+        """Creates a MoneyArray from an already-validated cents buffer."""
+        array = object.__new__(MoneyArray)
+        array._buffer = _freeze(buffer)  # pylint: disable=protected-access
+        return array
+
+    @staticmethod
+    def from_money(amounts: Iterable[Money]) -> MoneyArray:
+        """
+        Creates a MoneyArray containing each of amounts.
+
+        Arguments:
+            amounts - The Money to place in the array, in order.
+        Return value: A MoneyArray containing amounts.
+        """
+        return MoneyArray([amount.all_cents() for amount in amounts])
+
+    @staticmethod
+    def parse(money_strings: MoneyStrings) -> MoneyArray:
+        """
+        Parses many strings in the form $X.XX to create a MoneyArray.
+
+        Each value is parsed exactly as Money.parse would parse it, but valid
+        values are parsed in bulk rather than one at a time. For a million
+        $X.XX values, parsing a buffer is about 25x faster per value than
+        calling Money.parse, and parsing a list of strings is about 18x faster,
+        since the strings must first be joined and encoded.
+
+        Arguments:
+            money_strings - Either an iterable of strings or a buffer of UTF-8
+                bytes containing one string per line.
+        Return value: A MoneyArray containing the parsed values, in order.
+        Raises: ValueError if any value is invalid. The message contains the
+            row index of the first invalid value and Money.parse's message.
+        """
+        if isinstance(money_strings, (bytes, bytearray, memoryview)):
+            return MoneyArray._of_buffer(
+                _parse_lines(np.frombuffer(money_strings, dtype=np.uint8))
+            )
+
+        strings = (
+            money_strings
+            if isinstance(money_strings, list)
+            else list(money_strings)
+        )
+        if len(strings) == 0:
+            return MoneyArray.zeros(0)
+
+        # A final newline keeps an empty last string from being dropped
+        encoded = np.frombuffer(
+            ("\n".join(strings) + "\n").encode("utf-8", "surrogatepass"),
+            dtype=np.uint8,
+        )
+        return MoneyArray._of_buffer(_parse_lines(encoded, strings))
+
+    @staticmethod
+    def zeros(length: int) -> MoneyArray:
+        """Creates a MoneyArray with length elements, each of which is zero."""
+        return MoneyArray._of_buffer(np.zeros(length, dtype=np.int64))
+
+    @staticmethod
+    def full(length: int, amount: Money) -> MoneyArray:
+        """Creates a MoneyArray with length elements, each equal to amount."""
+        cents = amount.all_cents()
+        if _fits(cents, cents):
+            return MoneyArray._of_buffer(np.full(length, cents, dtype=np.int64))
+        return MoneyArray._of_buffer(np.full(length, cents, dtype=np.object_))
+
+    def all_cents(self) -> _Cents:
+        """
+        Returns the total number of cents in each element.
+
+        Return value: A read-only array of cents. Its dtype is int64 unless
+            some element does not fit in 64 bits, in which case it holds
+            Python ints.
+        """
+        return self._buffer
+
+    def is_packed(self) -> bool:
+        """Returns whether this array is stored as a packed int64 buffer."""
+        return bool(self._buffer.dtype == np.int64)
+
+    def __len__(self) -> int:
+        """Returns the number of elements in this array."""
+        return len(self._buffer)
+
+    def __iter__(self) -> Iterator[Money]:
+        """Iterates over the elements of this array as Money."""
+        return (_of_cents(cents) for cents in self._buffer.tolist())
+
+    @overload
+    def __getitem__(self, key: int) -> Money:
+        """Returns the element at index key."""
+
+    @overload
+    def __getitem__(
+        self, key: Union[slice, npt.NDArray[np.integer], npt.NDArray[np.bool_]]
+    ) -> MoneyArray:
+        """Returns the elements selected by key."""
+
+    def __getitem__(
+        self,
+        key: Union[int, slice, npt.NDArray[np.integer], npt.NDArray[np.bool_]],
+    ) -> Union[Money, MoneyArray]:
+        if isinstance(key, (int, np.integer)):
+            return _of_cents(int(self._buffer[key]))
+        return MoneyArray._of_buffer(self._buffer[key])
+
+    def __str__(self) -> str:
+        """Creates a string representation using $XX.XX syntax."""
+        return f"[{', '.join(str(amount) for amount in self)}]"
+
+    def __repr__(self) -> str:
+        """Creates a representation of this array for debugging."""
+        return f"MoneyArray({self._buffer.tolist()!r})"
+
+    def __add__(self, other: Union[MoneyArray, Money]) -> MoneyArray:
+        """Creates a new MoneyArray with the element-wise sum."""
+        other_cents, other_low, other_high = _operand(other)
+        low, high = _bounds(self._buffer)
+        if (
+            self.is_packed()
+            and _fits(other_low, other_high)
+            and _fits(low + other_low, high + other_high)
+        ):
+            return MoneyArray._of_buffer(self._buffer + other_cents)
+        return MoneyArray._of_buffer(
+            _narrow(_widen(self._buffer) + _widen_operand(other_cents))
+        )
+
+    def __sub__(self, other: Union[MoneyArray, Money]) -> MoneyArray:
+        """Creates a new MoneyArray with the element-wise difference."""
+        other_cents, other_low, other_high = _operand(other)
+        low, high = _bounds(self._buffer)
+        if (
+            self.is_packed()
+            and _fits(other_low, other_high)
+            and _fits(low - other_high, high - other_low)
+        ):
+            return MoneyArray._of_buffer(self._buffer - other_cents)
+        return MoneyArray._of_buffer(
+            _narrow(_widen(self._buffer) - _widen_operand(other_cents))
+        )
+
+    def __mul__(self, other: Union[int, npt.NDArray[np.integer]]) -> MoneyArray:
+        """Creates a new MoneyArray with each element multiplied by other."""
+        factor: Union[int, _Cents]
+        if isinstance(other, (int, np.integer)):
+            factor = int(other)
+            factor_low = factor_high = factor
+        else:
+            factor = _to_buffer(other)
+            factor_low, factor_high = _bounds(factor)
+
+        low, high = _bounds(self._buffer)
+        corners = [
+            low * factor_low,
+            low * factor_high,
+            high * factor_low,
+            high * factor_high,
+        ]
+        if (
+            self.is_packed()
+            and _fits(factor_low, factor_high)
+            and _fits(min(corners), max(corners))
+        ):
+            return MoneyArray._of_buffer(self._buffer * factor)
+        return MoneyArray._of_buffer(
+            _narrow(_widen(self._buffer) * _widen_operand(factor))
+        )
+
+    def __rmul__(self, other: int) -> MoneyArray:
+        """Creates a new MoneyArray with each element multiplied by other."""
+        return self * other
+
+    def grow_and_round(self, ratio: RatioLike) -> MoneyArray:
+        """
+        Creates a new MoneyArray, multiplying each element by ratio and rounding.
+
+        Rounding is to the nearest cent, with ties going to the even cent, and
+        matches Money.grow_and_round exactly.
+
+        Arguments:
+            ratio: The number by which to multiply each element. This may be a
+                single float or an array with one float per element.
+        Return value: A new MoneyArray representing this array times ratio.
+        """
+        ratios = np.asarray(ratio, dtype=np.float64)
+
+        if self._buffer.dtype != np.int64:
+            return MoneyArray(
+                np.array(
+                    [
+                        round(cents * float(each_ratio))
+                        for cents, each_ratio in zip(
+                            self._buffer.tolist(),
+                            np.broadcast_to(ratios, self._buffer.shape),
+                        )
+                    ],
+                    dtype=np.object_,
+                )
+            )
+
+        grown = np.rint(self._buffer.astype(np.float64) * ratios)
+        return MoneyArray._of_buffer(_round_floats_to_cents(grown))
+
+    def __eq__(self, other: object) -> npt.NDArray[np.bool_]:  # type: ignore
+        """Compares each element with other for equality."""
+        if not isinstance(other, (MoneyArray, Money)):
+            return NotImplemented
+        return np.asarray(self._buffer == _operand(other)[0])
+
+    def __ne__(self, other: object) -> npt.NDArray[np.bool_]:  # type: ignore
+        """Compares each element with other for inequality."""
+        if not isinstance(other, (MoneyArray, Money)):
+            return NotImplemented
+        return np.asarray(self._buffer != _operand(other)[0])
+
+    def __lt__(self, other: Union[MoneyArray, Money]) -> npt.NDArray[np.bool_]:
+        """Checks whether each element is less than other."""
+        return np.asarray(self._buffer < _operand(other)[0])
+
+    def __le__(self, other: Union[MoneyArray, Money]) -> npt.NDArray[np.bool_]:
+        """Checks whether each element is less than or equal to other."""
+        return np.asarray(self._buffer <= _operand(other)[0])
+
+    def __gt__(self, other: Union[MoneyArray, Money]) -> npt.NDArray[np.bool_]:
+        """Checks whether each element is greater than other."""
+        return np.asarray(self._buffer > _operand(other)[0])
+
+    def __ge__(self, other: Union[MoneyArray, Money]) -> npt.NDArray[np.bool_]:
+        """Checks whether each element is greater than or equal to other."""
+        return np.asarray(self._buffer >= _operand(other)[0])
+
+    __hash__ = None  # type: ignore
+
+    def equals(self, other: MoneyArray) -> bool:
+        """Returns whether this array has the same elements as other."""
+        return len(self) == len(other) and bool(
+            np.all(self._buffer == other.all_cents())
+        )
+
+    def min(self) -> Money:
+        """Returns the smallest element. The array must not be empty."""
+        if len(self) == 0:
+            raise ValueError("min of an empty MoneyArray")
+        return Money(int(self._buffer.min()))
+
+    def max(self) -> Money:
+        """Returns the largest element. The array must not be empty."""
+        if len(self) == 0:
+            raise ValueError("max of an empty MoneyArray")
+        return Money(int(self._buffer.max()))
+
+    def maximum(self, other: Union[MoneyArray, Money]) -> MoneyArray:
+        """Creates a new MoneyArray with the element-wise max with other."""
+        other_cents, other_low, other_high = _operand(other)
+        if self.is_packed() and _fits(other_low, other_high):
+            return MoneyArray._of_buffer(np.maximum(self._buffer, other_cents))
+        return MoneyArray._of_buffer(
+            _narrow(
+                np.maximum(_widen(self._buffer), _widen_operand(other_cents))
+            )
+        )
+
+    def minimum(self, other: Union[MoneyArray, Money]) -> MoneyArray:
+        """Creates a new MoneyArray with the element-wise min with other."""
+        other_cents, other_low, other_high = _operand(other)
+        if self.is_packed() and _fits(other_low, other_high):
+            return MoneyArray._of_buffer(np.minimum(self._buffer, other_cents))
+        return MoneyArray._of_buffer(
+            _narrow(
+                np.minimum(_widen(self._buffer), _widen_operand(other_cents))
+            )
+        )
+
+    def sum(self) -> Money:
+        """Returns the sum of all elements, or zero if the array is empty."""
+        low, high = _bounds(self._buffer)
+        largest = max(abs(low), abs(high))
+        if self._buffer.dtype == np.int64 and _fits(
+            -largest * len(self), largest * len(self)
+        ):
+            return Money(int(self._buffer.sum()))
+        return Money(sum(self._buffer.tolist()))
+
+
+def _operand(
+    other: Union[MoneyArray, Money]
+) -> Tuple[Union[_Cents, int], int, int]:
+    """Returns the cents buffer or scalar of other and its bounds."""
+    if isinstance(other, Money):
+        cents = other.all_cents()
+        return (cents, cents, cents)
+    buffer = other.all_cents()
+    low, high = _bounds(buffer)
+    return (buffer, low, high)
+
+
+def _widen_operand(operand: Union[_Cents, int]) -> Union[_Cents, int]:
+    """Converts an operand to exact Python ints."""
+    if isinstance(operand, np.ndarray):
+        return _widen(operand)
+    return operand
+
+
+def _round_floats_to_cents(grown: npt.NDArray[np.float64]) -> _Cents:
+    """Converts already-rounded float cents to a cents buffer."""
+    if not np.all(np.isfinite(grown)):
+        if np.any(np.isnan(grown)):
+            raise ValueError("cannot convert float NaN to integer")
+        raise OverflowError("cannot convert float infinity to integer")
+    if grown.size == 0 or (
+        grown.min() >= _FLOAT_INT64_MIN and grown.max() < _FLOAT_INT64_MAX
+    ):
+        return grown.astype(np.int64)
+    return _narrow(np.array([int(cents) for cents in grown], dtype=np.object_))
+
+
+def _parse_one(row: int, text: Callable[[], str]) -> int:
+    """Parses a single value with Money.parse, reporting its row on failure."""
+    try:
+        return Money.parse(text()).all_cents()
+    except ValueError as error:
+        raise ValueError(f"Row {row}: {error}") from error
+
+
+def _parse_lines(  # pylint: disable=too-many-locals
+    data: _Bytes, strings: Optional[List[str]] = None
+) -> _Cents:
+    """
+    Parses newline-separated money strings in bulk.
+
+    Rows with plain ASCII $X.XX syntax are parsed with array operations. Any
+    other row, including every invalid row, is passed to Money.parse so that
+    results and error messages always match it.
+
+    Arguments:
+        data - The bytes to parse. A final newline does not start a new row.
+        strings - The strings that data encodes, one per line, if any.
+            Otherwise, rows are decoded from data as UTF-8.
+    Return value: The cents of each row (of each string, if given).
+    """
+    size = len(data)
+    ends = np.flatnonzero(data == _NEWLINE)
+    newlines = len(ends)
+    if strings is not None and newlines != len(strings):
+        # Some string contains a newline, so rows cannot be split on them
+        return _narrow(
+            np.array(
+                [
+                    _parse_one(row, partial(str, strings[row]))
+                    for row in range(len(strings))
+                ],
+                dtype=np.object_,
+            )
+        )
+    if size > 0 and data[-1] != _NEWLINE:
+        ends = np.append(ends, size)
+    if len(ends) == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+
+    if np.count_nonzero(data <= ord(" ")) == newlines:
+        # No row has whitespace (or a control character) to trim
+        first, last = starts, ends - 1
+        trimmed = np.ones(len(ends), dtype=np.bool_)
+    else:
+        first, last, trimmed = _trim_rows(data, starts, ends)
+    length = last - first + 1
+    # The longest valid row has a sign, a dollar sign, a dot and every digit
+    width = int(np.clip(length.max(), 3, _MAX_PACKED_DIGITS + 3))
+    candidate = trimmed & (length >= 2) & (length <= width)
+
+    # Right-align the content of every row in a matrix with one column per
+    # row. Its last width rows hold each row's last width bytes, so entries
+    # before content_start hold the end of the previous row. The rows above
+    # them are zeros, so that the dollars before the last three rows come in
+    # groups of four digits.
+    dollar_rows = -(-(width - 3) // 4) * 4
+    padding = dollar_rows + 3 - width
+    padded = np.concatenate((np.zeros(width, dtype=np.uint8), data))
+    row_ends = last + 1
+    digits = np.zeros((dollar_rows + 3, len(ends)), dtype=np.uint8)
+    for index, column in enumerate(digits[padding:]):
+        np.take(padded[index:], row_ends, out=column)
+    # Rows longer than width are not candidates, so their start can be -1
+    content_start = np.maximum(width - length, -1).astype(np.int8)
+
+    # Only candidates are valid, and their content is within the data
+    negative = data[np.minimum(first, size - 1)] == ord("-")
+    dollar_sign = content_start + negative
+    has_dot = digits[-3] == ord(".")
+    starts_with_dollar = data[np.minimum(first + negative, size - 1)] == ord(
+        "$"
+    )
+
+    # Read each row's digits, treating non-digits as zeros
+    digits -= np.uint8(ord("0"))
+    is_digit = digits < 10
+    is_digit &= (
+        np.arange(-padding, width, dtype=np.int8)[:, np.newaxis]
+        >= content_start
+    )
+    digits *= is_digit
+    digit_count = is_digit.sum(axis=0, dtype=np.uint8)
+
+    valid = (
+        candidate
+        & starts_with_dollar
+        & (digit_count == width - 1 - dollar_sign - has_dot)
+        & (dollar_sign <= np.where(has_dot, width - 5, width - 2))
+        & (
+            digit_count
+            <= np.where(has_dot, _MAX_PACKED_DIGITS, _MAX_PACKED_DIGITS - 2)
+        )
+    )
+
+    totals = _combine_digits(digits, dollar_rows, has_dot)
+    cents: _Cents = np.negative(totals, out=totals, where=negative)
+
+    # Let Money.parse handle everything else, in row order
+    others: Dict[int, int] = {}
+    for row in np.flatnonzero(~valid).tolist():
+        if strings is None:
+            row_bytes = bytes(data[starts[row] : ends[row]])
+            others[row] = _parse_one(row, partial(row_bytes.decode, "utf-8"))
+        else:
+            others[row] = _parse_one(row, partial(str, strings[row]))
+
+    if others and not _fits(min(others.values()), max(others.values())):
+        cents = cents.astype(np.object_)
+    for row, value in others.items():
+        cents[row] = value
+    return cents
+
+
+def _combine_digits(
+    digits: _Bytes, dollar_rows: int, has_dot: npt.NDArray[np.bool_]
+) -> npt.NDArray[np.int64]:
+    """
+    Combines a matrix of digits, one column per row, into unsigned cents.
+
+    Arguments:
+        digits - The digits of each row, right-aligned, with zeros in place of
+            every non-digit. Its first dollar_rows rows are dollars.
+        dollar_rows - The number of rows before the last three, which must be a
+            multiple of four.
+        has_dot - Whether each row has a dot before its last two digits.
+    Return value: The cents of each row, ignoring its sign.
+    """
+    # Combine the digits before the last three in pairs, then in groups of
+    # four, so that most arithmetic is on small integers
+    pairs = digits[0:dollar_rows:2] * np.uint8(10) + digits[1:dollar_rows:2]
+    groups = pairs[0::2].astype(np.uint16) * np.uint16(100) + pairs[1::2]
+    dollars = np.zeros(digits.shape[1], dtype=np.int64)
+    for group in groups:
+        dollars *= 10000
+        dollars += group
+    # With a dot, the last two digits are cents. Otherwise, the last three
+    # digits are dollars and there are no cents.
+    last_two = digits[-2] * np.uint8(10) + digits[-1]
+    totals: npt.NDArray[np.int64] = np.where(
+        has_dot,
+        dollars * 100 + last_two,
+        (dollars * 1000 + digits[-3] * np.uint16(100) + last_two) * 100,
+    )
+    return totals
+
+
+def _trim_rows(
+    data: _Bytes, starts: npt.NDArray[np.intp], ends: npt.NDArray[np.intp]
+) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.bool_]]:
+    """
+    Finds the content of each row, excluding surrounding whitespace.
+
+    Only a few whitespace characters are removed from each side. Rows with more
+    are not marked as trimmed.
+
+    Return value: The first and last index of each row's content, and whether
+        the row was completely trimmed.
+    """
+    size = len(data)
+    first = starts.copy()
+    last = ends - 1
+    for _ in range(_MAX_TRIMMED_SPACE):
+        leading = (first <= last) & _IS_SPACE[data[np.minimum(first, size - 1)]]
+        trailing = (first <= last) & _IS_SPACE[data[np.maximum(last, 0)]]
+        if not leading.any() and not trailing.any():
+            return (first, last, np.ones(len(starts), dtype=np.bool_))
+        first += leading
+        last -= trailing
+
+    trimmed = ~(
+        (first <= last)
+        & (
+            _IS_SPACE[data[np.minimum(first, size - 1)]]
+            | _IS_SPACE[data[np.maximum(last, 0)]]
+        )
+    )
+    return (first, last, trimmed)
@@ -1,7 +1,9 @@
 """Tax-related finance utilities."""
 
 from .bracket import Bracket, BracketTax
+from .compiled import compile_piecewise, compile_tax, CompiledTax, sweep
 from .composite import CompositeTax
+from .cube import evaluate_cube, TaxCube
 from .federal import (
     FederalIncomeTax,
     FICATax,
@@ -10,6 +12,11 @@ from .federal import (
     SocialSecurityTax,
 )
 from .flat import FlatTax
+from .grossup import GrossUpSolver
 from .maximum import MaximumTax
+from .piecewise import PiecewiseLinearTax, SweepChunk
+from .profile import NodeProfile, TaxProfiler
+from .scenario import Scenario
+from .system import CacheStats, DEFAULT_TAX_SYSTEM, TaxSystem
 from .tax import IncomeTax
 from . import state
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
 
 from ..earnings import Earnings, EarningsTaxPolicy
 from ..money import Money
+from ..money_array import MoneyArray
+
+# calculate_many uses int64 arithmetic when incomes, thresholds, and taxes are
+# all smaller than this, so no intermediate value can overflow
+_MAX_KERNEL_CENTS = 2**62
 
+_Array = npt.NDArray[Any]
 
-@dataclass
+
+@dataclass(frozen=True)
 class Bracket:
     """A tax bracket starting at threshold and continuing to higher incomes."""
 
@@ -35,6 +47,50 @@ class BracketTax:
         self.brackets = sorted(brackets, key=get_threshold, reverse=True)
         self.policy = policy
 
+        # Precompute, for each distinct threshold in ascending order, the tax
+        # owed on income up to that threshold. If thresholds are repeated, only
+        # the first such bracket applies.
+        self._thresholds: list[int] = []
+        self._rates: list[float] = []
+        for bracket in self.brackets:
+            threshold = bracket.threshold.all_cents()
+            if not self._thresholds or self._thresholds[-1] != threshold:
+                self._thresholds.append(threshold)
+                self._rates.append(bracket.marginal_rate)
+        self._thresholds.reverse()
+        self._rates.reverse()
+
+        self._base_taxes: list[int] = [0]
+        for index in range(1, len(self._thresholds)):
+            width = Money(self._thresholds[index] - self._thresholds[index - 1])
+            self._base_taxes.append(
+                self._base_taxes[-1]
+                + width.grow_and_round(self._rates[index - 1]).all_cents()
+            )
+
+        # The (thresholds, rates, base taxes) arrays used by calculate_many
+        self._kernel: Optional[tuple[_Array, _Array, _Array]] = None
+        if all(
+            abs(cents) < _MAX_KERNEL_CENTS
+            for cents in self._thresholds + self._base_taxes
+        ):
+            self._kernel = (
+                np.array(self._thresholds, dtype=np.int64),
+                np.array(self._rates, dtype=np.float64),
+                np.array(self._base_taxes, dtype=np.int64),
+            )
+
+    def cumulative_brackets(self) -> list[tuple[int, float, int]]:
+        """
+        Returns the brackets that apply, in ascending order of threshold.
+
+        Return value: A (threshold, marginal rate, base tax) tuple for each
+            distinct threshold, where amounts are in cents. Taxable income
+            above a threshold, up to the next one, is taxed at base tax plus
+            the rounded product of the marginal rate and the excess.
+        """
+        return list(zip(self._thresholds, self._rates, self._base_taxes))
+
     def calculate(self, earnings: Earnings) -> Money:
         """
         Calculates the amount of tax to be levied on earnings.
@@ -42,14 +98,92 @@ class BracketTax:
         Arguments:
             earnings - The earnings to tax.
         Return value: The total tax, calculated by summing the amount of income
-            in each tax bracket times that bracket's marginal_rate.
+            in each tax bracket times that bracket's marginal_rate. The tax in
+            each bracket is rounded to the nearest cent separately.
         """
-        tax = Money.ZERO
-        taxable_income = earnings.taxable_income(self.policy)
-        for bracket in self.brackets:
-            if taxable_income > bracket.threshold:
-                tax += (taxable_income - bracket.threshold).grow_and_round(
-                    bracket.marginal_rate
-                )
-                taxable_income = bracket.threshold
-        return tax
+        return self.calculate_on_taxable_income(
+            earnings.taxable_income(self.policy)
+        )
+
+    def calculate_many(self, earnings: Sequence[Earnings]) -> MoneyArray:
+        """
+        Calculates the amount of tax to be levied on each of earnings.
+
+        Arguments:
+            earnings - The earnings of each taxpayer.
+        Return value: The tax on each of earnings, in order, exactly as
+            calculate would calculate it.
+        """
+        return self.calculate_on_taxable(
+            Earnings.taxable_incomes(earnings, self.policy)
+        )
+
+    def calculate_on_taxable(self, taxable_incomes: MoneyArray) -> MoneyArray:
+        """
+        Calculates the amount of tax to be levied on many taxable incomes.
+
+        All incomes are placed in their brackets with a single sorted search
+        over the thresholds.
+
+        Arguments:
+            taxable_incomes - Incomes to which this tax's policy has already
+                been applied.
+        Return value: The tax on each income, in order.
+        """
+        if len(taxable_incomes) == 0 or len(self._thresholds) == 0:
+            return MoneyArray.zeros(len(taxable_incomes))
+        if not (
+            self._kernel is not None
+            and taxable_incomes.is_packed()
+            and abs(taxable_incomes.min().all_cents()) < _MAX_KERNEL_CENTS
+            and abs(taxable_incomes.max().all_cents()) < _MAX_KERNEL_CENTS
+        ):
+            return MoneyArray.from_money(
+                self.calculate_on_taxable_income(income)
+                for income in taxable_incomes
+            )
+
+        thresholds, rates, base_taxes = self._kernel
+        incomes = taxable_incomes.all_cents()
+        indices = np.searchsorted(thresholds, incomes) - 1
+        in_bracket = indices >= 0
+        indices = np.maximum(indices, 0)
+        excess = np.where(in_bracket, incomes - thresholds[indices], 0)
+        top_bracket_taxes = np.rint(excess.astype(np.float64) * rates[indices])
+        if not (
+            np.all(np.isfinite(top_bracket_taxes))
+            and np.all(np.abs(top_bracket_taxes) < _MAX_KERNEL_CENTS)
+        ):
+            return MoneyArray.from_money(
+                self.calculate_on_taxable_income(income)
+                for income in taxable_incomes
+            )
+        return MoneyArray(
+            np.where(
+                in_bracket,
+                top_bracket_taxes.astype(np.int64) + base_taxes[indices],
+                0,
+            )
+        )
+
+    def calculate_on_taxable_income(self, taxable_income: Money) -> Money:
+        """
+        Calculates the amount of tax to be levied on a taxable income.
+
+        Arguments:
+            taxable_income - An income to which this tax's policy has already
+                been applied.
+        Return value: The tax on taxable_income.
+        """
+        return Money(
+            self.calculate_on_taxable_cents(taxable_income.all_cents())
+        )
+
+    def calculate_on_taxable_cents(self, taxable_cents: int) -> int:
+        """Like calculate_on_taxable_income, but in cents rather than Money."""
+        index = bisect_left(self._thresholds, taxable_cents) - 1
+        if index < 0:
+            return 0
+        return self._base_taxes[index] + round(
+            (taxable_cents - self._thresholds[index]) * self._rates[index]
+        )
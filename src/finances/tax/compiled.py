@@ -0,0 +1,345 @@
+"""Contains a fused evaluator for trees of income taxes."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+from ..earnings import (
+    Earnings,
+    EarningsBatch,
+    EarningsTaxPolicy,
+    EarningsType,
+    TaxCategory,
+)
+from ..money import Money
+from ..money_array import MoneyArray
+from .bracket import BracketTax
+from .composite import CompositeTax
+from .flat import FlatTax
+from .maximum import MaximumTax
+from .piecewise import LeafSchedule, PiecewiseLinearTax, SweepChunk
+from .program import Instruction, Operation, run_program
+from .tax import IncomeTax
+
+
+class _TaxableIncomeTax(Protocol):
+    """A tax that can be levied directly on its policy's taxable income."""
+
+    policy: EarningsTaxPolicy
+
+    def calculate_on_taxable_cents(self, taxable_cents: int) -> int:
+        """Calculates the tax, in cents, on a taxable income in cents."""
+
+    def calculate_on_taxable(self, taxable_incomes: MoneyArray) -> MoneyArray:
+        """Calculates the amount of tax to be levied on many taxable incomes."""
+
+
+@dataclass(frozen=True)
+class _Leaf:
+    """
+    A tax in a compiled tax tree that is not a sum or maximum of other taxes.
+
+    If taxable is None, the tax is opaque and is calculated directly from
+    earnings. Otherwise, taxable is the same tax, which is calculated from the
+    projection at index projection, clamped to [floor, ceiling].
+    """
+
+    tax: IncomeTax
+    taxable: Optional[_TaxableIncomeTax]
+    projection: int
+    floor: Optional[int]
+    ceiling: Optional[int]
+
+
+_Projection = Tuple[TaxCategory, EarningsType]
+
+
+class CompiledTax:
+    """
+    An income tax tree flattened into a single evaluator.
+
+    Each distinct (category, earnings type) projection of the earnings is
+    calculated once per evaluation, in cents, and shared by every leaf tax
+    that uses it, instead of once per leaf. Nested sums are flattened, and the
+    remaining sums and maximums are evaluated as a postfix program over the
+    leaf results.
+
+    Results are identical to calling calculate on the original tree.
+
+    Example: compile_tax(FICATax(2022, FilingStatus.SINGLE)).calculate(earnings)
+    """
+
+    def __init__(self, tax: IncomeTax):
+        """
+        Compiles a tax tree.
+
+        Arguments:
+            tax - The tax to compile. CompositeTax and MaximumTax nodes are
+                flattened, and BracketTax and FlatTax leaves share their
+                projections. Any other tax is calculated as-is.
+        """
+        self._projections: List[_Projection] = []
+        self._leaves: List[_Leaf] = []
+        self._program: List[Instruction] = []
+        self._compile(tax)
+        self._is_sum = all(
+            operation is not Operation.MAX for operation, _ in self._program
+        )
+
+    def _compile(self, tax: IncomeTax, in_sum: bool = False) -> int:
+        """
+        Appends the instructions that calculate tax to the program.
+
+        Arguments:
+            tax - The tax to calculate.
+            in_sum - Whether tax is a term of a sum. If so, and tax is itself a
+                sum, its terms are added by the enclosing sum instead.
+        Return value: The number of values the instructions push.
+        """
+        if isinstance(tax, CompositeTax):
+            count = sum(
+                self._compile(child, in_sum=True) for child in tax.taxes
+            )
+            if in_sum:
+                return count
+            self._program.append((Operation.SUM, count))
+            return 1
+        if isinstance(tax, MaximumTax):
+            for child in tax.taxes:
+                self._compile(child)
+            self._program.append((Operation.MAX, len(tax.taxes)))
+            return 1
+
+        taxable: Optional[_TaxableIncomeTax] = None
+        projection = -1
+        floor: Optional[int] = None
+        ceiling: Optional[int] = None
+        if isinstance(tax, (BracketTax, FlatTax)):
+            taxable = tax
+            key = (tax.policy.category, tax.policy.earnings_type)
+            if key not in self._projections:
+                self._projections.append(key)
+            projection = self._projections.index(key)
+            if tax.policy.floor is not None:
+                floor = tax.policy.floor.all_cents()
+            if tax.policy.ceiling is not None:
+                ceiling = tax.policy.ceiling.all_cents()
+
+        self._program.append((Operation.LEAF, len(self._leaves)))
+        self._leaves.append(_Leaf(tax, taxable, projection, floor, ceiling))
+        return 1
+
+    def projection_count(self) -> int:
+        """Returns the number of distinct projections of earnings used."""
+        return len(self._projections)
+
+    def leaf_count(self) -> int:
+        """Returns the number of leaf taxes in the compiled tree."""
+        return len(self._leaves)
+
+    def calculate(self, earnings: Earnings) -> Money:
+        """
+        Calculates the amount of tax to be levied on earnings.
+
+        Arguments:
+            earnings - The earnings to tax.
+        Return value: The tax, exactly as the original tree would calculate it.
+        """
+        incomes = self._project(earnings)
+        values: List[int] = []
+        for leaf in self._leaves:
+            taxable = leaf.taxable
+            if taxable is None:
+                values.append(leaf.tax.calculate(earnings).all_cents())
+                continue
+            income = incomes[leaf.projection]
+            if leaf.floor is not None and income < leaf.floor:
+                income = leaf.floor
+            if leaf.ceiling is not None and income > leaf.ceiling:
+                income = leaf.ceiling
+            values.append(taxable.calculate_on_taxable_cents(income))
+
+        if self._is_sum:
+            return Money(sum(values))
+        return Money(
+            run_program(self._program, values, _sum_of_ints, _max_of_ints)
+        )
+
+    def _project(self, earnings: Earnings) -> List[int]:
+        """
+        Calculates each projection of earnings, in cents.
+
+        Each AGI is calculated once and shared. The same checks as
+        Earnings.of_type are made.
+        """
+        gross = earnings.gross_income.all_cents()
+        agis: Dict[TaxCategory, int] = {}
+        incomes: List[int] = []
+        for category, earnings_type in self._projections:
+            if earnings_type is EarningsType.GROSS_INCOME:
+                incomes.append(gross)
+                continue
+
+            agi = agis.get(category)
+            if agi is None:
+                adjustment = earnings.adjustments.get(category)
+                if adjustment is None:
+                    raise AssertionError(f"no adjustments for {category}")
+                agi = gross - adjustment.all_cents()
+                agis[category] = agi
+
+            if earnings_type is EarningsType.AGI:
+                incomes.append(agi)
+            elif earnings_type is EarningsType.MAGI:
+                amount = earnings.magi_additions.get(category)
+                if amount is None:
+                    raise AssertionError(f"no MAGI additions for {category}")
+                incomes.append(agi + amount.all_cents())
+            else:
+                amount = earnings.deductions.get(category)
+                if amount is None:
+                    raise AssertionError(f"no deductions for {category}")
+                incomes.append(agi - amount.all_cents())
+        return incomes
+
+    def _project_many(self, earnings: EarningsBatch) -> List[MoneyArray]:
+        """
+        Calculates each projection of each of earnings.
+
+        Each column (gross income, adjustments, etc.) is gathered once and
+        shared. The same checks as Earnings.of_type_many are made.
+        """
+        return [
+            earnings.of_type(category, earnings_type)
+            for category, earnings_type in self._projections
+        ]
+
+    def calculate_many(self, earnings: Sequence[Earnings]) -> MoneyArray:
+        """
+        Calculates the amount of tax to be levied on each of earnings.
+
+        Arguments:
+            earnings - The earnings of each taxpayer.
+        Return value: The tax on each of earnings, in order, exactly as the
+            original tree would calculate it.
+        """
+        batch = EarningsBatch.of(earnings)
+        incomes = self._project_many(batch)
+        values: List[MoneyArray] = []
+        for leaf in self._leaves:
+            taxable = leaf.taxable
+            if taxable is None:
+                values.append(leaf.tax.calculate_many(batch))
+            else:
+                values.append(
+                    taxable.calculate_on_taxable(
+                        taxable.policy.clamp_many(incomes[leaf.projection])
+                    )
+                )
+
+        def add(operands: List[MoneyArray]) -> MoneyArray:
+            return sum(operands, start=MoneyArray.zeros(len(earnings)))
+
+        return run_program(self._program, values, add, _maximum_of_arrays)
+
+    def piecewise(self, template: Earnings) -> PiecewiseLinearTax:
+        """
+        Compiles this tax into a piecewise-linear function of gross income.
+
+        Arguments:
+            template - Earnings whose adjustments, deductions, and MAGI
+                additions are held fixed while gross income varies.
+        Return value: A PiecewiseLinearTax whose tax at any gross income
+            equals calculate on the template with that gross income.
+        """
+        incomes = self._project(template)
+        gross = template.gross_income.all_cents()
+        schedules: List[LeafSchedule] = []
+        for leaf in self._leaves:
+            taxable = leaf.taxable
+            offset = incomes[leaf.projection] - gross if taxable else 0
+            if isinstance(taxable, BracketTax):
+                schedules.append(
+                    LeafSchedule(
+                        offset,
+                        leaf.floor,
+                        leaf.ceiling,
+                        brackets=tuple(taxable.cumulative_brackets()),
+                    )
+                )
+            elif isinstance(taxable, FlatTax):
+                schedules.append(
+                    LeafSchedule(
+                        offset, leaf.floor, leaf.ceiling, flat_rate=taxable.rate
+                    )
+                )
+            else:
+                raise ValueError(
+                    f"Cannot compile {type(leaf.tax).__name__} into a "
+                    "piecewise-linear tax"
+                )
+        return PiecewiseLinearTax(schedules, self._program)
+
+
+def _sum_of_ints(operands: List[int]) -> int:
+    return sum(operands)
+
+
+def _max_of_ints(operands: List[int]) -> int:
+    return max(operands)
+
+
+def _maximum_of_arrays(operands: List[MoneyArray]) -> MoneyArray:
+    result = operands[0]
+    for operand in operands[1:]:
+        result = result.maximum(operand)
+    return result
+
+
+def compile_tax(tax: IncomeTax) -> CompiledTax:
+    """
+    Compiles a tree of income taxes into a single fused evaluator.
+
+    Arguments:
+        tax - The tax to compile.
+    Return value: A CompiledTax that calculates the same tax as tax.
+    """
+    return CompiledTax(tax)
+
+
+def compile_piecewise(tax: IncomeTax, template: Earnings) -> PiecewiseLinearTax:
+    """
+    Compiles a tree of income taxes into a piecewise-linear function of income.
+
+    Arguments:
+        tax - The tax to compile. Every leaf must be a BracketTax or FlatTax.
+        template - Earnings whose adjustments, deductions, and MAGI additions
+            are held fixed while gross income varies.
+    Return value: A PiecewiseLinearTax that calculates the same tax as tax on
+        the template with any gross income.
+    """
+    return CompiledTax(tax).piecewise(template)
+
+
+def sweep(
+    tax: IncomeTax,
+    template: Earnings,
+    start: Money,
+    stop: Money,
+    step: Money,
+) -> Iterator[SweepChunk]:
+    """
+    Calculates a tax and its rates over a grid of gross incomes.
+
+    Arguments:
+        tax - The tax to calculate. Every leaf must be a BracketTax or FlatTax.
+        template - Earnings whose adjustments, deductions, and MAGI additions
+            are held fixed while gross income varies.
+        start - The first gross income.
+        stop - The end of the grid, which is not included, like range.
+        step - The distance between gross incomes. It must be positive.
+    Return value: An iterator over consecutive chunks of the grid. See
+        PiecewiseLinearTax.sweep, which can also choose the chunk size.
+    """
+    return compile_piecewise(tax, template).sweep(start, stop, step)
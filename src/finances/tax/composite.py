@@ -2,22 +2,26 @@
 
 from __future__ import annotations
 
-from ..earnings import Earnings
+from typing import Sequence, Tuple
+
+from ..earnings import Earnings, EarningsBatch
 from ..money import Money
+from ..money_array import MoneyArray
 from .tax import IncomeTax
 
 
 class CompositeTax:
     """An income tax that is calculated as the sum of 0 or more other taxes."""
 
-    def __init__(self, taxes: list[IncomeTax]):
+    def __init__(self, taxes: Sequence[IncomeTax]):
         """
         Creates a CompositeTax.
 
         Arguments:
-            taxes - The taxes to sum in order to levy this tax.
+            taxes - The taxes to sum in order to levy this tax. They are
+                stored as a tuple, so they cannot be changed later.
         """
-        self.taxes = taxes
+        self.taxes: Tuple[IncomeTax, ...] = tuple(taxes)
 
     def calculate(self, earnings: Earnings) -> Money:
         """
@@ -30,3 +34,17 @@ class CompositeTax:
         return sum(
             (tax.calculate(earnings) for tax in self.taxes), start=Money.ZERO
         )
+
+    def calculate_many(self, earnings: Sequence[Earnings]) -> MoneyArray:
+        """
+        Calculates the amount of tax to be levied on each of earnings.
+
+        Arguments:
+            earnings - The earnings of each taxpayer.
+        Return value: The sum of all of self.taxes levied on each of earnings.
+        """
+        batch = EarningsBatch.of(earnings)
+        return sum(
+            (tax.calculate_many(batch) for tax in self.taxes),
+            start=MoneyArray.zeros(len(earnings)),
+        )
@@ -0,0 +1,249 @@
+"""Contains evaluation of taxes over every year, filing status, and state."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from ..earnings import Earnings, EarningsBatch, EarningsTaxPolicy
+from ..money_array import MoneyArray
+from .bracket import BracketTax
+from .composite import CompositeTax
+from .federal import FilingStatus
+from .maximum import MaximumTax
+from .system import DEFAULT_TAX_SYSTEM, TaxSystem
+from .tax import IncomeTax
+
+# Stacked bracket tables are evaluated with int64 arithmetic when incomes,
+# thresholds, and taxes are all smaller than this, like BracketTax
+_MAX_KERNEL_CENTS = 2**62
+
+_Array = npt.NDArray[Any]
+
+
+@dataclass(frozen=True)
+class TaxCube:
+    """
+    The taxes of many taxpayers for every (year, filing status, state).
+
+    cents has shape (years, filing statuses, states, taxpayers), and its axes
+    are labeled by years, filing_statuses, and states.
+    """
+
+    years: Tuple[int, ...]
+    filing_statuses: Tuple[FilingStatus, ...]
+    states: Tuple[Optional[str], ...]
+    cents: _Array
+
+    def tax(
+        self, year: int, filing_status: FilingStatus, state: Optional[str]
+    ) -> MoneyArray:
+        """
+        Returns the tax of each taxpayer in one cell of this cube.
+
+        Arguments:
+            year - One of years.
+            filing_status - One of filing_statuses.
+            state - One of states.
+        Return value: The tax of each taxpayer, in order.
+        """
+        return MoneyArray(
+            self.cents[
+                self.years.index(year),
+                self.filing_statuses.index(filing_status),
+                self.states.index(state),
+            ]
+        )
+
+
+class _Evaluator:
+    """
+    Evaluates many tax trees on one batch of earnings, sharing work.
+
+    Each projection of the earnings is calculated once for every tree, each
+    distinct tax object is calculated once, and every BracketTax is
+    calculated in one stacked array operation.
+    """
+
+    def __init__(self, batch: EarningsBatch):
+        self.batch = batch
+        self._taxable: Dict[EarningsTaxPolicy, MoneyArray] = {}
+        self._results: Dict[int, MoneyArray] = {}
+
+    def taxable_income(self, policy: EarningsTaxPolicy) -> MoneyArray:
+        """Returns the taxable incomes under policy, calculated once."""
+        incomes = self._taxable.get(policy)
+        if incomes is None:
+            incomes = self.batch.taxable_income(policy)
+            self._taxable[policy] = incomes
+        return incomes
+
+    def add_brackets(self, taxes: Sequence[IncomeTax]) -> None:
+        """Calculates every BracketTax in taxes in one stacked operation."""
+        leaves: Dict[int, BracketTax] = {}
+        pending = list(taxes)
+        while pending:
+            tax = pending.pop()
+            if isinstance(tax, (CompositeTax, MaximumTax)):
+                pending.extend(tax.taxes)
+            elif isinstance(tax, BracketTax):
+                leaves[id(tax)] = tax
+        if not leaves:
+            return
+
+        incomes = [self.taxable_income(tax.policy) for tax in leaves.values()]
+        if not all(
+            column.is_packed()
+            and abs(column.min().all_cents()) < _MAX_KERNEL_CENTS
+            and abs(column.max().all_cents()) < _MAX_KERNEL_CENTS
+            for column in incomes
+            if len(column) > 0
+        ):
+            return
+        results = _stacked_bracket_taxes(
+            [tax.cumulative_brackets() for tax in leaves.values()],
+            np.stack([column.all_cents() for column in incomes]),
+        )
+        if results is not None:
+            for key, result in zip(leaves, results):
+                self._results[key] = MoneyArray(result)
+
+    def calculate(self, tax: IncomeTax) -> MoneyArray:
+        """Calculates tax on the batch, calculating each tax object once."""
+        result = self._results.get(id(tax))
+        if result is not None:
+            return result
+        if isinstance(tax, CompositeTax):
+            result = sum(
+                (self.calculate(child) for child in tax.taxes),
+                start=MoneyArray.zeros(len(self.batch)),
+            )
+        elif isinstance(tax, MaximumTax):
+            result = self.calculate(tax.taxes[0])
+            for child in tax.taxes[1:]:
+                result = result.maximum(self.calculate(child))
+        elif isinstance(tax, BracketTax):
+            result = tax.calculate_on_taxable(self.taxable_income(tax.policy))
+        else:
+            result = tax.calculate_many(self.batch)
+        self._results[id(tax)] = result
+        return result
+
+
+def _padded_tables(
+    brackets: List[List[Tuple[int, float, int]]], width: int
+) -> Tuple[_Array, _Array, _Array]:
+    """
+    Stacks bracket tables into (thresholds, rates, base taxes) arrays with one
+    row per table. Tables are padded with thresholds that no income exceeds.
+    """
+    thresholds = np.full((len(brackets), width), _MAX_KERNEL_CENTS)
+    rates = np.zeros((len(brackets), width))
+    base_taxes = np.zeros((len(brackets), width), dtype=np.int64)
+    for row, table in enumerate(brackets):
+        for column, (threshold, rate, base_tax) in enumerate(table):
+            thresholds[row, column] = threshold
+            rates[row, column] = rate
+            base_taxes[row, column] = base_tax
+    return (thresholds, rates, base_taxes)
+
+
+def _stacked_bracket_taxes(
+    brackets: List[List[Tuple[int, float, int]]], incomes: _Array
+) -> Optional[_Array]:
+    """
+    Calculates many bracket taxes at once.
+
+    Arguments:
+        brackets - Each tax's cumulative brackets.
+        incomes - Each tax's taxable incomes, one row per tax, in int64 cents
+            smaller in magnitude than _MAX_KERNEL_CENTS.
+    Return value: Each tax's taxes, one row per tax, exactly as
+        BracketTax.calculate_on_taxable would calculate them, or None if an
+        amount could overflow.
+    """
+    width = max(len(table) for table in brackets)
+    if width == 0 or not all(
+        abs(threshold) < _MAX_KERNEL_CENTS and abs(base_tax) < _MAX_KERNEL_CENTS
+        for table in brackets
+        for threshold, _, base_tax in table
+    ):
+        return None
+
+    thresholds, rates, base_taxes = _padded_tables(brackets, width)
+
+    # The index of each income's bracket is the number of thresholds below it,
+    # minus one, as in BracketTax.calculate_on_taxable. Indices are offset by
+    # row so that each table entry is gathered from the flattened tables.
+    indices = np.zeros(incomes.shape, dtype=np.int64)
+    for column in range(width):
+        indices += incomes > thresholds[:, column, np.newaxis]
+    in_bracket = indices > 0
+    indices += np.arange(0, thresholds.size, width)[:, np.newaxis] - 1
+    np.maximum(indices, 0, out=indices)
+    excess = incomes - thresholds.take(indices)
+    top_bracket_taxes = np.rint(excess * rates.take(indices))
+    if not np.all(np.abs(top_bracket_taxes[in_bracket]) < _MAX_KERNEL_CENTS):
+        return None
+    return np.where(
+        in_bracket,
+        top_bracket_taxes.astype(np.int64) + base_taxes.take(indices),
+        0,
+    )
+
+
+def evaluate_cube(
+    earnings: Union[Earnings, Sequence[Earnings]],
+    years: Sequence[int],
+    filing_statuses: Sequence[FilingStatus] = tuple(FilingStatus),
+    states: Sequence[Optional[str]] = (None,),
+    system: TaxSystem = DEFAULT_TAX_SYSTEM,
+) -> TaxCube:
+    """
+    Calculates federal, state, and FICA taxes for every combination of inputs.
+
+    Each projection of the earnings (e.g. the federal AGI) is calculated once
+    and shared by every cell, taxes shared between cells (e.g. FICA for every
+    state) are calculated once, and the bracket tables of every cell are
+    evaluated together as one stacked array operation.
+
+    Arguments:
+        earnings - One taxpayer's earnings, or the earnings of many taxpayers
+            (e.g. an EarningsBatch).
+        years - The tax years.
+        filing_statuses - The federal filing statuses.
+        states - The states' postal codes, or None for no state income tax.
+        system - The registry to get each cell's tax stack from.
+    Return value: A TaxCube with each cell's tax on each of earnings, exactly
+        as the cell's CompositeTax would calculate it.
+    """
+    batch = EarningsBatch.of(
+        [earnings] if isinstance(earnings, Earnings) else earnings
+    )
+    cells = [
+        (year, filing_status, state)
+        for year in years
+        for filing_status in filing_statuses
+        for state in states
+    ]
+    stacks: List[IncomeTax] = [system.income_taxes(*cell) for cell in cells]
+    evaluator = _Evaluator(batch)
+    evaluator.add_brackets(stacks)
+    # The cube holds Python ints, like MoneyArray, if some tax does not fit in
+    # 64 bits
+    cents = (
+        np.stack([evaluator.calculate(stack).all_cents() for stack in stacks])
+        if stacks
+        else np.zeros((0, len(batch)), dtype=np.int64)
+    )
+    return TaxCube(
+        tuple(years),
+        tuple(filing_statuses),
+        tuple(states),
+        cents.reshape(
+            (len(years), len(filing_statuses), len(states), len(batch))
+        ),
+    )
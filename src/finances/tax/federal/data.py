@@ -1,9 +1,18 @@
 """Federal tax data (e.g. tax rates and thresholds)."""
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Mapping
+
 from ...money import Money
+from ..parameters import get_money, ParameterFile, YearTable
 from .status import FilingStatus
 
+# Parameters that change every year are in parameters.json
+FEDERAL_PARAMETERS = ParameterFile(
+    Path(__file__).with_name("parameters.json"), "federal"
+)
+
 MEDICARE_TAX_DATA_YEARS = {2021, 2022}
 
 MEDICARE_TAX_RATE = 0.0145
@@ -25,7 +34,6 @@ ADDITIONAL_MEDICARE_TAX_RATE = 0.009
 
 SOCIAL_SECURITY_TAX_RATE = 0.062
 
-WAGE_BASE_LIMIT_BY_YEAR: dict[int, Money] = {
-    2021: Money.of(142800),
-    2022: Money.of(147000),
-}
+WAGE_BASE_LIMIT_BY_YEAR: Mapping[int, Money] = YearTable(
+    FEDERAL_PARAMETERS, lambda raw: get_money(raw, "wage_base_limit")
+)
@@ -2,103 +2,50 @@
 
 from __future__ import annotations
 
+from typing import Mapping
+
 from ...earnings import EarningsTaxPolicy, EarningsType, TaxCategory
-from ...money import Money
 from ..bracket import Bracket, BracketTax
+from ..parameters import get_field, get_money, get_rate, RawSlice, YearTable
+from .data import FEDERAL_PARAMETERS
 from .status import FilingStatus
 
 
-def _joint_brackets(
-    brackets: list[Bracket],
-) -> dict[FilingStatus, list[Bracket]]:
-    return dict.fromkeys(
-        [FilingStatus.MARRIED_FILING_JOINTLY, FilingStatus.SURVIVING_SPOUSE],
-        brackets,
-    )
+def _brackets(raw: RawSlice) -> dict[FilingStatus, list[Bracket]]:
+    """
+    Builds each filing status's brackets from a year's raw parameters.
+
+    A filing status whose entry is the name of another status shares that
+    status's brackets.
+    """
+    table = get_field(raw, "income_brackets", dict)
+    by_name: dict[str, list[Bracket]] = {}
+    for name, entry in table.items():
+        if isinstance(entry, list):
+            by_name[name] = []
+            for bracket in entry:
+                if not isinstance(bracket, dict):
+                    raise ValueError(f"Expected a bracket, got {bracket!r}")
+                by_name[name].append(
+                    Bracket(
+                        get_rate(bracket, "rate"),
+                        get_money(bracket, "threshold"),
+                    )
+                )
+
+    brackets: dict[FilingStatus, list[Bracket]] = {}
+    for status in FilingStatus:
+        entry = table.get(status.name)
+        name = entry if isinstance(entry, str) else status.name
+        if name not in by_name:
+            raise ValueError(f"Expected a list of brackets for {status.name}")
+        brackets[status] = by_name[name]
+    return brackets
 
 
-BRACKETS_BY_YEAR: dict[int, dict[FilingStatus, list[Bracket]]] = {
-    2021: {
-        **_joint_brackets(
-            [
-                Bracket(0.37, Money.of(628300)),
-                Bracket(0.35, Money.of(418850)),
-                Bracket(0.32, Money.of(329850)),
-                Bracket(0.24, Money.of(172750)),
-                Bracket(0.22, Money.of(81050)),
-                Bracket(0.12, Money.of(19900)),
-                Bracket(0.10, Money.of(0)),
-            ]
-        ),
-        FilingStatus.HEAD_OF_HOUSEHOLD: [
-            Bracket(0.37, Money.of(523600)),
-            Bracket(0.35, Money.of(209400)),
-            Bracket(0.32, Money.of(164900)),
-            Bracket(0.24, Money.of(86350)),
-            Bracket(0.22, Money.of(54200)),
-            Bracket(0.12, Money.of(14200)),
-            Bracket(0.10, Money.of(0)),
-        ],
-        FilingStatus.SINGLE: [
-            Bracket(0.37, Money.of(523600)),
-            Bracket(0.35, Money.of(209425)),
-            Bracket(0.32, Money.of(164925)),
-            Bracket(0.24, Money.of(86375)),
-            Bracket(0.22, Money.of(40525)),
-            Bracket(0.12, Money.of(9950)),
-            Bracket(0.10, Money.of(0)),
-        ],
-        FilingStatus.MARRIED_FILING_SEPARATELY: [
-            Bracket(0.37, Money.of(314150)),
-            Bracket(0.35, Money.of(209425)),
-            Bracket(0.32, Money.of(164925)),
-            Bracket(0.24, Money.of(86375)),
-            Bracket(0.22, Money.of(40525)),
-            Bracket(0.12, Money.of(9950)),
-            Bracket(0.10, Money.of(0)),
-        ],
-    },
-    2022: {
-        **_joint_brackets(
-            [
-                Bracket(0.37, Money.of(647850)),
-                Bracket(0.35, Money.of(431900)),
-                Bracket(0.32, Money.of(340100)),
-                Bracket(0.24, Money.of(178150)),
-                Bracket(0.22, Money.of(83550)),
-                Bracket(0.12, Money.of(20550)),
-                Bracket(0.10, Money.of(0)),
-            ]
-        ),
-        FilingStatus.HEAD_OF_HOUSEHOLD: [
-            Bracket(0.37, Money.of(539900)),
-            Bracket(0.35, Money.of(215950)),
-            Bracket(0.32, Money.of(170050)),
-            Bracket(0.24, Money.of(89050)),
-            Bracket(0.22, Money.of(55900)),
-            Bracket(0.12, Money.of(14650)),
-            Bracket(0.10, Money.of(0)),
-        ],
-        FilingStatus.SINGLE: [
-            Bracket(0.37, Money.of(539900)),
-            Bracket(0.35, Money.of(215950)),
-            Bracket(0.32, Money.of(170050)),
-            Bracket(0.24, Money.of(89075)),
-            Bracket(0.22, Money.of(41775)),
-            Bracket(0.12, Money.of(10275)),
-            Bracket(0.10, Money.of(0)),
-        ],
-        FilingStatus.MARRIED_FILING_SEPARATELY: [
-            Bracket(0.37, Money.of(323925)),
-            Bracket(0.35, Money.of(215950)),
-            Bracket(0.32, Money.of(170050)),
-            Bracket(0.24, Money.of(89075)),
-            Bracket(0.22, Money.of(41775)),
-            Bracket(0.12, Money.of(10275)),
-            Bracket(0.10, Money.of(0)),
-        ],
-    },
-}
+BRACKETS_BY_YEAR: Mapping[int, dict[FilingStatus, list[Bracket]]] = YearTable(
+    FEDERAL_PARAMETERS, _brackets
+)
 
 
 class FederalIncomeTax(BracketTax):
@@ -1,7 +1,10 @@
 """Contains classes and utilities related to fixed-percentage taxes."""
 
+from typing import Sequence
+
 from ..earnings import Earnings, EarningsTaxPolicy
 from ..money import Money
+from ..money_array import MoneyArray
 
 
 class FlatTax:
@@ -26,4 +29,45 @@ class FlatTax:
             earnings - The earnings to tax.
         Return value: (earnings's taxable income) * (the flat tax rate).
         """
-        return earnings.taxable_income(self.policy).grow_and_round(self.rate)
+        return self.calculate_on_taxable_income(
+            earnings.taxable_income(self.policy)
+        )
+
+    def calculate_many(self, earnings: Sequence[Earnings]) -> MoneyArray:
+        """
+        Calculates the amount of tax to be levied on each of earnings.
+
+        Arguments:
+            earnings - The earnings of each taxpayer.
+        Return value: The tax on each of earnings, in order, exactly as
+            calculate would calculate it.
+        """
+        return self.calculate_on_taxable(
+            Earnings.taxable_incomes(earnings, self.policy)
+        )
+
+    def calculate_on_taxable_income(self, taxable_income: Money) -> Money:
+        """
+        Calculates the amount of tax to be levied on a taxable income.
+
+        Arguments:
+            taxable_income - An income to which this tax's policy has already
+                been applied.
+        Return value: taxable_income * (the flat tax rate).
+        """
+        return taxable_income.grow_and_round(self.rate)
+
+    def calculate_on_taxable_cents(self, taxable_cents: int) -> int:
+        """Like calculate_on_taxable_income, but in cents rather than Money."""
+        return round(taxable_cents * self.rate)
+
+    def calculate_on_taxable(self, taxable_incomes: MoneyArray) -> MoneyArray:
+        """
+        Calculates the amount of tax to be levied on many taxable incomes.
+
+        Arguments:
+            taxable_incomes - Incomes to which this tax's policy has already
+                been applied.
+        Return value: Each income times the flat tax rate, in order.
+        """
+        return taxable_incomes.grow_and_round(self.rate)
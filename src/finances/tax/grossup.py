@@ -0,0 +1,143 @@
+"""Contains a solver for the gross income that yields a net income."""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from typing import Any, List
+
+import numpy as np
+import numpy.typing as npt
+
+from ..money import Money
+from ..money_array import MoneyArray
+from .piecewise import PiecewiseLinearTax
+
+# Net incomes smaller than this are exact as floats and leave room to search
+_MAX_KERNEL_CENTS = 2**52
+
+_Array = npt.NDArray[Any]
+
+
+class GrossUpSolver:
+    """
+    Finds the gross income that leaves a target net income after a tax.
+
+    Net income is gross income minus the tax on it. Within each segment of a
+    PiecewiseLinearTax, net income follows a line whose slope is one minus the
+    marginal rate, except that each leaf tax is rounded to the cent. The
+    solver intersects the target with that line and then checks the few cents
+    around the intersection that rounding can affect, so the answer is exact.
+
+    Example: GrossUpSolver(compile_piecewise(tax, template)).gross_up(net)
+    """
+
+    def __init__(self, tax: PiecewiseLinearTax):
+        """
+        Prepares to gross up net incomes under tax.
+
+        Arguments:
+            tax - The tax to solve for. Its marginal rate must be below 100% at
+                every gross income, so that net income increases with gross
+                income.
+        """
+        points = [start.all_cents() for start in tax.breakpoints()]
+        points.insert(0, points[0] - 1 if points else 0)
+        slopes = [1.0 - tax.marginal_rate(Money(point)) for point in points]
+        if min(slopes) <= 0.0:
+            raise ValueError("Cannot gross up a marginal rate of 100% or more")
+
+        self._tax = tax
+        self._points = points
+        self._nets = [point - tax.tax_cents(point) for point in points]
+        self._slopes = slopes
+        # Net income strays from each line by at most half a cent per leaf,
+        # and so does the net income at the point the line is drawn through
+        self._window = math.ceil(tax.leaf_count() / min(slopes)) + 1
+
+    def net_income_cents(self, gross_cents: int) -> int:
+        """Returns the net income, in cents, on gross_cents."""
+        return gross_cents - self._tax.tax_cents(gross_cents)
+
+    def _estimate(self, net_cents: int) -> int:
+        """Returns a gross income within the window of the answer."""
+        index = max(bisect_right(self._nets, net_cents) - 1, 0)
+        return self._points[index] + math.floor(
+            (net_cents - self._nets[index]) / self._slopes[index]
+        )
+
+    def gross_up_cents(self, net_cents: int) -> int:
+        """Like gross_up, but in cents rather than Money."""
+        low = self._estimate(net_cents) - self._window
+        while self.net_income_cents(low) >= net_cents:
+            low -= self._window
+        gross = low + 1
+        while self.net_income_cents(gross) < net_cents:
+            gross += 1
+        return gross
+
+    def gross_up(self, net_income: Money) -> Money:
+        """
+        Finds the gross income needed to take home a net income.
+
+        Arguments:
+            net_income - The target net income.
+        Return value: The smallest gross income whose net income is at least
+            net_income.
+        """
+        return Money(self.gross_up_cents(net_income.all_cents()))
+
+    def gross_up_many(self, net_incomes: MoneyArray) -> MoneyArray:
+        """
+        Finds the gross income needed to take home each of many net incomes.
+
+        Arguments:
+            net_incomes - The target net incomes.
+        Return value: The gross income for each target, exactly as gross_up
+            returns it.
+        """
+        targets = net_incomes.all_cents()
+        if targets.dtype != np.int64 or (
+            targets.size > 0 and np.abs(targets).max() >= _MAX_KERNEL_CENTS
+        ):
+            return MoneyArray(
+                [self.gross_up_cents(cents) for cents in targets.tolist()]
+            )
+
+        indices = np.maximum(
+            np.searchsorted(
+                np.array(self._nets, dtype=np.float64), targets, side="right"
+            )
+            - 1,
+            0,
+        )
+        estimates = np.array(self._points, dtype=np.int64)[indices] + np.floor(
+            (targets - np.array(self._nets, dtype=np.float64)[indices])
+            / np.array(self._slopes, dtype=np.float64)[indices]
+        ).astype(np.int64)
+        low = estimates - self._window
+
+        result = np.empty(len(targets), dtype=np.int64)
+        # Targets whose window starts too high are solved one at a time
+        starts_below = self._net_incomes(low) < targets
+        pending = np.flatnonzero(starts_below)
+        unresolved: List[int] = np.flatnonzero(~starts_below).tolist()
+        for offset in range(1, 2 * self._window + 2):
+            if len(pending) == 0:
+                break
+            gross = low[pending] + offset
+            found = self._net_incomes(gross) >= targets[pending]
+            result[pending[found]] = gross[found]
+            pending = pending[~found]
+        unresolved.extend(pending.tolist())
+        for index in unresolved:
+            result[index] = self.gross_up_cents(int(targets[index]))
+        return MoneyArray(result)
+
+    def _net_incomes(self, gross_cents: _Array) -> _Array:
+        """Returns the net income, in cents, on each of gross_cents."""
+        return np.asarray(
+            gross_cents
+            - self._tax.tax_many(MoneyArray(gross_cents)).all_cents(),
+            dtype=np.int64,
+        )
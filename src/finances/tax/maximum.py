@@ -2,23 +2,28 @@
 
 from __future__ import annotations
 
-from ..earnings import Earnings
+from typing import Sequence, Tuple
+
+from ..earnings import Earnings, EarningsBatch
 from ..money import Money
+from ..money_array import MoneyArray
 from .tax import IncomeTax
 
 
 class MaximumTax:
     """An income tax that is calculated as the highest of 1 or more taxes."""
 
-    def __init__(self, taxes: list[IncomeTax]):
+    def __init__(self, taxes: Sequence[IncomeTax]):
         """
         Creates a MaximumTax.
 
         Arguments:
-            taxes - The taxes to sum in order to levy this tax.
+            taxes - The taxes to take the maximum of in order to levy this
+                tax. They are stored as a tuple, so they cannot be changed
+                later.
         """
         assert len(taxes) > 0, "MaximumTax must be created with at least 1 tax"
-        self.taxes = taxes
+        self.taxes: Tuple[IncomeTax, ...] = tuple(taxes)
 
     def calculate(self, earnings: Earnings) -> Money:
         """
@@ -29,3 +34,19 @@ class MaximumTax:
         Return value: The maximum of all of self.taxes levied on earnings.
         """
         return max((tax.calculate(earnings) for tax in self.taxes))
+
+    def calculate_many(self, earnings: Sequence[Earnings]) -> MoneyArray:
+        """
+        Calculates the amount of tax to be levied on each of earnings.
+
+        Arguments:
+            earnings - The earnings of each taxpayer.
+        Return value: The maximum of all of self.taxes levied on each of
+            earnings.
+        """
+        batch = EarningsBatch.of(earnings)
+        taxes = [tax.calculate_many(batch) for tax in self.taxes]
+        result = taxes[0]
+        for tax in taxes[1:]:
+            result = result.maximum(tax)
+        return result
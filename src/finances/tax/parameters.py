@@ -0,0 +1,231 @@
+"""Contains lazily loaded tables of tax parameters stored in data files."""
+
+from __future__ import annotations
+
+import json
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Type,
+    TypeVar,
+)
+
+from ..money import Money
+
+# The version of the data file format that this module reads
+FORMAT_VERSION = 1
+
+# Set to a directory to cache parsed data files there. The cache is disabled if
+# this is unset or empty.
+CACHE_DIR_VARIABLE = "FINANCES_CACHE_DIR"
+
+RawSlice = Mapping[str, object]
+
+_T = TypeVar("_T")
+
+
+def cache_dir() -> Optional[Path]:
+    """
+    Returns the directory for cached data files, or None if the cache is
+    disabled (by default).
+    """
+    configured = os.environ.get(CACHE_DIR_VARIABLE)
+    return Path(configured) if configured else None
+
+
+class ParameterFile:
+    """
+    A versioned JSON file of one jurisdiction's tax parameters, by year.
+
+    Nothing is read until a year is first requested. If a cache directory is
+    configured (see cache_dir), each year's slice is stored in a
+    marshal-encoded cache file after the JSON is parsed, keyed by the data
+    file's size and modification time and the Python version, so later
+    processes skip parsing JSON and only decode the slices they use.
+
+    Example: ParameterFile(Path("parameters.json"), "federal").slice(2022)
+    """
+
+    def __init__(self, path: Path, jurisdiction: str):
+        """
+        Creates a ParameterFile.
+
+        Arguments:
+            path - The path of the JSON data file.
+            jurisdiction - The name of the jurisdiction the file describes.
+        """
+        self.path = path
+        self.jurisdiction = jurisdiction
+        self._encoded: Optional[Dict[int, bytes]] = None
+        self._slices: Dict[int, RawSlice] = {}
+
+    def _cache_path(self) -> Optional[Path]:
+        directory = cache_dir()
+        if directory is None:
+            return None
+        stat = self.path.stat()
+        # The marshal format depends on the Python version
+        python = "".join(str(part) for part in sys.version_info[:2])
+        return directory / (
+            f"{self.jurisdiction}-v{FORMAT_VERSION}-py{python}-{stat.st_size}"
+            f"-{stat.st_mtime_ns}.marshal"
+        )
+
+    def _load(self) -> Dict[int, bytes]:
+        """Returns each year's encoded slice, reading the cache if possible."""
+        if self._encoded is not None:
+            return self._encoded
+
+        cache_path = self._cache_path()
+        if cache_path is not None:
+            try:
+                with open(cache_path, "rb") as cache_file:
+                    cached: object = marshal.load(  # type: ignore[misc]
+                        cache_file
+                    )
+                if isinstance(cached, dict):
+                    self._encoded = cached
+                    return cached
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+        with open(self.path, encoding="utf-8") as data_file:
+            data: object = json.load(data_file)  # type: ignore[misc]
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.path} does not contain an object")
+        version = get_field(data, "version", int)
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"{self.path} has version {version}, but version "
+                f"{FORMAT_VERSION} is required"
+            )
+        years = get_field(data, "years", dict)
+        encoded = {
+            int(year): marshal.dumps(get_field(years, year, dict))
+            for year in years
+        }
+        if cache_path is not None:
+            _write_atomically(cache_path, marshal.dumps(encoded))
+        self._encoded = encoded
+        return encoded
+
+    def years(self) -> List[int]:
+        """Returns the years that the file has parameters for, in order."""
+        return sorted(self._load())
+
+    def slice(self, year: int) -> RawSlice:
+        """
+        Returns the parameters for one year.
+
+        Arguments:
+            year - The year to look up.
+        Return value: The year's parameters, as decoded from the file. Raises
+            KeyError if the file has no parameters for year.
+        """
+        raw = self._slices.get(year)
+        if raw is None:
+            decoded: object = marshal.loads(  # type: ignore[misc]
+                self._load()[year]
+            )
+            if not isinstance(decoded, dict):
+                raise ValueError(f"Invalid {self.jurisdiction} data for {year}")
+            raw = decoded
+            self._slices[year] = raw
+        return raw
+
+
+class YearTable(Mapping[int, _T], Generic[_T]):
+    """
+    A read-only mapping from year to parameters built from a ParameterFile.
+
+    Each year's value is built the first time that year is looked up, and then
+    reused. Membership tests only consult the file's list of years.
+    """
+
+    def __init__(
+        self, parameters: ParameterFile, build: Callable[[RawSlice], _T]
+    ):
+        """
+        Creates a YearTable.
+
+        Arguments:
+            parameters - The file to read parameters from.
+            build - Creates a year's value from its raw parameters.
+        """
+        self._parameters = parameters
+        self._build = build
+        self._built: Dict[int, _T] = {}
+
+    def __getitem__(self, year: int) -> _T:
+        """Returns the value for year, building it if needed."""
+        value = self._built.get(year)
+        if value is None:
+            value = self._build(self._parameters.slice(year))
+            self._built[year] = value
+        return value
+
+    def __contains__(self, year: object) -> bool:
+        """Returns whether there are parameters for year."""
+        return year in self._parameters.years()
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterates over the years with parameters, in order."""
+        return iter(self._parameters.years())
+
+    def __len__(self) -> int:
+        """Returns the number of years with parameters."""
+        return len(self._parameters.years())
+
+    def built_years(self) -> List[int]:
+        """Returns the years whose values have been built so far."""
+        return sorted(self._built)
+
+
+def get_field(raw: Mapping[str, object], key: str, kind: Type[_T]) -> _T:
+    """
+    Looks up a field of raw parameters and checks its type.
+
+    Arguments:
+        raw - The raw parameters.
+        key - The field to look up.
+        kind - The type the field must have.
+    Return value: The field's value. Raises ValueError if it is missing or has
+        a different type.
+    """
+    value = raw.get(key)
+    if not isinstance(value, kind):
+        raise ValueError(f"Expected {kind.__name__} for {key!r}, got {value!r}")
+    return value
+
+
+def get_rate(raw: Mapping[str, object], key: str) -> float:
+    """Looks up a rate (an int or float) in raw parameters."""
+    value = raw.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Expected a rate for {key!r}, got {value!r}")
+    return float(value)
+
+
+def get_money(raw: Mapping[str, object], key: str) -> Money:
+    """Looks up an amount of money, written like "$X.XX", in raw parameters."""
+    return Money.parse(get_field(raw, key, str))
+
+
+def _write_atomically(path: Path, contents: bytes) -> None:
+    """Writes a cache file, ignoring failures, without exposing partial files."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(contents)
+        os.replace(temporary, path)
+    except OSError:
+        pass
@@ -0,0 +1,564 @@
+"""Contains taxes compiled into exact piecewise-linear functions of income."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from ..money import Money
+from ..money_array import MoneyArray
+from .program import Instruction, Operation, run_program
+
+# Incomes, shifts, and constants smaller than this are exact as floats, so the
+# vectorized evaluation matches the scalar evaluation exactly
+_MAX_EXACT_CENTS = 2**53
+
+# Taxes smaller than this can be added without overflowing an int64
+_MAX_KERNEL_CENTS = 2**59
+
+# The most points that PiecewiseLinearTax.sweep calculates at once
+DEFAULT_SWEEP_CHUNK_SIZE = 2**16
+
+_Array = npt.NDArray[Any]
+
+# (value, slope) of the linear functions that a program combines
+_Line = Tuple[float, float]
+_Lines = Tuple[_Array, _Array]
+
+
+@dataclass(frozen=True)
+class SweepChunk:
+    """The tax and rates at consecutive gross incomes of a sweep."""
+
+    gross_incomes: MoneyArray
+    taxes: MoneyArray
+    marginal_rates: npt.NDArray[np.float64]
+    effective_rates: npt.NDArray[np.float64]
+
+
+@dataclass(frozen=True)
+class LinearPiece:
+    """
+    A leaf tax over one segment of gross income.
+
+    The tax, in cents, on gross income x (in cents) is exactly
+    const + round((x - shift) * rate), which matches the leaf tax's own
+    per-bracket rounding.
+    """
+
+    const: int
+    shift: int
+    rate: float
+
+    def tax_at(self, gross_cents: int) -> int:
+        """Returns the tax, in cents, on gross_cents."""
+        return self.const + round((gross_cents - self.shift) * self.rate)
+
+    def line_at(self, gross_cents: int) -> _Line:
+        """Returns the unrounded tax and slope at gross_cents."""
+        return (self.const + (gross_cents - self.shift) * self.rate, self.rate)
+
+
+@dataclass(frozen=True)
+class LeafSchedule:
+    """
+    A BracketTax or FlatTax leaf, expressed in terms of gross income.
+
+    Taxable income is gross income plus offset, clamped to [floor, ceiling].
+    The tax on taxable income is flat_rate times it if flat_rate is not None.
+    Otherwise, brackets holds the (threshold, rate, base tax) of each bracket,
+    as returned by BracketTax.cumulative_brackets.
+    """
+
+    offset: int
+    floor: Optional[int]
+    ceiling: Optional[int]
+    brackets: Tuple[Tuple[int, float, int], ...] = ()
+    flat_rate: Optional[float] = None
+
+    def starts(self) -> List[int]:
+        """Returns each gross income at which this leaf's piece may change."""
+        starts = [
+            threshold - self.offset + 1 for threshold, _, _ in self.brackets
+        ]
+        for bound in (self.floor, self.ceiling):
+            if bound is not None:
+                starts.append(bound - self.offset + 1)
+        return starts
+
+    def tax_on_taxable(self, taxable_cents: int) -> int:
+        """Returns the tax, in cents, on a taxable income in cents."""
+        if self.flat_rate is not None:
+            return round(taxable_cents * self.flat_rate)
+        index = bisect_left(self.brackets, (taxable_cents,)) - 1
+        if index < 0:
+            return 0
+        threshold, rate, base = self.brackets[index]
+        return base + round((taxable_cents - threshold) * rate)
+
+    def piece_at(self, gross_cents: int) -> LinearPiece:
+        """Returns the piece of this leaf that applies at gross_cents."""
+        taxable = gross_cents + self.offset
+        if self.floor is not None and taxable <= self.floor:
+            return LinearPiece(self.tax_on_taxable(self.floor), 0, 0.0)
+        if self.ceiling is not None and taxable > self.ceiling:
+            return LinearPiece(self.tax_on_taxable(self.ceiling), 0, 0.0)
+        if self.flat_rate is not None:
+            return LinearPiece(0, -self.offset, self.flat_rate)
+        index = bisect_left(self.brackets, (taxable,)) - 1
+        if index < 0:
+            return LinearPiece(0, 0, 0.0)
+        threshold, rate, base = self.brackets[index]
+        return LinearPiece(base, threshold - self.offset, rate)
+
+
+class PiecewiseLinearTax:
+    """
+    A tax stack compiled into a table of segments of gross income.
+
+    Within each segment, every leaf tax is a single LinearPiece, so the tax at
+    any income takes one binary search plus one evaluation of each leaf.
+    Results are identical to calculating the original taxes on earnings made
+    from the template with that gross income.
+
+    The marginal rate at an income is the slope of the unrounded tax there.
+    Segments also start where a maximum switches between its operands, which
+    is found exactly unless maximums are nested within maximums.
+
+    Create one with compile_piecewise.
+    """
+
+    def __init__(
+        self, leaves: Sequence[LeafSchedule], program: Sequence[Instruction]
+    ):
+        """
+        Builds the segment table.
+
+        Arguments:
+            leaves - Each leaf tax, in terms of gross income.
+            program - The program that combines the leaves' taxes.
+        """
+        self._program = list(program)
+        self._is_sum = all(
+            operation is not Operation.MAX for operation, _ in self._program
+        )
+
+        starts = sorted({start for leaf in leaves for start in leaf.starts()})
+        pieces = [
+            tuple(
+                leaf.piece_at(_representative(starts, index)) for leaf in leaves
+            )
+            for index in range(len(starts) + 1)
+        ]
+        # Merge adjacent segments that turned out to be identical
+        self._starts: List[int] = []
+        self._pieces: List[Tuple[LinearPiece, ...]] = [pieces[0]]
+        for start, segment in zip(starts, pieces[1:]):
+            if segment != self._pieces[-1]:
+                self._starts.append(start)
+                self._pieces.append(segment)
+        if not self._is_sum:
+            self._starts, self._pieces = self._split_at_crossings(
+                self._starts, self._pieces
+            )
+
+        # The vectorized methods use (consts, shifts, rates) tables indexed by
+        # segment and leaf when every constant and shift is small enough
+        self._kernel: Optional[Tuple[_Array, _Array, _Array]] = None
+        if all(
+            abs(piece.const) < _MAX_EXACT_CENTS
+            and abs(piece.shift) < _MAX_EXACT_CENTS
+            for segment in self._pieces
+            for piece in segment
+        ):
+            shape = (len(self._pieces), len(leaves))
+            self._kernel = (
+                np.array(
+                    [[piece.const for piece in each] for each in self._pieces],
+                    dtype=np.int64,
+                ).reshape(shape),
+                np.array(
+                    [[piece.shift for piece in each] for each in self._pieces],
+                    dtype=np.int64,
+                ).reshape(shape),
+                np.array(
+                    [[piece.rate for piece in each] for each in self._pieces],
+                    dtype=np.float64,
+                ).reshape(shape),
+            )
+
+    def _choices(
+        self, pieces: Tuple[LinearPiece, ...], gross_cents: int
+    ) -> List[int]:
+        """Returns the operand each maximum chooses at gross_cents."""
+        choices: List[int] = []
+
+        def maximum(operands: List[_Line]) -> _Line:
+            choice = max(range(len(operands)), key=operands.__getitem__)
+            choices.append(choice)
+            return operands[choice]
+
+        run_program(
+            self._program,
+            [piece.line_at(gross_cents) for piece in pieces],
+            _add_lines,
+            maximum,
+        )
+        return choices
+
+    def _split_at_crossings(
+        self, starts: List[int], pieces: List[Tuple[LinearPiece, ...]]
+    ) -> Tuple[List[int], List[Tuple[LinearPiece, ...]]]:
+        """Splits segments wherever a maximum switches operands."""
+        new_starts: List[int] = []
+        new_pieces: List[Tuple[LinearPiece, ...]] = []
+        bounds = [-_MAX_EXACT_CENTS] + starts + [_MAX_EXACT_CENTS + 1]
+        for index, segment in enumerate(pieces):
+            low, high = bounds[index], bounds[index + 1] - 1
+            if index > 0:
+                new_starts.append(low)
+            new_pieces.append(segment)
+            while low < high:
+                initial = self._choices(segment, low)
+                if self._choices(segment, high) == initial:
+                    break
+                # Find the first income at which the choices differ
+                first, last = low + 1, high
+                while first < last:
+                    middle = (first + last) // 2
+                    if self._choices(segment, middle) == initial:
+                        first = middle + 1
+                    else:
+                        last = middle
+                new_starts.append(first)
+                new_pieces.append(segment)
+                low = first
+        return (new_starts, new_pieces)
+
+    def _segment(self, gross_cents: int) -> int:
+        """Returns the index of the segment containing gross_cents."""
+        return bisect_right(self._starts, gross_cents)
+
+    def tax_cents(self, gross_cents: int) -> int:
+        """Like tax, but in cents rather than Money."""
+        values = [
+            piece.tax_at(gross_cents)
+            for piece in self._pieces[self._segment(gross_cents)]
+        ]
+        if self._is_sum:
+            return sum(values)
+        return run_program(self._program, values, _sum_of_ints, _max_of_ints)
+
+    def tax(self, gross_income: Money) -> Money:
+        """
+        Calculates the tax on a gross income.
+
+        Arguments:
+            gross_income - The gross income.
+        Return value: The tax on the template earnings with this gross income.
+        """
+        return Money(self.tax_cents(gross_income.all_cents()))
+
+    def marginal_rate(self, gross_income: Money) -> float:
+        """
+        Calculates the marginal tax rate at a gross income.
+
+        Arguments:
+            gross_income - The gross income.
+        Return value: The tax on each additional dollar of gross income,
+            before rounding to the cent.
+        """
+        cents = gross_income.all_cents()
+        lines = [
+            piece.line_at(cents) for piece in self._pieces[self._segment(cents)]
+        ]
+        return run_program(self._program, lines, _add_lines, _max_of_lines)[1]
+
+    def effective_rate(self, gross_income: Money) -> float:
+        """
+        Calculates the effective tax rate at a gross income.
+
+        Arguments:
+            gross_income - The gross income.
+        Return value: The tax divided by gross income, or 0 if gross income is
+            not positive.
+        """
+        cents = gross_income.all_cents()
+        if cents <= 0:
+            return 0.0
+        return self.tax_cents(cents) / cents
+
+    def breakpoints(self) -> List[Money]:
+        """
+        Returns each gross income at which a new segment starts.
+
+        The marginal rate only changes at these incomes.
+        """
+        return [Money(start) for start in self._starts]
+
+    def next_breakpoint(self, gross_income: Money) -> Optional[Money]:
+        """
+        Finds the next gross income above gross_income that starts a segment.
+
+        Arguments:
+            gross_income - The gross income.
+        Return value: The breakpoint, or None if there are no more segments.
+        """
+        index = self._segment(gross_income.all_cents())
+        if index == len(self._starts):
+            return None
+        return Money(self._starts[index])
+
+    def segment_count(self) -> int:
+        """Returns the number of segments in the table."""
+        return len(self._pieces)
+
+    def leaf_count(self) -> int:
+        """Returns the number of leaf taxes, each rounded separately."""
+        return len(self._pieces[0])
+
+    def tax_many(self, gross_incomes: MoneyArray) -> MoneyArray:
+        """
+        Calculates the tax on each of many gross incomes.
+
+        Arguments:
+            gross_incomes - The gross incomes.
+        Return value: The tax on each gross income, exactly as tax calculates.
+        """
+        gross = gross_incomes.all_cents()
+        taxes = None
+        if self._kernel is not None and _is_small(gross, _MAX_EXACT_CENTS):
+            taxes = self._taxes_in_segments(
+                gross, np.searchsorted(self._starts, gross, side="right")
+            )
+        if taxes is None:
+            return MoneyArray(
+                [self.tax_cents(cents) for cents in gross.tolist()]
+            )
+        return MoneyArray(taxes)
+
+    def _taxes_in_segments(
+        self, gross: _Array, segments: _Array
+    ) -> Optional[_Array]:
+        """
+        Calculates the tax, in cents, on int64 gross incomes in cents, given
+        the index of each one's segment.
+
+        Return value: The taxes, or None if they might overflow an int64.
+        """
+        assert self._kernel is not None
+        consts, shifts, rates = self._kernel
+        values = []
+        for leaf in range(consts.shape[1]):
+            rounded = np.rint(
+                (gross - shifts[segments, leaf]).astype(np.float64)
+                * rates[segments, leaf]
+            )
+            if not _is_small(rounded, _MAX_KERNEL_CENTS):
+                return None
+            values.append(consts[segments, leaf] + rounded.astype(np.int64))
+
+        def add(operands: List[_Array]) -> _Array:
+            total = np.zeros(gross.shape, dtype=np.int64)
+            for operand in operands:
+                total = total + operand
+            return total
+
+        def maximum(operands: List[_Array]) -> _Array:
+            result = operands[0]
+            for operand in operands[1:]:
+                result = np.maximum(result, operand)
+            return result
+
+        return np.asarray(
+            run_program(self._program, values, add, maximum), dtype=np.int64
+        )
+
+    def marginal_rate_many(
+        self, gross_incomes: MoneyArray
+    ) -> npt.NDArray[np.float64]:
+        """Calculates the marginal rate at each of many gross incomes."""
+        gross = gross_incomes.all_cents()
+        if self._kernel is None or not _is_small(gross, _MAX_EXACT_CENTS):
+            return np.array(
+                [self.marginal_rate(Money(cents)) for cents in gross.tolist()],
+                dtype=np.float64,
+            )
+        return self._rates_in_segments(
+            gross, np.searchsorted(self._starts, gross, side="right")
+        )
+
+    def _rates_in_segments(
+        self, gross: _Array, segments: _Array
+    ) -> npt.NDArray[np.float64]:
+        """
+        Calculates the marginal rate at int64 gross incomes in cents, given
+        the index of each one's segment.
+        """
+        assert self._kernel is not None
+        consts, shifts, rates = self._kernel
+        lines: List[_Lines] = []
+        for leaf in range(consts.shape[1]):
+            slope = rates[segments, leaf]
+            lines.append(
+                (
+                    consts[segments, leaf]
+                    + (gross - shifts[segments, leaf]).astype(np.float64)
+                    * slope,
+                    slope,
+                )
+            )
+
+        def add(operands: List[_Lines]) -> _Lines:
+            values = np.zeros(gross.shape, dtype=np.float64)
+            slopes = np.zeros(gross.shape, dtype=np.float64)
+            for value, slope in operands:
+                values = values + value
+                slopes = slopes + slope
+            return (values, slopes)
+
+        def maximum(operands: List[_Lines]) -> _Lines:
+            values, slopes = operands[0]
+            for value, slope in operands[1:]:
+                better = (value > values) | (
+                    (value == values) & (slope > slopes)
+                )
+                values = np.where(better, value, values)
+                slopes = np.where(better, slope, slopes)
+            return (values, slopes)
+
+        return np.asarray(
+            run_program(self._program, lines, add, maximum)[1],
+            dtype=np.float64,
+        )
+
+    def effective_rate_many(
+        self, gross_incomes: MoneyArray
+    ) -> npt.NDArray[np.float64]:
+        """Calculates the effective rate at each of many gross incomes."""
+        return _effective_rates(
+            gross_incomes.all_cents(), self.tax_many(gross_incomes).all_cents()
+        )
+
+    def sweep(
+        self,
+        start: Money,
+        stop: Money,
+        step: Money,
+        chunk_size: int = DEFAULT_SWEEP_CHUNK_SIZE,
+    ) -> Iterator[SweepChunk]:
+        """
+        Calculates the tax and rates at every point of a grid of incomes.
+
+        The grid is walked in order, one segment at a time, so each chunk
+        costs time proportional to its points plus the segments it spans,
+        rather than a search of the segment table per point.
+
+        Arguments:
+            start - The first gross income.
+            stop - The end of the grid, which is not included, like range.
+            step - The distance between gross incomes. It must be positive.
+            chunk_size - The most points in each chunk.
+        Return value: An iterator over consecutive chunks of the grid, so that
+            fine grids need not fit in memory at once.
+        """
+        first, end, distance = (
+            start.all_cents(),
+            stop.all_cents(),
+            step.all_cents(),
+        )
+        if distance <= 0:
+            raise ValueError("Step must be positive")
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+        count = max(-((first - end) // distance), 0)
+        for offset in range(0, count, chunk_size):
+            yield self._sweep_chunk(
+                first + offset * distance,
+                distance,
+                min(chunk_size, count - offset),
+            )
+
+    def _sweep_chunk(self, first: int, step: int, count: int) -> SweepChunk:
+        """Calculates count points of a grid that starts at first."""
+        last = first + (count - 1) * step
+        if self._kernel is None or not (
+            _is_small(np.array([first, last]), _MAX_EXACT_CENTS)
+        ):
+            gross_incomes = MoneyArray(range(first, last + 1, step))
+            return SweepChunk(
+                gross_incomes,
+                self.tax_many(gross_incomes),
+                self.marginal_rate_many(gross_incomes),
+                self.effective_rate_many(gross_incomes),
+            )
+
+        gross = first + step * np.arange(count, dtype=np.int64)
+        # The index of the first point in each segment after the first
+        boundaries = np.clip(
+            -((first - np.array(self._starts, dtype=np.int64)) // step),
+            0,
+            count,
+        )
+        segments = np.repeat(
+            np.arange(len(self._starts) + 1),
+            np.diff(boundaries, prepend=0, append=count),
+        )
+        taxes = self._taxes_in_segments(gross, segments)
+        if taxes is None:
+            gross_incomes = MoneyArray(gross)
+            taxes = self.tax_many(gross_incomes).all_cents()
+        return SweepChunk(
+            MoneyArray(gross),
+            MoneyArray(taxes),
+            self._rates_in_segments(gross, segments),
+            _effective_rates(gross, taxes),
+        )
+
+
+def _effective_rates(gross: _Array, taxes: _Array) -> npt.NDArray[np.float64]:
+    """Divides taxes by gross incomes, or returns 0 where income is not positive."""
+    gross = gross.astype(np.float64)
+    positive = gross > 0
+    return np.where(
+        positive, taxes.astype(np.float64) / np.where(positive, gross, 1.0), 0.0
+    ).astype(np.float64)
+
+
+def _representative(starts: List[int], index: int) -> int:
+    """Returns an income in segment index, given the segment starts."""
+    if index > 0:
+        return starts[index - 1]
+    return starts[0] - 1 if starts else 0
+
+
+def _is_small(values: _Array, limit: int) -> bool:
+    """Returns whether every element of values is finite and below limit."""
+    if values.size == 0:
+        return True
+    if values.dtype.kind == "f" and not np.all(np.isfinite(values)):
+        return False
+    return bool(-limit < values.min() and values.max() < limit)
+
+
+def _add_lines(operands: List[_Line]) -> _Line:
+    return (
+        sum(value for value, _ in operands),
+        sum(slope for _, slope in operands),
+    )
+
+
+def _max_of_lines(operands: List[_Line]) -> _Line:
+    return max(operands)
+
+
+def _sum_of_ints(operands: List[int]) -> int:
+    return sum(operands)
+
+
+def _max_of_ints(operands: List[int]) -> int:
+    return max(operands)
@@ -0,0 +1,280 @@
+"""Contains an opt-in profiler for trees of income taxes."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from ..earnings import Earnings, EarningsTaxPolicy
+from ..money import Money
+from ..money_array import MoneyArray
+from .composite import CompositeTax
+from .maximum import MaximumTax
+from .tax import IncomeTax
+
+_Calculate = Callable[[Earnings], Money]
+_CalculateMany = Callable[[Sequence[Earnings]], MoneyArray]
+
+# The methods of each profiled tax that are replaced by wrappers
+_METHODS = ("calculate", "calculate_many")
+
+
+@dataclass
+class NodeProfile:  # pylint: disable=too-many-instance-attributes
+    """
+    What one tax in a tree did while it was profiled.
+
+    Times are in seconds. Self time excludes time spent in the profiled taxes
+    below this one. Lookups and recomputations count the taxable incomes of
+    this tax's own policy, one per call, so taxes without a policy have none:
+    a lookup is a recomputation if the income was not already in the earnings'
+    derived table, or if the earnings were a batch.
+    """
+
+    name: str
+    calls: int = 0
+    taxpayers: int = 0
+    total_seconds: float = 0.0
+    self_seconds: float = 0.0
+    lookups: int = 0
+    recomputations: int = 0
+    children: List[NodeProfile] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Returns this profile and its children as JSON-compatible dicts."""
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "taxpayers": self.taxpayers,
+            "total_seconds": self.total_seconds,
+            "self_seconds": self.self_seconds,
+            "lookups": self.lookups,
+            "recomputations": self.recomputations,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class TaxProfiler:
+    """
+    Records how much each tax in a tree is called and how long it takes.
+
+    While the profiler is active, calculate and calculate_many of each
+    CompositeTax, MaximumTax, and leaf tax in the tree are replaced by
+    recording wrappers, which also count taxable-income lookups by checking
+    the earnings' derived table before and after each call. Only calls made
+    through the tree (a CompiledTax of the tree bypasses it) in the thread
+    that entered the profiler are recorded. Profilers may be nested
+    or overlap, even on the same taxes; once the last one of a tax exits, its
+    wrappers are removed and its methods are exactly as before.
+
+    Example:
+        with TaxProfiler(tax) as profiler:
+            tax.calculate(earnings)
+        print(profiler.report())
+    """
+
+    def __init__(self, tax: IncomeTax):
+        """
+        Creates a profiler for a tax tree. Profiling starts on entry.
+
+        Arguments:
+            tax - The root of the tree to profile. A tax that appears more than
+                once in the tree shares one NodeProfile.
+        """
+        self.tax = tax
+        self._profiles: Dict[int, NodeProfile] = {}
+        self.root = self._build(tax)
+        # The profiles of the taxes being calculated, innermost last, and the
+        # time each has spent in profiled taxes below it
+        self._active: List[NodeProfile] = []
+        self._child_seconds: List[float] = []
+        self._thread = 0
+        self._wrapped: List[IncomeTax] = []
+
+    def _build(self, tax: IncomeTax) -> NodeProfile:
+        """Creates the profile of tax and the taxes below it."""
+        profile = self._profiles.get(id(tax))
+        if profile is None:
+            profile = NodeProfile(type(tax).__name__)
+            self._profiles[id(tax)] = profile
+            if isinstance(tax, (CompositeTax, MaximumTax)):
+                profile.children = [self._build(child) for child in tax.taxes]
+        return profile
+
+    def __enter__(self) -> TaxProfiler:
+        """Starts profiling by wrapping each tax in the tree."""
+        self._thread = threading.get_ident()
+        seen: Dict[int, IncomeTax] = {}
+        pending = [self.tax]
+        while pending:
+            tax = pending.pop()
+            if id(tax) in seen:
+                continue
+            seen[id(tax)] = tax
+            _add_recorder(tax, self, self._profiles[id(tax)])
+            self._wrapped.append(tax)
+            if isinstance(tax, (CompositeTax, MaximumTax)):
+                pending.extend(tax.taxes)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stops profiling and removes every wrapper."""
+        while self._wrapped:
+            _remove_recorder(self._wrapped.pop(), self)
+
+    def _enter_node(self, profile: NodeProfile, taxpayers: int) -> float:
+        """Records the start of a call to a profiled tax."""
+        profile.calls += 1
+        profile.taxpayers += taxpayers
+        self._active.append(profile)
+        self._child_seconds.append(0.0)
+        return time.perf_counter()
+
+    def _exit_node(
+        self, start: float, lookups: int, recomputations: int
+    ) -> None:
+        """Records the end of the innermost call to a profiled tax."""
+        elapsed = time.perf_counter() - start
+        profile = self._active.pop()
+        profile.total_seconds += elapsed
+        profile.lookups += lookups
+        profile.recomputations += recomputations
+        profile.self_seconds += elapsed - self._child_seconds.pop()
+        if self._child_seconds:
+            self._child_seconds[-1] += elapsed
+
+    def to_json(self) -> str:
+        """Returns the tree of profiles as a JSON object."""
+        return json.dumps(self.root.to_dict(), indent=2)
+
+    def report(self) -> str:
+        """Returns the tree of profiles as a table, indented by depth."""
+        lines = [
+            f"{'Tax':<32}{'Calls':>8}{'Taxpayers':>11}{'Total ms':>10}"
+            f"{'Self ms':>10}{'Lookups':>9}{'Recomputed':>12}"
+        ]
+
+        def add(profile: NodeProfile, depth: int) -> None:
+            name = "  " * depth + profile.name
+            lines.append(
+                f"{name:<32}{profile.calls:>8}{profile.taxpayers:>11}"
+                f"{profile.total_seconds * 1000:>10.3f}"
+                f"{profile.self_seconds * 1000:>10.3f}"
+                f"{profile.lookups:>9}{profile.recomputations:>12}"
+            )
+            for child in profile.children:
+                add(child, depth + 1)
+
+        add(self.root, 0)
+        return "\n".join(lines)
+
+
+class _Wrappers:
+    """The wrappers of one profiled tax, and the profilers recording it."""
+
+    def __init__(self, tax: IncomeTax):
+        """Replaces the methods of tax with wrappers."""
+        # pylint: disable=protected-access
+        self.tax = tax
+        # The profilers recording tax, and the profiles they record it in.
+        # Each change replaces the tuple, so wrappers read it without a lock.
+        self.recorders: Tuple[Tuple[TaxProfiler, NodeProfile], ...] = ()
+        attributes: Dict[str, object] = vars(tax)
+        # The entries of the methods that were in the tax's __dict__
+        self.saved = {
+            name: attributes[name] for name in _METHODS if name in attributes
+        }
+        # The derived-table slot of the tax's own taxable income, if it has a
+        # policy
+        policy = attributes.get("policy")
+        slot = (
+            policy.derived_slot
+            if isinstance(policy, EarningsTaxPolicy)
+            else None
+        )
+        lookups = int(slot is not None)
+        calculate: _Calculate = tax.calculate
+        calculate_many: _CalculateMany = tax.calculate_many
+
+        def recording(
+            taxpayers: int,
+        ) -> List[Tuple[TaxProfiler, float]]:
+            thread = threading.get_ident()
+            return [
+                (profiler, profiler._enter_node(profile, taxpayers))
+                for profiler, profile in self.recorders
+                if profiler._thread == thread
+            ]
+
+        def profiled_calculate(earnings: Earnings) -> Money:
+            starts = recording(1)
+            before = None if slot is None else earnings._derived[slot]
+            try:
+                return calculate(earnings)
+            finally:
+                recomputed = (
+                    slot is not None
+                    and before is None
+                    and earnings._derived[slot] is not None
+                )
+                for profiler, start in reversed(starts):
+                    profiler._exit_node(start, lookups, int(recomputed))
+
+        def profiled_calculate_many(earnings: Sequence[Earnings]) -> MoneyArray:
+            starts = recording(len(earnings))
+            try:
+                return calculate_many(earnings)
+            finally:
+                for profiler, start in reversed(starts):
+                    profiler._exit_node(start, lookups, lookups)
+
+        setattr(tax, "calculate", profiled_calculate)
+        setattr(tax, "calculate_many", profiled_calculate_many)
+
+    def restore(self) -> None:
+        """Puts back the methods that the wrappers replaced."""
+        for name in _METHODS:
+            if name in self.saved:
+                setattr(self.tax, name, self.saved[name])
+            else:
+                delattr(self.tax, name)
+
+
+# The wrappers of each profiled tax, by the tax's id
+_WRAPPERS: Dict[int, _Wrappers] = {}
+_WRAPPERS_LOCK = threading.Lock()
+
+
+def _add_recorder(
+    tax: IncomeTax, profiler: TaxProfiler, profile: NodeProfile
+) -> None:
+    """Records calls to tax in profile, wrapping it if it is not already."""
+    with _WRAPPERS_LOCK:
+        wrappers = _WRAPPERS.get(id(tax))
+        if wrappers is None:
+            wrappers = _Wrappers(tax)
+            _WRAPPERS[id(tax)] = wrappers
+        wrappers.recorders += ((profiler, profile),)
+
+
+def _remove_recorder(tax: IncomeTax, profiler: TaxProfiler) -> None:
+    """Stops recording tax, unwrapping it if no profiler records it."""
+    with _WRAPPERS_LOCK:
+        wrappers = _WRAPPERS[id(tax)]
+        wrappers.recorders = tuple(
+            recorder
+            for recorder in wrappers.recorders
+            if recorder[0] is not profiler
+        )
+        if not wrappers.recorders:
+            wrappers.restore()
+            del _WRAPPERS[id(tax)]
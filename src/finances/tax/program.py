@@ -0,0 +1,51 @@
+"""Contains postfix programs that combine the results of leaf taxes."""
+
+from __future__ import annotations
+
+from enum import auto, Enum
+from typing import Callable, List, Sequence, Tuple, TypeVar
+
+_ValueT = TypeVar("_ValueT")
+
+
+class Operation(Enum):
+    """An instruction in a tax program."""
+
+    LEAF = auto()
+    SUM = auto()
+    MAX = auto()
+
+
+# (operation, argument), where argument is a leaf index for LEAF and an operand
+# count for SUM and MAX
+Instruction = Tuple[Operation, int]
+
+
+def run_program(
+    program: Sequence[Instruction],
+    leaf_values: Sequence[_ValueT],
+    add: Callable[[List[_ValueT]], _ValueT],
+    maximum: Callable[[List[_ValueT]], _ValueT],
+) -> _ValueT:
+    """
+    Runs a tax program.
+
+    Arguments:
+        program - The instructions to run, in postfix order.
+        leaf_values - The value of each leaf tax.
+        add - Adds a list of values. The list may be empty.
+        maximum - Finds the maximum of a non-empty list of values.
+    Return value: The value that the program calculates.
+    """
+    stack: List[_ValueT] = []
+    for operation, argument in program:
+        if operation is Operation.LEAF:
+            stack.append(leaf_values[argument])
+            continue
+        operands = stack[len(stack) - argument :]
+        del stack[len(stack) - argument :]
+        if operation is Operation.SUM:
+            stack.append(add(operands))
+        else:
+            stack.append(maximum(operands))
+    return stack[0]
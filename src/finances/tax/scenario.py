@@ -0,0 +1,256 @@
+"""Contains incrementally recalculated what-if tax scenarios."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from ..earnings import Earnings, EarningsType, TaxCategory
+from ..money import Money
+from .bracket import BracketTax
+from .composite import CompositeTax
+from .flat import FlatTax
+from .maximum import MaximumTax
+from .tax import IncomeTax
+
+# An input of earnings: a component (e.g. "deductions") and its category, or
+# ("gross_income", None) for gross income
+ScenarioInput = Tuple[str, Optional[TaxCategory]]
+
+GROSS_INCOME: ScenarioInput = ("gross_income", None)
+
+# The components, besides gross income, that each earnings type is derived
+# from
+_COMPONENTS_BY_TYPE = {
+    EarningsType.GROSS_INCOME: (),
+    EarningsType.AGI: ("adjustments",),
+    EarningsType.MAGI: ("adjustments", "magi_additions"),
+    EarningsType.AGI_WITH_DEDUCTIONS: ("adjustments", "deductions"),
+}
+
+
+@dataclass
+class _Node:
+    """
+    A tax in a scenario's tree, with its tax on the current earnings.
+
+    Sums and maximums have children. Leaves do not, and are recalculated when
+    one of their inputs changes.
+    """
+
+    tax: IncomeTax
+    parent: Optional[_Node]
+    is_max: bool = False
+    children: List[_Node] = field(default_factory=list)
+    cents: int = 0
+    baseline_cents: int = 0
+
+
+class Scenario:
+    """
+    A what-if tax calculation that is updated one input at a time.
+
+    The tax tree is walked once to record which leaf taxes depend on which
+    inputs (gross income, and each category's adjustments, deductions, and
+    MAGI additions). When inputs change, only the leaves that depend on them
+    are recalculated, and the change in each leaf's tax is carried up to the
+    sums and maximums above it. Taxes other than CompositeTax, MaximumTax,
+    BracketTax, and FlatTax are assumed to depend on every input.
+
+    Results are identical to calling calculate on the tree with the current
+    earnings.
+
+    Example:
+        scenario = Scenario(tax, earnings)
+        scenario.update(deductions={TaxCategory.FEDERAL: Money.of(20000)})
+        scenario.delta()
+    """
+
+    def __init__(self, tax: IncomeTax, earnings: Earnings):
+        """
+        Creates a Scenario and calculates its baseline.
+
+        Arguments:
+            tax - The tax tree to calculate. It must not be modified while the
+                Scenario is in use.
+            earnings - The baseline earnings.
+        """
+        self.baseline_earnings = earnings
+        self.earnings = earnings
+        self._dependents: Dict[ScenarioInput, List[_Node]] = {}
+        # Leaves that depend on every input
+        self._opaque: List[_Node] = []
+        self._nodes: List[_Node] = []
+        self._root = self._add(tax, None)
+        for node in reversed(self._nodes):
+            if node.children:
+                self._combine(node)
+            else:
+                node.cents = self._calculate_leaf(node)
+            node.baseline_cents = node.cents
+
+    def _add(self, tax: IncomeTax, parent: Optional[_Node]) -> _Node:
+        """Adds tax and the taxes below it to the tree, parents first."""
+        node = _Node(tax, parent, is_max=isinstance(tax, MaximumTax))
+        self._nodes.append(node)
+        if isinstance(tax, (CompositeTax, MaximumTax)) and tax.taxes:
+            for child in tax.taxes:
+                node.children.append(self._add(child, node))
+        elif isinstance(tax, (BracketTax, FlatTax)):
+            category = tax.policy.category
+            for key in [GROSS_INCOME] + [
+                (component, category)
+                for component in _COMPONENTS_BY_TYPE[tax.policy.earnings_type]
+            ]:
+                self._dependents.setdefault(key, []).append(node)
+        elif not isinstance(tax, CompositeTax):
+            self._opaque.append(node)
+        return node
+
+    def _calculate_leaf(self, node: _Node) -> int:
+        """Calculates a leaf's tax on the current earnings, in cents."""
+        tax = node.tax
+        if isinstance(tax, (BracketTax, FlatTax)):
+            return tax.calculate_on_taxable_cents(
+                self.earnings.taxable_income(tax.policy).all_cents()
+            )
+        return tax.calculate(self.earnings).all_cents()
+
+    @staticmethod
+    def _combine(node: _Node) -> None:
+        """Recalculates a sum or maximum from its children."""
+        if node.is_max:
+            node.cents = max(child.cents for child in node.children)
+        else:
+            node.cents = sum(child.cents for child in node.children)
+
+    def update(
+        self,
+        gross_income: Optional[Money] = None,
+        adjustments: Optional[Mapping[TaxCategory, Money]] = None,
+        deductions: Optional[Mapping[TaxCategory, Money]] = None,
+        magi_additions: Optional[Mapping[TaxCategory, Money]] = None,
+    ) -> Money:
+        """
+        Changes some inputs and recalculates the taxes that depend on them.
+
+        Arguments:
+            gross_income - The new gross income, or None to keep it.
+            adjustments - New adjustments by category. Other categories keep
+                their adjustments.
+            deductions - New deductions, like adjustments.
+            magi_additions - New MAGI additions, like adjustments.
+        Return value: The total tax on the updated earnings.
+        """
+        current = self.earnings
+        changed: List[ScenarioInput] = []
+        if gross_income is not None and gross_income != current.gross_income:
+            changed.append(GROSS_INCOME)
+        amounts: List[Dict[TaxCategory, Money]] = []
+        for component, old, updates in (
+            ("adjustments", current.adjustments, adjustments),
+            ("deductions", current.deductions, deductions),
+            ("magi_additions", current.magi_additions, magi_additions),
+        ):
+            new = old
+            for category, amount in (updates or {}).items():
+                if old.get(category) != amount:
+                    if new is old:
+                        new = dict(old)
+                    new[category] = amount
+                    changed.append((component, category))
+            amounts.append(new)
+        if not changed:
+            return self.total()
+
+        self.earnings = Earnings(
+            gross_income if gross_income is not None else current.gross_income,
+            amounts[0],
+            amounts[1],
+            amounts[2],
+        )
+        self._recalculate(changed)
+        return self.total()
+
+    def _recalculate(self, changed: List[ScenarioInput]) -> None:
+        """Recalculates the leaves that depend on changed, and their parents."""
+        # Every leaf with a policy depends on gross income
+        leaves: List[_Node] = self._dependents.get(GROSS_INCOME, [])
+        if GROSS_INCOME not in changed:
+            seen: Set[int] = set()
+            leaves = []
+            for key in changed:
+                for node in self._dependents.get(key, ()):
+                    if id(node) not in seen:
+                        seen.add(id(node))
+                        leaves.append(node)
+        for node in leaves + self._opaque:
+            cents = self._calculate_leaf(node)
+            difference = cents - node.cents
+            node.cents = cents
+            parent = node.parent
+            while difference != 0 and parent is not None:
+                if parent.is_max:
+                    old = parent.cents
+                    self._combine(parent)
+                    difference = parent.cents - old
+                else:
+                    parent.cents += difference
+                parent = parent.parent
+
+    def total(self) -> Money:
+        """Returns the total tax on the current earnings."""
+        return Money(self._root.cents)
+
+    def baseline(self) -> Money:
+        """Returns the total tax on the baseline earnings."""
+        return Money(self._root.baseline_cents)
+
+    def delta(self) -> Money:
+        """Returns the current total tax minus the baseline total tax."""
+        return Money(self._root.cents - self._root.baseline_cents)
+
+    def deltas(self) -> List[Tuple[IncomeTax, Money]]:
+        """
+        Returns each tax in the tree whose amount differs from the baseline.
+
+        Return value: A (tax, current tax minus baseline tax) pair for each
+            changed tax, starting at the root and listing parents before their
+            children.
+        """
+        return [
+            (node.tax, Money(node.cents - node.baseline_cents))
+            for node in self._nodes
+            if node.cents != node.baseline_cents
+        ]
+
+    def dependents(
+        self, component: str, category: Optional[TaxCategory] = None
+    ) -> List[IncomeTax]:
+        """
+        Returns the leaf taxes that are recalculated when an input changes.
+
+        Arguments:
+            component - "gross_income", "adjustments", "deductions", or
+                "magi_additions".
+            category - The input's category, or None for gross income.
+        Return value: The leaf taxes, in tree order, including those that
+            depend on every input.
+        """
+        return [
+            node.tax
+            for node in self._dependents.get((component, category), [])
+            + self._opaque
+        ]
+
+    def commit(self) -> None:
+        """Makes the current earnings and taxes the new baseline."""
+        self.baseline_earnings = self.earnings
+        for node in self._nodes:
+            node.baseline_cents = node.cents
+
+    def reset(self) -> None:
+        """Restores the baseline earnings and taxes."""
+        self.earnings = self.baseline_earnings
+        for node in self._nodes:
+            node.cents = node.baseline_cents
@@ -2,8 +2,15 @@
 
 from __future__ import annotations
 
-MICHIGAN_INCOME_TAX_RATE_BY_YEAR: dict[int, float] = {
-    2021: 0.0425,
-    2022: 0.0425,
-    2023: 0.0405,
-}
+from pathlib import Path
+from typing import Mapping
+
+from ...parameters import get_rate, ParameterFile, YearTable
+
+MICHIGAN_PARAMETERS = ParameterFile(
+    Path(__file__).with_name("parameters.json"), "mi"
+)
+
+MICHIGAN_INCOME_TAX_RATE_BY_YEAR: Mapping[int, float] = YearTable(
+    MICHIGAN_PARAMETERS, lambda raw: get_rate(raw, "income_tax_rate")
+)
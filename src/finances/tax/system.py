@@ -0,0 +1,177 @@
+"""Contains a registry of shared, prebuilt tax objects."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from .compiled import compile_tax, CompiledTax
+from .composite import CompositeTax
+from .federal import FederalIncomeTax, FICATax, FilingStatus
+from .state.mi import MichiganIncomeTax
+from .tax import IncomeTax
+
+# Builds a state's income tax for a year, keyed by the state's postal code
+STATE_INCOME_TAXES: Dict[str, Callable[[int], IncomeTax]] = {
+    "MI": MichiganIncomeTax,
+}
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """A snapshot of a TaxSystem's cache usage."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: Optional[int]
+
+    def hit_rate(self) -> float:
+        """Returns the fraction of lookups that were hits, or 0 if none."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class TaxSystem:
+    """
+    A registry that builds each tax once and then shares it.
+
+    Taxes are keyed by (year, filing status, state) and built on first use.
+    When more than max_size objects are cached, the least recently used one is
+    evicted. Lookups are thread-safe. Returned taxes are shared between
+    callers. Stacks hold their taxes in tuples, so a shared stack cannot be
+    rearranged, but the tax objects' attributes are not protected, so callers
+    must not modify them.
+
+    Example: TaxSystem().compiled_stack(2022, FilingStatus.SINGLE, "MI")
+    """
+
+    def __init__(self, max_size: Optional[int] = 1024):
+        """
+        Creates an empty TaxSystem.
+
+        Arguments:
+            max_size - The maximum number of objects to cache, or None for no
+                limit.
+        """
+        assert max_size is None or max_size > 0, "max_size must be positive"
+        self.max_size = max_size
+        self._cache: OrderedDict[Hashable, object] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Building a stack looks up its taxes, so the lock is reentrant
+        self._lock = threading.RLock()
+
+    def _get(self, key: Tuple[Hashable, ...], build: Callable[[], _T]) -> _T:
+        """Returns the cached object for key, building it on a miss."""
+        with self._lock:
+            try:
+                cached = self._cache[key]
+            except KeyError:
+                self._misses += 1
+                built = build()
+                self._cache[key] = built
+                if (
+                    self.max_size is not None
+                    and len(self._cache) > self.max_size
+                ):
+                    self._cache.popitem(last=False)
+                    self._evictions += 1
+                return built
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return cached  # type: ignore[return-value]
+
+    def federal_income_tax(
+        self, year: int, filing_status: FilingStatus
+    ) -> FederalIncomeTax:
+        """Returns the shared FederalIncomeTax for a year and filing status."""
+        return self._get(
+            ("federal", year, filing_status),
+            lambda: FederalIncomeTax(year, filing_status),
+        )
+
+    def fica_tax(self, year: int, filing_status: FilingStatus) -> FICATax:
+        """Returns the shared FICATax for a year and filing status."""
+        return self._get(
+            ("fica", year, filing_status),
+            lambda: FICATax(year, filing_status),
+        )
+
+    def state_income_tax(self, year: int, state: str) -> IncomeTax:
+        """
+        Returns the shared income tax of a state for a year.
+
+        Arguments:
+            year - The tax year.
+            state - The state's postal code, e.g. "MI". It must be a key of
+                STATE_INCOME_TAXES.
+        Return value: The state's income tax.
+        """
+        if state not in STATE_INCOME_TAXES:
+            raise ValueError(f"No income tax data for state {state}")
+        return self._get(
+            ("state", year, state), lambda: STATE_INCOME_TAXES[state](year)
+        )
+
+    def income_taxes(
+        self, year: int, filing_status: FilingStatus, state: Optional[str]
+    ) -> CompositeTax:
+        """
+        Returns the shared stack of federal, state, and FICA taxes.
+
+        Arguments:
+            year - The tax year.
+            filing_status - The federal filing status.
+            state - The state's postal code, or None for no state income tax.
+        Return value: A CompositeTax of each tax that applies.
+        """
+
+        def build() -> CompositeTax:
+            taxes: list[IncomeTax] = [
+                self.federal_income_tax(year, filing_status)
+            ]
+            if state is not None:
+                taxes.append(self.state_income_tax(year, state))
+            taxes.append(self.fica_tax(year, filing_status))
+            return CompositeTax(taxes)
+
+        return self._get(("stack", year, filing_status, state), build)
+
+    def compiled_stack(
+        self, year: int, filing_status: FilingStatus, state: Optional[str]
+    ) -> CompiledTax:
+        """Returns the shared compiled form of income_taxes."""
+        return self._get(
+            ("compiled", year, filing_status, state),
+            lambda: compile_tax(self.income_taxes(year, filing_status, state)),
+        )
+
+    def stats(self) -> CacheStats:
+        """Returns the cache's hit, miss, and eviction counts so far."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._cache),
+                max_size=self.max_size,
+            )
+
+    def clear(self) -> None:
+        """Removes every cached object and resets the counts."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+
+# A registry shared by everything in this process that does not need its own
+DEFAULT_TAX_SYSTEM = TaxSystem()
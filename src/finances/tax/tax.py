@@ -1,9 +1,10 @@
 """Contains general tax utilities."""
 
-from typing import Protocol
+from typing import Protocol, Sequence
 
 from ..earnings import Earnings
 from ..money import Money
+from ..money_array import MoneyArray
 
 
 class IncomeTax(Protocol):
@@ -11,3 +12,11 @@ class IncomeTax(Protocol):
 
     def calculate(self, earnings: Earnings) -> Money:
         """Calculates the amount of tax to be levied on earnings."""
+
+    def calculate_many(self, earnings: Sequence[Earnings]) -> MoneyArray:
+        """
+        Calculates the amount of tax to be levied on each of earnings.
+
+        earnings may be a list of Earnings or an EarningsBatch, whose columns
+        are used directly.
+        """
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import ClassVar, Generic, TypeVar, Union
+from typing import Callable, cast, ClassVar, Generic, Tuple, TypeVar, Union
 
 from .protocols import Comparable
 
@@ -34,6 +34,8 @@ class Range(Generic[_RangeT]):
     If start or end is None, that bound does not apply.
     """
 
+    __slots__ = ("start", "end")
+
     NEGATIVE_INFINITY: ClassVar[_NegInfT] = _NEGATIVE_INFINITY
     POSITIVE_INFINITY: ClassVar[_PosInfT] = _POSITIVE_INFINITY
 
@@ -88,7 +90,8 @@ class Range(Generic[_RangeT]):
         else:
             end = max(self.end, other.end)
 
-        return Range[_RangeT](start, end)
+        # min and max of valid bounds keep start <= end
+        return Range._make(start, end)
 
     def intersection(self, other: Range[_RangeT]) -> Range[_RangeT]:
         """Returns the intersection of this range and other."""
@@ -113,7 +116,26 @@ class Range(Generic[_RangeT]):
         ):
             end = start
 
-        return Range[_RangeT](start, end)
+        return Range._make(start, end)
+
+    @staticmethod
+    def _make(
+        start: Union[_RangeT, _NegInfT], end: Union[_RangeT, _PosInfT]
+    ) -> Range[_RangeT]:
+        """Creates a Range without checking that end >= start."""
+        result: Range[_RangeT] = _new_range(Range)
+        _set_start(result, start)
+        _set_end(result, end)
+        return result
+
+    def __reduce__(
+        self,
+    ) -> Tuple[
+        Callable[..., Range[_RangeT]],
+        Tuple[Union[_RangeT, _NegInfT], Union[_RangeT, _PosInfT]],
+    ]:
+        """Pickles this Range by its bounds (frozen slots cannot be restored)."""
+        return (Range, (self.start, self.end))
 
     @staticmethod
     def _less(
@@ -136,3 +158,14 @@ class Range(Generic[_RangeT]):
         val2: Union[_RangeT, _NegInfT, _PosInfT],
     ) -> bool:
         return not Range._less(val1=val2, val2=val1)
+
+
+_new_range = object.__new__
+_set_start = cast(
+    Callable[[object, object], None],
+    Range.__dict__["start"].__set__,  # type: ignore[misc]
+)
+_set_end = cast(
+    Callable[[object, object], None],
+    Range.__dict__["end"].__set__,  # type: ignore[misc]
+)
@@ -0,0 +1,137 @@
+"""Classes for representing arrays of time-independent financial values."""
+
+from __future__ import annotations
+
+from typing import Iterator, Union, overload
+
+import numpy as np
+import numpy.typing as npt
+
+from .money_array import (
+    _Cents,
+    _freeze,
+    _round_floats_to_cents,
+    _to_buffer,
+    CentsLike,
+    MoneyArray,
+    RatioLike,
+)
+from .value import _of_cents, Value
+
+
+class ValueArray:
+    """
+    Represents an array of financial values, independent of time.
+
+    Values are stored like MoneyArray amounts, as a packed buffer of int64 USD
+    2000 cents unless some element does not fit in 64 bits. All conversions
+    match the corresponding Value operations exactly, applied element-wise.
+
+    Example: ValueArray.of_inflated_money(MoneyArray([100, 200]), 0.5)
+    """
+
+    __slots__ = ("_buffer",)
+
+    _buffer: _Cents
+
+    def __init__(self, year_2000_usd_cents: CentsLike):
+        """
+        Creates a ValueArray holding the given numbers of USD 2000 cents.
+
+        An int64 NumPy array is used as-is without copying.
+        """
+        self._buffer = _freeze(_to_buffer(year_2000_usd_cents))
+
+    @staticmethod
+    def of_inflated_money(
+        money: MoneyArray, inflation_since_2000: RatioLike
+    ) -> ValueArray:
+        """
+        Creates Values based on amounts of money at points in time.
+
+        Arguments:
+            money - The amounts of money.
+            inflation_since_2000 - The increase in the cost of goods since
+                2000. This may be a single float or an array with one float
+                per amount. If costs have decreased, it should be negative.
+        Return value: A ValueArray with the Value of each amount.
+        """
+        cents = money.all_cents()
+        divisors = 1.0 + np.asarray(inflation_since_2000, dtype=np.float64)
+        if np.any(divisors == 0.0):
+            raise ZeroDivisionError("float division by zero")
+
+        if cents.dtype != np.int64:
+            return ValueArray(
+                np.array(
+                    [
+                        round(each_cents / float(divisor))
+                        for each_cents, divisor in zip(
+                            cents.tolist(),
+                            np.broadcast_to(divisors, cents.shape),
+                        )
+                    ],
+                    dtype=np.object_,
+                )
+            )
+
+        shrunk = np.rint(cents.astype(np.float64) / divisors)
+        return ValueArray(_round_floats_to_cents(shrunk))
+
+    def inflate(self, inflation_since_2000: RatioLike) -> MoneyArray:
+        """
+        Returns the amount of money contained in each Value after inflation.
+
+        Arguments:
+            inflation_since_2000 - The amount of inflation since the year 2000.
+                This may be a single float or an array with one float per
+                Value.
+        Return value: How much money each Value will be worth after inflation.
+        """
+        return MoneyArray(self._buffer).grow_and_round(
+            1.0 + np.asarray(inflation_since_2000, dtype=np.float64)
+        )
+
+    def all_cents(self) -> _Cents:
+        """Returns the read-only array of USD 2000 cents in each element."""
+        return self._buffer
+
+    def __len__(self) -> int:
+        """Returns the number of elements in this array."""
+        return len(self._buffer)
+
+    def __iter__(self) -> Iterator[Value]:
+        """Iterates over the elements of this array as Values."""
+        return (_of_cents(cents) for cents in self._buffer.tolist())
+
+    @overload
+    def __getitem__(self, key: int) -> Value:
+        """Returns the element at index key."""
+
+    @overload
+    def __getitem__(
+        self, key: Union[slice, npt.NDArray[np.integer], npt.NDArray[np.bool_]]
+    ) -> ValueArray:
+        """Returns the elements selected by key."""
+
+    def __getitem__(
+        self,
+        key: Union[int, slice, npt.NDArray[np.integer], npt.NDArray[np.bool_]],
+    ) -> Union[Value, ValueArray]:
+        if isinstance(key, (int, np.integer)):
+            return _of_cents(int(self._buffer[key]))
+        return ValueArray(self._buffer[key])
+
+    def __str__(self) -> str:
+        """Creates a string representation of this array."""
+        return f"[{', '.join(str(value) for value in self)}]"
+
+    def __repr__(self) -> str:
+        """Creates a representation of this array for debugging."""
+        return f"ValueArray({self._buffer.tolist()!r})"
+
+    def equals(self, other: ValueArray) -> bool:
+        """Returns whether this array has the same elements as other."""
+        return len(self) == len(other) and bool(
+            np.all(self._buffer == other.all_cents())
+        )
@@ -2,5 +2,15 @@
 
 from .account import Account
 from .distribution import ConstantDistribution, Distribution
+from .montecarlo import (
+    LognormalGrowth,
+    MonteCarloConfig,
+    MonteCarloResult,
+    MonteCarloSummary,
+    run_monte_carlo,
+    summarize_monte_carlo,
+)
 from .simulation import Simulation
+from .sketch import QuantileSketch
+from .store import BalanceStore, open_balances, store_monte_carlo
 from . import distribution, growth
@@ -1,11 +1,14 @@
 """A program for simulating personal finances."""
 
 from argparse import ArgumentParser
-from typing import cast
+from pathlib import Path
+from typing import cast, Optional
 
 from finances import Money
 
-from .simulation import BasicSimulation, Simulation
+from .checkpoint import Checkpointer, DEFAULT_CHECKPOINT_SECONDS
+from .montecarlo import LognormalGrowth
+from .simulation import BasicSimulation
 
 
 def main() -> None:
@@ -32,15 +35,107 @@ def main() -> None:
         required=True,
         help="The balance to start the simulation with, in USD",
     )
+    parser.add_argument(
+        "--iterations",
+        metavar="PATHS",
+        type=int,
+        default=10000,
+        help="The number of random paths to simulate",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="The seed of the random returns (the same seed gives the same "
+        "results)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="The number of worker processes (default: simulate in this "
+        "process). Results do not depend on the number of workers",
+    )
+    parser.add_argument(
+        "--sketch",
+        action="store_true",
+        help="Keep quantile sketches instead of every path, so that memory "
+        "does not grow with the number of iterations (percentiles of large "
+        "runs are then estimates)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="Periodically save the progress of a --sketch run to FILE",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        metavar="SECONDS",
+        type=float,
+        default=DEFAULT_CHECKPOINT_SECONDS,
+        help="The least time between checkpoints",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the --checkpoint file, with the same results as "
+        "an uninterrupted run",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="FILE",
+        help="Write every path's balance in every year to the .npy file FILE "
+        "(with metadata in FILE.json) instead of keeping the paths "
+        "in memory",
+    )
+    parser.add_argument(
+        "--growth-rate",
+        metavar="RATE",
+        type=float,
+        default=1.07,
+        help="The mean yearly growth factor, e.g. 1.07 for 7%% growth",
+    )
+    parser.add_argument(
+        "--volatility",
+        metavar="STDDEV",
+        type=float,
+        default=0.15,
+        help="The standard deviation of the yearly growth factor",
+    )
     args = parser.parse_args()
+    checkpoint = cast(Optional[str], args.checkpoint)
+    sketch, resume = cast(bool, args.sketch), cast(bool, args.resume)
+    if checkpoint is not None and not sketch:
+        parser.error("--checkpoint requires --sketch")
+    if resume and checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    store = cast(Optional[str], args.store)
+    if store is not None and sketch:
+        parser.error("--store cannot be combined with --sketch")
 
-    simulation: Simulation = BasicSimulation(
+    simulation = BasicSimulation(
         cast(int, args.start),
         cast(int, args.end),
         cast(Money, args.starting_balance),
+        LognormalGrowth(
+            cast(float, args.growth_rate), cast(float, args.volatility)
+        ),
     )
+    if store is not None:
+        simulation.store_path = Path(store)
+    if checkpoint is not None:
+        simulation.checkpointer = Checkpointer(
+            checkpoint,
+            cast(float, args.checkpoint_interval),
+            resume,
+        )
 
-    simulation.run(1)
+    simulation.run(
+        cast(int, args.iterations),
+        cast(int, args.seed),
+        cast(int, args.workers),
+        sketch,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Measures the speed of the vectorized Monte Carlo engine.
+
+Also adds this package's cases to the micro-benchmark suite.
+
+Usage:
+    python -m simulate.bench
+    python -m simulate.bench suite --compare baseline.json --tolerance 0.2
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from finances import Money
+from finances.bench import suite
+from finances.utilities import Range
+
+from .distribution import ConstantDistribution, Distribution
+from .montecarlo import MonteCarloConfig, run_monte_carlo, summarize_monte_carlo
+
+_PATHS = 1000000
+_YEARS = 40
+
+# The depth of the composed distribution in the distribution.deep case
+_DISTRIBUTION_DEPTH = 64
+
+
+def _deep_distribution() -> Callable[[], object]:
+    """Returns a call that evaluates a deep composition of distributions."""
+    distribution: Distribution[int, Money] = ConstantDistribution[int, Money](
+        Money.of(1)
+    )
+    for depth in range(_DISTRIBUTION_DEPTH):
+        if depth % 2 == 0:
+            distribution = distribution + ConstantDistribution[int, Money](
+                Money(depth)
+            )
+        else:
+            distribution = distribution[Range[int](-(10**6), 10**6)] * 1
+    window = Range[int](0, 10)
+
+    def evaluate() -> Tuple[Money, Money]:
+        return (distribution.value(5), distribution.average(window))
+
+    return evaluate
+
+
+def suite_cases() -> List[suite.Case]:
+    """Returns this package's cases in the micro-benchmark suite, in order."""
+    return [suite.Case("distribution.deep", _deep_distribution())]
+
+
+def main() -> None:
+    """
+    Prints the time to simulate 1M paths of 40 years, with percentiles.
+
+    "suite" runs the micro-benchmark suite instead, with this package's cases
+    and the suite's own arguments.
+    """
+    if sys.argv[1:2] == ["suite"]:
+        sys.exit(
+            suite.main(
+                sys.argv[2:], suite_cases(), "python -m simulate.bench suite"
+            )
+        )
+    config = MonteCarloConfig(2024, 2024 + _YEARS, Money.of(10000), _PATHS)
+    start = time.perf_counter()
+    result = run_monte_carlo(config)
+    simulated = time.perf_counter()
+    result.percentile_bands()
+    done = time.perf_counter()
+    print(f"{_PATHS:,} paths x {_YEARS} years")
+    print(f"{'Simulate':<20}{simulated - start:>10.2f} s")
+    print(f"{'Percentile bands':<20}{done - simulated:>10.2f} s")
+    print(f"{'Path-years/s':<20}{_PATHS * _YEARS / (done - start):>12,.0f}")
+
+    workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    parallel = run_monte_carlo(config, workers)
+    seconds = time.perf_counter() - start
+    assert parallel.balances.tobytes() == result.balances.tobytes()
+    print(f"{f'Simulate, {workers} workers':<20}{seconds:>10.2f} s")
+
+    start = time.perf_counter()
+    summary = summarize_monte_carlo(config)
+    seconds = time.perf_counter() - start
+    print(f"{'Simulate, sketched':<20}{seconds:>10.2f} s")
+    print(
+        f"{'Sketch size':<20}{summary.sketch.size():>10} values/year "
+        f"(rank error {summary.sketch.rank_error():.2%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Contains checkpoints of sketched Monte Carlo simulations."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import zipfile
+from pathlib import Path
+from typing import Tuple, Union
+
+import numpy as np
+
+from .errors import SimulationCheckpointError
+from .sketch import QuantileSketch
+
+DEFAULT_CHECKPOINT_SECONDS = 5.0
+
+# The version of the checkpoint format, which changes when it is incompatible
+_VERSION = 1
+
+
+class Checkpointer:
+    """
+    Periodically saves the progress of a sketched simulation to a file.
+
+    A checkpoint holds the sketch of the completed blocks, the index of the
+    next block, and a fingerprint of the simulation's configuration. Each
+    block's random stream is derived from the seed and the block's index, so
+    the next block's index is the position of every remaining stream, and a
+    resumed simulation gives exactly the same results as an uninterrupted
+    one. Checkpoints are written to a temporary file that replaces the last
+    checkpoint, so the file always holds a complete checkpoint.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        interval: float = DEFAULT_CHECKPOINT_SECONDS,
+        resume: bool = False,
+    ):
+        """
+        Creates a checkpointer.
+
+        Arguments:
+            path - The checkpoint file.
+            interval - The least number of seconds between checkpoints.
+            resume - Whether to continue from the checkpoint in path, which
+                must exist, rather than starting over.
+        """
+        self.path = Path(path)
+        self.interval = interval
+        self.resume = resume
+        self.fingerprint = ""
+        self._last_write = time.monotonic()
+
+    def restore(
+        self,
+        fingerprint: str,
+        sketch: QuantileSketch,
+        paths: int,
+        block_paths: int,
+    ) -> Tuple[QuantileSketch, int]:
+        """
+        Starts checkpointing a simulation.
+
+        Arguments:
+            fingerprint - The fingerprint of the simulation's configuration.
+            sketch - The simulation's empty sketch.
+            paths - The number of paths in the simulation.
+            block_paths - The number of paths in each block but the last.
+        Return value: (the sketch to continue, the index of the next block).
+            If resuming, these come from the checkpoint. Otherwise, they are
+            sketch and 0. Raises SimulationCheckpointError if the checkpoint
+            is missing, malformed, or of a different simulation, or if its
+            next block is not a block of this simulation (or the end) or does
+            not match the number of paths in its sketch.
+        """
+        self.fingerprint = fingerprint
+        self._last_write = time.monotonic()
+        if not self.resume:
+            return (sketch, 0)
+
+        try:
+            with np.load(self.path, allow_pickle=False) as arrays:
+                header: object = json.loads(str(arrays["checkpoint"]))
+                restored = QuantileSketch.from_arrays(arrays)
+        except (
+            OSError,
+            KeyError,
+            TypeError,
+            ValueError,
+            zipfile.BadZipFile,
+        ) as error:
+            raise SimulationCheckpointError(
+                f"Could not read checkpoint {self.path}: {error}"
+            ) from error
+        if not isinstance(header, dict):
+            raise SimulationCheckpointError(
+                f"Malformed checkpoint header in {self.path}"
+            )
+        next_block = header.get("next_block")
+        if (
+            header.get("version") != _VERSION
+            or not isinstance(next_block, int)
+            or isinstance(next_block, bool)
+        ):
+            raise SimulationCheckpointError(
+                f"Unsupported or malformed checkpoint {self.path}"
+            )
+        if header.get("fingerprint") != fingerprint or (
+            restored.rows,
+            restored.accuracy,
+            restored.exact_limit,
+        ) != (sketch.rows, sketch.accuracy, sketch.exact_limit):
+            raise SimulationCheckpointError(
+                f"Checkpoint {self.path} is of a different simulation"
+            )
+        blocks = -(-paths // block_paths)
+        if not (
+            0 <= next_block <= blocks
+            and restored.count == min(next_block * block_paths, paths)
+        ):
+            raise SimulationCheckpointError(
+                f"Checkpoint {self.path} has {restored.count} paths before "
+                f"block {next_block} of {blocks}"
+            )
+        return (restored, next_block)
+
+    def update(self, next_block: int, sketch: QuantileSketch) -> None:
+        """Writes a checkpoint if interval seconds have passed since the last."""
+        if time.monotonic() - self._last_write >= self.interval:
+            self.write(next_block, sketch)
+
+    def write(self, next_block: int, sketch: QuantileSketch) -> None:
+        """
+        Atomically replaces the checkpoint file.
+
+        Arguments:
+            next_block - The index of the first block that is not in sketch.
+            sketch - The sketch of every block before next_block.
+        """
+        header = {
+            "version": _VERSION,
+            "fingerprint": self.fingerprint,
+            "next_block": next_block,
+        }
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(temporary, "wb") as file:
+            np.savez(
+                file,
+                checkpoint=np.array(json.dumps(header)),
+                **sketch.to_arrays(),
+            )
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+        self._last_write = time.monotonic()
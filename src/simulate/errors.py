@@ -9,5 +9,9 @@ class SimulationParameterError(SimulationError):
     """An error because of invalid simulation parameters."""
 
 
+class SimulationCheckpointError(SimulationError):
+    """An error because a checkpoint is malformed or of another simulation."""
+
+
 class SimulationInternalError(SimulationError):
     """An unexpected error that occurred while running a simulation."""
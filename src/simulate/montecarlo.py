@@ -0,0 +1,403 @@
+"""Contains a vectorized Monte Carlo engine for account balances."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from finances import Money
+from finances.tax.parameters import get_field, get_rate
+
+from .checkpoint import Checkpointer
+from .errors import SimulationParameterError
+from .sketch import DEFAULT_ACCURACY, DEFAULT_EXACT_LIMIT, QuantileSketch
+
+_Array = npt.NDArray[Any]
+
+# Paths are simulated in blocks of this many, each with its own random stream,
+# so the random draws of a path depend only on the seed and the path's index,
+# not on how blocks are split between processes
+BLOCK_PATHS = 2**16
+
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+# Balances are tracked as float cents, which are exact integers up to this
+_MAX_EXACT_CENTS = 2**53
+
+
+@dataclass(frozen=True)
+class LognormalGrowth:
+    """
+    Random yearly growth factors with a lognormal distribution.
+
+    The factors have a mean of growth_rate (e.g. 1.07 for 7% growth) and a
+    standard deviation of volatility.
+    """
+
+    growth_rate: float = 1.07
+    volatility: float = 0.15
+
+    def __post_init__(self) -> None:
+        if self.growth_rate <= 0.0:
+            raise SimulationParameterError("growth_rate must be positive")
+        if self.volatility < 0.0:
+            raise SimulationParameterError("volatility must not be negative")
+
+    def log_parameters(self) -> Tuple[float, float]:
+        """Returns the (mean, standard deviation) of each log growth factor."""
+        variance = math.log1p((self.volatility / self.growth_rate) ** 2)
+        return (math.log(self.growth_rate) - variance / 2, math.sqrt(variance))
+
+
+@dataclass(frozen=True)
+class MonteCarloConfig:
+    """
+    The parameters of a Monte Carlo simulation of an invested balance.
+
+    Each year, every path's balance is multiplied by a random growth factor
+    and rounded to the cent.
+    """
+
+    start: int
+    end: int
+    starting_balance: Money
+    paths: int
+    growth: LognormalGrowth = LognormalGrowth()
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.start > self.end:
+            raise SimulationParameterError("end year must be after start")
+        if self.paths <= 0:
+            raise SimulationParameterError("number of paths must be positive")
+        if self.seed < 0:
+            raise SimulationParameterError("seed must not be negative")
+
+    def years(self) -> int:
+        """Returns the number of years of growth that are simulated."""
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, object]:
+        """Returns this configuration as a JSON-compatible dict."""
+        return {
+            "start": self.start,
+            "end": self.end,
+            "starting_balance_cents": self.starting_balance.all_cents(),
+            "paths": self.paths,
+            "growth_rate": self.growth.growth_rate,
+            "volatility": self.growth.volatility,
+            "seed": self.seed,
+            "block_paths": BLOCK_PATHS,
+        }
+
+    @staticmethod
+    def from_dict(fields: Mapping[str, object]) -> MonteCarloConfig:
+        """
+        Parses a configuration written by to_dict.
+
+        Raises ValueError if a field is missing or has the wrong type, or
+        SimulationParameterError if the configuration is invalid, or was
+        simulated with blocks of a different size.
+        """
+        if get_field(fields, "block_paths", int) != BLOCK_PATHS:
+            raise SimulationParameterError(
+                "The configuration was simulated with a different block size"
+            )
+        return MonteCarloConfig(
+            get_field(fields, "start", int),
+            get_field(fields, "end", int),
+            Money(get_field(fields, "starting_balance_cents", int)),
+            get_field(fields, "paths", int),
+            LognormalGrowth(
+                get_rate(fields, "growth_rate"), get_rate(fields, "volatility")
+            ),
+            get_field(fields, "seed", int),
+        )
+
+    def fingerprint(self) -> str:
+        """
+        Returns a hash of this configuration. Configurations with the same
+        fingerprint simulate the same paths.
+        """
+        return hashlib.sha256(
+            json.dumps(self.to_dict(), sort_keys=True).encode()
+        ).hexdigest()
+
+
+def block_generator(seed: int, block: int) -> np.random.Generator:
+    """
+    Returns the random stream of a block of paths.
+
+    Every block's stream is independent, and depends only on the seed and the
+    block's index.
+    """
+    return np.random.Generator(
+        np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(block,)))
+    )
+
+
+def block_count(config: MonteCarloConfig) -> int:
+    """Returns the number of blocks of paths of config."""
+    return -(-config.paths // BLOCK_PATHS)
+
+
+def simulate_block(config: MonteCarloConfig, block: int) -> _Array:
+    """
+    Simulates one block of paths.
+
+    Arguments:
+        config - The simulation's parameters.
+        block - The index of the block. It holds paths block * BLOCK_PATHS up
+            to the next block or config.paths.
+    Return value: An int64 array of balances in cents, with one row per year
+        from config.start to config.end (inclusive) and one column per path.
+    """
+    first = block * BLOCK_PATHS
+    count = min(BLOCK_PATHS, config.paths - first)
+    mean, deviation = config.growth.log_parameters()
+    factors = block_generator(config.seed, block).standard_normal(
+        (config.years(), count)
+    )
+    factors *= deviation
+    factors += mean
+    np.exp(factors, out=factors)
+
+    balances = np.empty((config.years() + 1, count), dtype=np.int64)
+    balance = np.full(count, float(config.starting_balance.all_cents()))
+    balances[0] = balance
+    for year in range(config.years()):
+        balance *= factors[year]
+        np.rint(balance, out=balance)
+        if np.abs(balance).max(initial=0.0) >= _MAX_EXACT_CENTS:
+            raise SimulationParameterError(
+                f"Balances grew too large to track exactly in year "
+                f"{config.start + year + 1}"
+            )
+        balances[year + 1] = balance
+    return balances
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """
+    The balances of every path of a Monte Carlo simulation.
+
+    balances is an int64 array of cents with one row per year, from the
+    configuration's start to its end (inclusive), and one column per path.
+    """
+
+    config: MonteCarloConfig
+    balances: _Array
+
+    def final_balances(self) -> _Array:
+        """Returns the final balance of each path, in cents."""
+        final: _Array = self.balances[-1]
+        return final
+
+    def percentile_bands(
+        self, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> _Array:
+        """
+        Calculates percentiles of the balance in each year.
+
+        Arguments:
+            percentiles - The percentiles to calculate, from 0 to 100.
+        Return value: An array of balances in cents with one row per year and
+            one column per percentile. Balances are rounded to the cent.
+        """
+        # Each year is loaded separately, so that memory-mapped balances (see
+        # simulate.store) are never loaded all at once
+        bands: _Array = np.rint(
+            [np.percentile(year, percentiles) for year in self.balances]
+        ).astype(np.int64)
+        return bands
+
+    def final_percentile(self, percentile: float) -> Money:
+        """Returns a percentile of the final balances, rounded to the cent."""
+        return Money(
+            int(np.rint(np.percentile(self.final_balances(), percentile)))
+        )
+
+
+def simulate_blocks(
+    config: MonteCarloConfig, workers: int = 0, first_block: int = 0
+) -> Iterator[Tuple[int, _Array]]:
+    """
+    Simulates every block of paths of config, yielding them in block order.
+
+    Arguments:
+        config - The simulation's parameters.
+        workers - The number of worker processes, or 0 to simulate in this
+            process. Each block is simulated from its own random stream, so
+            the blocks are identical whatever the number of workers.
+        first_block - The index of the first block to simulate, e.g. to
+            resume a simulation.
+    Return value: An iterator over (block index, balances of simulate_block).
+    """
+    if workers < 0:
+        raise SimulationParameterError("number of workers must not be negative")
+    blocks = range(first_block, block_count(config))
+    if workers == 0:
+        for block in blocks:
+            yield (block, simulate_block(config, block))
+        return
+
+    # At most two blocks per worker are in flight, so finished blocks do not
+    # pile up in memory
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Tuple[int, Future[_Array]]] = deque()
+        for block in blocks:
+            pending.append(
+                (block, executor.submit(simulate_block, config, block))
+            )
+            if len(pending) >= 2 * workers:
+                done, future = pending.popleft()
+                yield (done, future.result())
+        while pending:
+            done, future = pending.popleft()
+            yield (done, future.result())
+
+
+def run_monte_carlo(
+    config: MonteCarloConfig, workers: int = 0
+) -> MonteCarloResult:
+    """
+    Simulates every path of config.
+
+    Arguments:
+        config - The simulation's parameters.
+        workers - The number of worker processes, or 0 to simulate in this
+            process. The result is bit-identical for any number of workers.
+    Return value: The balance of every path in every year.
+    """
+    balances = np.empty((config.years() + 1, config.paths), dtype=np.int64)
+    for block, block_balances in simulate_blocks(config, workers):
+        first = block * BLOCK_PATHS
+        balances[:, first : first + BLOCK_PATHS] = block_balances
+    return MonteCarloResult(config, balances)
+
+
+@dataclass(frozen=True)
+class MonteCarloSummary:
+    """
+    Quantile sketches of the balances of a Monte Carlo simulation.
+
+    sketch has one row per year, from the configuration's start to its end
+    (inclusive). Unlike a MonteCarloResult, a summary does not keep every
+    path, so its memory does not depend on the number of paths.
+    """
+
+    config: MonteCarloConfig
+    sketch: QuantileSketch
+
+    def percentile_bands(
+        self, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> _Array:
+        """
+        Estimates percentiles of the balance in each year.
+
+        Arguments:
+            percentiles - The percentiles to estimate, from 0 to 100.
+        Return value: An array of balances in cents with one row per year and
+            one column per percentile, like MonteCarloResult.percentile_bands.
+            The estimates are exact if the sketch is exact, and otherwise
+            have the sketch's rank error.
+        """
+        bands: _Array = np.rint(self.sketch.percentiles(percentiles)).astype(
+            np.int64
+        )
+        return bands
+
+    def final_percentile(self, percentile: float) -> Money:
+        """Estimates a percentile of the final balances."""
+        return Money(int(self.percentile_bands((percentile,))[-1, 0]))
+
+    def final_percentile_bounds(self, percentile: float) -> Tuple[Money, Money]:
+        """
+        Returns bounds on a percentile of the final balances that hold with
+        99% confidence, given the sketch's rank error.
+        """
+        lower, upper = self.sketch.percentile_bounds((percentile,))
+        return (
+            Money(int(np.rint(lower[-1, 0]))),
+            Money(int(np.rint(upper[-1, 0]))),
+        )
+
+
+def summarize_monte_carlo(
+    config: MonteCarloConfig,
+    workers: int = 0,
+    accuracy: int = DEFAULT_ACCURACY,
+    exact_limit: int = DEFAULT_EXACT_LIMIT,
+    checkpointer: Optional[Checkpointer] = None,
+) -> MonteCarloSummary:
+    """
+    Simulates every path of config, keeping only quantile sketches.
+
+    Each block of paths is added to the sketches as it is simulated, in block
+    order, so at most a few blocks are in memory at once and the summary is
+    identical for any number of workers, or if the simulation is resumed from
+    a checkpoint.
+
+    Arguments:
+        config - The simulation's parameters.
+        workers - The number of worker processes, or 0 to simulate in this
+            process.
+        accuracy - The accuracy of the sketches (see QuantileSketch).
+        exact_limit - The number of paths up to which percentiles are exact.
+        checkpointer - Where to save checkpoints after blocks complete (and
+            to resume from), if anywhere. A final checkpoint is always saved.
+    Return value: Sketches of the balances in every year.
+    """
+    sketch = QuantileSketch(
+        config.years() + 1, accuracy, exact_limit, config.seed
+    )
+    first_block = 0
+    if checkpointer is not None:
+        sketch, first_block = checkpointer.restore(
+            config.fingerprint(), sketch, config.paths, BLOCK_PATHS
+        )
+    for block, block_balances in simulate_blocks(config, workers, first_block):
+        sketch.update(block_balances)
+        if checkpointer is not None:
+            checkpointer.update(block + 1, sketch)
+    if checkpointer is not None:
+        checkpointer.write(block_count(config), sketch)
+    return MonteCarloSummary(config, sketch)
+
+
+def format_summary(
+    result: Union[MonteCarloResult, MonteCarloSummary],
+    percentiles: Optional[Sequence[float]] = None,
+) -> str:
+    """Returns a table of a result's percentile bands, one row per year."""
+    percentiles = percentiles or DEFAULT_PERCENTILES
+    bands = result.percentile_bands(percentiles)
+    header = f"{'Year':<6}" + "".join(
+        f"{f'p{percentile:g}':>18}" for percentile in percentiles
+    )
+    lines = [header]
+    for row, year_bands in enumerate(bands):
+        lines.append(
+            f"{result.config.start + row:<6}"
+            + "".join(f"{str(Money(int(cents))):>18}" for cents in year_bands)
+        )
+    return "\n".join(lines)
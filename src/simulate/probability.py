@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from fractions import Fraction
-from typing import ClassVar
+from typing import Callable, cast, ClassVar, Tuple
 
 from .errors import SimulationInternalError
 
@@ -13,6 +13,8 @@ from .errors import SimulationInternalError
 class Probability:
     """Represents the probability of an event, where 0 is 0% and 1 is 100%."""
 
+    __slots__ = ("_value",)
+
     _value: Fraction
 
     ZERO: ClassVar[Probability]
@@ -34,7 +36,23 @@ class Probability:
 
     def __mul__(self, other: Probability) -> Probability:
         """Determines the probability of both of two independent events."""
-        return Probability(self._value * other._value)
+        # The product of two values in [0, 1] is always in [0, 1]
+        probability: Probability = _new_probability(Probability)
+        _set_value(probability, self._value * other._value)
+        return probability
+
+    def __reduce__(
+        self,
+    ) -> Tuple[Callable[[Fraction], Probability], Tuple[Fraction]]:
+        """Pickles this Probability (frozen slots cannot be restored)."""
+        return (Probability, (self._value,))
+
+
+_new_probability = object.__new__
+_set_value = cast(
+    Callable[[Probability, Fraction], None],
+    Probability.__dict__["_value"].__set__,  # type: ignore[misc]
+)
 
 
 Probability.ZERO = Probability(Fraction(0))
@@ -1,12 +1,23 @@
 """Contains a class for represention a financial simulation."""
 
-from typing import Protocol
+from pathlib import Path
+from typing import Optional, Protocol, Union
 
 from finances import Money
 
 from .account import Account
+from .checkpoint import Checkpointer
 from .errors import SimulationParameterError
-from .growth import grow
+from .store import store_monte_carlo
+from .montecarlo import (
+    format_summary,
+    LognormalGrowth,
+    MonteCarloConfig,
+    MonteCarloResult,
+    MonteCarloSummary,
+    run_monte_carlo,
+    summarize_monte_carlo,
+)
 
 
 class Simulation(Protocol):
@@ -27,7 +38,13 @@ class Simulation(Protocol):
 class BasicSimulation(Simulation):
     """Represents a basic financial simulation."""
 
-    def __init__(self, start: int, end: int, starting_balance: Money):
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        starting_balance: Money,
+        growth: LognormalGrowth = LognormalGrowth(),
+    ):
         """
         Creates a basic simulation.
 
@@ -35,19 +52,67 @@ class BasicSimulation(Simulation):
             start - The year in which the simulation should start, inclusive.
             end - The year in which the simulation should end, exclusive.
             starting_balance - The balance the simulation should start with.
+            growth - The distribution of the investments' yearly growth.
         """
         if start > end:
             raise SimulationParameterError("end year must be after start")
         self.start = start
         self.end = end
         self.investments = Account(starting_balance)
+        self.growth = growth
+        self.result: Optional[Union[MonteCarloResult, MonteCarloSummary]] = None
+        # Sketched runs save checkpoints with (and may resume from) this
+        self.checkpointer: Optional[Checkpointer] = None
+        # Runs that are not sketched write every path's balances to this .npy
+        # file, if it is set, instead of keeping them in memory
+        self.store_path: Optional[Path] = None
+
+    def run(
+        self,
+        iterations: int,
+        seed: int = 0,
+        workers: int = 0,
+        sketch: bool = False,
+    ) -> None:
+        """
+        Simulates iterations random paths of the investments' balance.
 
-    def run(self, iterations: int) -> None:
-        print(f"Balance starting at {self.investments.balance()}")
-
-        def grow_money(money: Money) -> Money:
-            return grow(money, growth_rate=1.10, time=self.end - self.start)
-
-        self.investments.apply(grow_money)
+        Each path grows the starting balance by a random factor every year.
+        The paths (or, with sketch, quantile sketches of them) are stored in
+        self.result, and percentile bands of the balance in each year are
+        printed. If self.store_path is set, the paths are stored on disk there
+        (see simulate.store) and self.result reads them from disk.
 
-        print(f"Balance ending at {self.investments.balance()}")
+        Arguments:
+            iterations - The number of paths to simulate.
+            seed - The seed of the random growth factors. The same seed gives
+                the same paths.
+            workers - The number of worker processes, or 0 to simulate in
+                this process. The paths do not depend on the number.
+            sketch - Whether to keep only quantile sketches of the paths, so
+                that memory does not grow with iterations. Percentiles of more
+                than 16,384 iterations are then estimates. If
+                self.checkpointer is set, it saves checkpoints of the run.
+        """
+        print(f"Balance starting at {self.investments.balance()}")
+        config = MonteCarloConfig(
+            self.start,
+            self.end,
+            self.investments.balance(),
+            iterations,
+            self.growth,
+            seed,
+        )
+        result: Union[MonteCarloResult, MonteCarloSummary]
+        if sketch:
+            result = summarize_monte_carlo(
+                config, workers, checkpointer=self.checkpointer
+            )
+        elif self.store_path is not None:
+            result = store_monte_carlo(
+                config, self.store_path, workers
+            ).result()
+        else:
+            result = run_monte_carlo(config, workers)
+        self.result = result
+        print(format_summary(result))
@@ -0,0 +1,289 @@
+"""Contains mergeable streaming quantile sketches."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .errors import SimulationParameterError
+
+_Array = npt.NDArray[Any]
+
+DEFAULT_ACCURACY = 200
+DEFAULT_EXACT_LIMIT = 2**14
+
+# Each compactor level may hold this fraction of the items of the level above
+_CAPACITY_RATIO = 2 / 3
+
+
+class QuantileSketch:
+    """
+    KLL sketches of the int64 values in each row of a stream of arrays.
+
+    Every row (e.g. every year of a simulation) has its own sketch, but all
+    rows receive the same number of values at the same time, so their
+    compactors are stored together as (rows, items) arrays.
+
+    While a sketch holds at most exact_limit values per row, it keeps all of
+    them and its percentiles are exact (they match numpy.percentile). After
+    that, memory is O(accuracy * log(count / accuracy)) per row, and each
+    percentile has a rank error of at most rank_error() * count with 99%
+    confidence: about 1.3% for the default accuracy of 200, shrinking almost
+    in proportion to 1 / accuracy. Sketches with the same parameters can be
+    merged, so a stream can be split into parts (e.g. blocks of paths) that
+    are sketched separately.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        accuracy: int = DEFAULT_ACCURACY,
+        exact_limit: int = DEFAULT_EXACT_LIMIT,
+        seed: int = 0,
+    ):
+        """
+        Creates an empty sketch.
+
+        Arguments:
+            rows - The number of rows of each update.
+            accuracy - The capacity of the largest compactor (k in KLL).
+            exact_limit - The number of values per row that are kept exactly.
+            seed - The seed of the random compactions. The same seed and
+                updates give the same sketch.
+        """
+        if rows <= 0:
+            raise SimulationParameterError("number of rows must be positive")
+        if accuracy < 8:
+            raise SimulationParameterError("accuracy must be at least 8")
+        self.rows = rows
+        self.accuracy = accuracy
+        self.exact_limit = exact_limit
+        self.count = 0
+        self._generator = np.random.default_rng(seed)
+        # Compactions may drop the extreme values, so each row's minimum and
+        # maximum are kept separately
+        self._extremes = np.array(
+            [[np.iinfo(np.int64).max] * rows, [np.iinfo(np.int64).min] * rows]
+        )
+        # _levels[h] holds the values of weight 2**h
+        self._levels: List[_Array] = [np.empty((rows, 0), dtype=np.int64)]
+
+    def is_exact(self) -> bool:
+        """Returns whether this sketch holds every value it was given."""
+        return self.count <= self.exact_limit
+
+    def rank_error(self) -> float:
+        """
+        Returns the normalized rank error of this sketch's percentiles.
+
+        With 99% confidence, the rank of each estimated percentile among all
+        the values differs from the requested rank by at most this fraction of
+        count. The bound is the empirical one for KLL sketches.
+        """
+        if self.is_exact():
+            return 0.0
+        error: float = 2.296 / self.accuracy**0.9723
+        return error
+
+    def _capacity(self, level: int) -> int:
+        """Returns the number of values that level may hold."""
+        depth = len(self._levels) - 1 - level
+        return max(2, int(self.accuracy * _CAPACITY_RATIO**depth))
+
+    def _compact(self, level: int) -> None:
+        """Moves half of the values of level to the level above it."""
+        if level + 1 == len(self._levels):
+            self._levels.append(np.empty((self.rows, 0), dtype=np.int64))
+        # Levels above 0 are runs of sorted values, which a stable sort merges
+        values = np.sort(
+            self._levels[level], axis=1, kind="stable" if level else None
+        )
+        # With an odd number of values, the smallest stays behind
+        odd = values.shape[1] % 2
+        offset = int(self._generator.integers(2))
+        self._levels[level] = values[:, :odd]
+        self._levels[level + 1] = np.concatenate(
+            (self._levels[level + 1], values[:, odd + offset :: 2]), axis=1
+        )
+
+    def _compress(self) -> None:
+        """
+        Compacts the lowest full level until the sketch is within its total
+        capacity. Compactions are lazy, so levels keep as many values as they
+        can, which makes the sketch more accurate.
+        """
+        if self.is_exact():
+            return
+        while self.size() >= sum(
+            self._capacity(level) for level in range(len(self._levels))
+        ):
+            self._compact(
+                next(
+                    level
+                    for level in range(len(self._levels))
+                    if self._levels[level].shape[1] >= self._capacity(level)
+                )
+            )
+
+    def _merge_extremes(self, minimum: _Array, maximum: _Array) -> None:
+        """Includes each row's minimum and maximum in this sketch's."""
+        np.minimum(self._extremes[0], minimum, out=self._extremes[0])
+        np.maximum(self._extremes[1], maximum, out=self._extremes[1])
+
+    def update(self, values: _Array) -> None:
+        """
+        Adds values to the sketch.
+
+        Arguments:
+            values - An integer array of shape (rows, count) with count new
+                values for each row.
+        """
+        if values.ndim != 2 or values.shape[0] != self.rows:
+            raise SimulationParameterError(
+                f"Expected values with {self.rows} rows"
+            )
+        if values.shape[1] == 0:
+            return
+        self._levels[0] = np.concatenate(
+            (self._levels[0], values.astype(np.int64)), axis=1
+        )
+        self._merge_extremes(values.min(axis=1), values.max(axis=1))
+        self.count += values.shape[1]
+        self._compress()
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Adds every value of other, which must have the same parameters."""
+        # pylint: disable=protected-access
+        if (other.rows, other.accuracy, other.exact_limit) != (
+            self.rows,
+            self.accuracy,
+            self.exact_limit,
+        ):
+            raise SimulationParameterError(
+                "Only sketches with the same parameters can be merged"
+            )
+        for level, values in enumerate(other._levels):
+            if level == len(self._levels):
+                self._levels.append(np.empty((self.rows, 0), dtype=np.int64))
+            self._levels[level] = np.concatenate(
+                (self._levels[level], values), axis=1
+            )
+        self._merge_extremes(other._extremes[0], other._extremes[1])
+        self.count += other.count
+        self._compress()
+
+    def size(self) -> int:
+        """Returns the number of values stored for each row."""
+        return sum(values.shape[1] for values in self._levels)
+
+    def to_arrays(self) -> Dict[str, _Array]:
+        """
+        Returns this sketch's state as arrays, e.g. for numpy.savez.
+
+        The state includes the random generator's position, so a sketch
+        restored by from_arrays continues exactly as this one would.
+        """
+        parameters = {
+            "rows": self.rows,
+            "accuracy": self.accuracy,
+            "exact_limit": self.exact_limit,
+            "count": self.count,
+            "generator": self._generator.bit_generator.state,
+        }
+        arrays = {
+            "sketch": np.array(json.dumps(parameters)),
+            "extremes": self._extremes,
+        }
+        for height, level in enumerate(self._levels):
+            arrays[f"level_{height}"] = level
+        return arrays
+
+    @staticmethod
+    def from_arrays(arrays: Mapping[str, _Array]) -> QuantileSketch:
+        """
+        Restores a sketch from the arrays of to_arrays.
+
+        Raises KeyError, TypeError, or ValueError if the arrays are
+        malformed.
+        """
+        # pylint: disable=protected-access
+        parameters = json.loads(str(arrays["sketch"]))
+        sketch = QuantileSketch(
+            int(parameters["rows"]),
+            int(parameters["accuracy"]),
+            int(parameters["exact_limit"]),
+        )
+        sketch.count = int(parameters["count"])
+        sketch._generator.bit_generator.state = parameters["generator"]
+        extremes = np.asarray(arrays["extremes"], dtype=np.int64)
+        if extremes.shape != sketch._extremes.shape:
+            raise ValueError("Malformed sketch extremes")
+        sketch._extremes = extremes
+        sketch._levels = []
+        while f"level_{len(sketch._levels)}" in arrays:
+            level = np.asarray(
+                arrays[f"level_{len(sketch._levels)}"], dtype=np.int64
+            )
+            if level.ndim != 2 or level.shape[0] != sketch.rows:
+                raise ValueError("Malformed sketch level")
+            sketch._levels.append(level)
+        if not sketch._levels:
+            raise ValueError("Missing sketch levels")
+        return sketch
+
+    def percentiles(self, percentiles: Sequence[float]) -> _Array:
+        """
+        Estimates percentiles of each row's values.
+
+        Arguments:
+            percentiles - The percentiles to estimate, from 0 to 100.
+        Return value: A float array with one row per row of this sketch and
+            one column per percentile. Exact sketches interpolate like
+            numpy.percentile; other sketches return stored values, or the
+            exact minimum and maximum for percentiles 0 and 100.
+        """
+        if self.count == 0:
+            raise SimulationParameterError("The sketch is empty")
+        if self.is_exact():
+            exact: _Array = np.percentile(
+                self._levels[0], percentiles, axis=1
+            ).T
+            return exact
+
+        values = np.concatenate(self._levels, axis=1)
+        weights = np.concatenate(
+            [
+                np.full(level.shape[1], 2**height, dtype=np.int64)
+                for height, level in enumerate(self._levels)
+            ]
+        )
+        order = np.argsort(values, axis=1)
+        ranks = np.cumsum(weights[order], axis=1)
+        targets = np.asarray(percentiles, dtype=np.float64) / 100 * self.count
+        # The estimate is the first value whose rank reaches the target
+        indices = (ranks[:, np.newaxis, :] < targets[:, np.newaxis]).sum(axis=2)
+        np.minimum(indices, values.shape[1] - 1, out=indices)
+        estimates: _Array = np.take_along_axis(
+            np.take_along_axis(values, order, axis=1), indices, axis=1
+        ).astype(np.float64)
+        estimates[:, targets <= 0] = self._extremes[0, :, np.newaxis]
+        estimates[:, targets >= self.count] = self._extremes[1, :, np.newaxis]
+        return estimates
+
+    def percentile_bounds(
+        self, percentiles: Sequence[float]
+    ) -> Tuple[_Array, _Array]:
+        """
+        Returns (lower, upper) bounds on the true percentiles of each row.
+
+        Each bound holds with 99% confidence. The bounds are the estimates of
+        the percentiles rank_error() below and above each percentile, so they
+        are equal to percentiles() for an exact sketch.
+        """
+        error = self.rank_error() * 100
+        lower = np.clip(np.asarray(percentiles) - error, 0.0, 100.0)
+        upper = np.clip(np.asarray(percentiles) + error, 0.0, 100.0)
+        return (self.percentiles(list(lower)), self.percentiles(list(upper)))
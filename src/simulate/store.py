@@ -0,0 +1,196 @@
+"""Contains a memory-mapped on-disk store of Monte Carlo balances."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from .errors import SimulationParameterError
+from .montecarlo import (
+    BLOCK_PATHS,
+    MonteCarloConfig,
+    MonteCarloResult,
+    simulate_blocks,
+)
+
+_Array = npt.NDArray[Any]
+
+# The version of the metadata format, which changes when it is incompatible
+_VERSION = 1
+
+# The accounts along the last axis of a store, in order
+ACCOUNTS = ("investments",)
+
+
+def metadata_path(path: Union[str, Path]) -> Path:
+    """
+    Returns the path of the JSON metadata of the store in path.
+
+    The metadata is path with ".json" appended (e.g. balances.npy.json), so it
+    is never the store itself, whatever the store's suffix.
+    """
+    path = Path(path)
+    return path.with_name(path.name + ".json")
+
+
+@dataclass(frozen=True)
+class BalanceStore:
+    """
+    The balances of every path of a Monte Carlo simulation, stored on disk.
+
+    balances is a memory-mapped int64 array of cents with shape (years,
+    paths, accounts): one row per year from the configuration's start to its
+    end (inclusive), one column per path, and one entry per account in
+    ACCOUNTS. Slicing it reads only the slice from disk. complete is whether
+    every path was written.
+    """
+
+    path: Path
+    config: MonteCarloConfig
+    balances: _Array
+    complete: bool
+
+    def year(self, year: int) -> _Array:
+        """
+        Returns a (paths, accounts) view of the balances in a year.
+
+        Raises SimulationParameterError if year is not from the
+        configuration's start to its end.
+        """
+        if not self.config.start <= year <= self.config.end:
+            raise SimulationParameterError(
+                f"{year} is not from {self.config.start} to {self.config.end}"
+            )
+        view: _Array = self.balances[year - self.config.start]
+        return view
+
+    def path_balances(self, path: int) -> _Array:
+        """
+        Returns a (years, accounts) view of the balances of one path.
+
+        Raises SimulationParameterError if path is not from 0 to the
+        configuration's number of paths, exclusive.
+        """
+        if not 0 <= path < self.config.paths:
+            raise SimulationParameterError(
+                f"Path {path} is not from 0 to {self.config.paths - 1}"
+            )
+        view: _Array = self.balances[:, path]
+        return view
+
+    def result(self) -> MonteCarloResult:
+        """Returns a result that reads the investments' balances from disk."""
+        return MonteCarloResult(self.config, self.balances[:, :, 0])
+
+
+def _write_metadata(
+    path: Path, config: MonteCarloConfig, complete: bool
+) -> None:
+    """Atomically writes the JSON metadata of the store in path."""
+    metadata = {
+        "version": _VERSION,
+        "units": "cents",
+        "dtype": "int64",
+        "axes": ["year", "path", "account"],
+        "years": list(range(config.start, config.end + 1)),
+        "accounts": list(ACCOUNTS),
+        "config": config.to_dict(),
+        "fingerprint": config.fingerprint(),
+        "complete": complete,
+    }
+    destination = metadata_path(path)
+    temporary = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")
+    temporary.write_text(
+        json.dumps(metadata, indent=2) + "\n", encoding="utf-8"
+    )
+    os.replace(temporary, destination)
+
+
+def store_monte_carlo(
+    config: MonteCarloConfig, path: Union[str, Path], workers: int = 0
+) -> BalanceStore:
+    """
+    Simulates every path of config straight into a memory-mapped .npy file.
+
+    Each block of paths is written to the file as it is simulated, so memory
+    does not depend on the number of paths. The file's JSON metadata (at
+    metadata_path(path)) describes the configuration, seed, and units, and
+    is marked complete once every block is written.
+
+    Arguments:
+        config - The simulation's parameters.
+        path - The .npy file to write. It is replaced if it exists.
+        workers - The number of worker processes, or 0 to simulate in this
+            process. The file is identical for any number of workers.
+    Return value: The store, opened for reading.
+    """
+    path = Path(path)
+    _write_metadata(path, config, False)
+    balances = np.lib.format.open_memmap(  # type: ignore[no-untyped-call]
+        path,
+        mode="w+",
+        dtype=np.int64,
+        shape=(config.years() + 1, config.paths, len(ACCOUNTS)),
+    )
+    for block, block_balances in simulate_blocks(config, workers):
+        first = block * BLOCK_PATHS
+        balances[:, first : first + BLOCK_PATHS, 0] = block_balances
+    balances.flush()
+    del balances
+    _write_metadata(path, config, True)
+    return open_balances(path)
+
+
+def open_balances(path: Union[str, Path]) -> BalanceStore:
+    """
+    Opens a store written by store_monte_carlo without loading it.
+
+    Raises SimulationParameterError if the store or its metadata is missing
+    or unreadable, or if the metadata does not describe the balances.
+    """
+    path = Path(path)
+    try:
+        metadata: object = json.loads(
+            metadata_path(path).read_text(encoding="utf-8")
+        )
+        if (
+            not isinstance(metadata, dict)
+            or metadata.get("version") != _VERSION
+        ):
+            raise ValueError("Unsupported metadata")
+        fields: Dict[str, object] = metadata
+        raw_config = fields.get("config")
+        if not isinstance(raw_config, dict):
+            raise ValueError("Missing configuration")
+        config = MonteCarloConfig.from_dict(raw_config)
+    except (OSError, ValueError) as error:
+        raise SimulationParameterError(
+            f"Could not read the metadata of {path}: {error}"
+        ) from error
+
+    try:
+        balances = np.load(path, mmap_mode="r")
+    except (OSError, ValueError) as error:
+        raise SimulationParameterError(
+            f"Could not read the balances in {path}: {error}"
+        ) from error
+    if (
+        not isinstance(balances, np.ndarray)
+        or balances.dtype != np.int64
+        or balances.shape
+        != (
+            config.years() + 1,
+            config.paths,
+            len(ACCOUNTS),
+        )
+    ):
+        raise SimulationParameterError(
+            f"The balances in {path} do not match their metadata"
+        )
+    return BalanceStore(path, config, balances, fields.get("complete") is True)
@@ -0,0 +1,100 @@
+"""Contains earnings, taxes and reference calculations shared by tests."""
+
+import random
+from typing import List, Sequence
+
+from finances import (
+    Earnings,
+    EarningsTaxPolicy,
+    EarningsType,
+    Money,
+    MoneyArray,
+    TaxCategory,
+)
+from finances.tax import (
+    CompositeTax,
+    FederalIncomeTax,
+    FICATax,
+    FilingStatus,
+    FlatTax,
+    IncomeTax,
+    MaximumTax,
+)
+from finances.tax.bracket import BracketTax
+from finances.tax.state.mi import MichiganIncomeTax
+
+
+def random_earnings(generator: random.Random) -> Earnings:
+    """Creates random earnings with every category filled in."""
+    return Earnings(
+        gross_income=Money(generator.randrange(-(10**6), 10**8)),
+        adjustments=dict.fromkeys(
+            TaxCategory, Money(generator.randrange(10**6))
+        ),
+        deductions=dict.fromkeys(
+            TaxCategory, Money(generator.randrange(3 * 10**6))
+        ),
+        magi_additions=dict.fromkeys(
+            TaxCategory, Money(generator.randrange(10**5))
+        ),
+    )
+
+
+def walk_brackets(tax: BracketTax, earnings: Earnings) -> Money:
+    """
+    Calculates a BracketTax by walking every bracket from the top.
+
+    This is the original BracketTax.calculate algorithm, which calculate must
+    match exactly. src/finances/bench/brackets.py keeps its own copy.
+    """
+    # pylint: disable=duplicate-code
+    result = Money.ZERO
+    taxable_income = earnings.taxable_income(tax.policy)
+    for bracket in tax.brackets:
+        if taxable_income > bracket.threshold:
+            result += (taxable_income - bracket.threshold).grow_and_round(
+                bracket.marginal_rate
+            )
+            taxable_income = bracket.threshold
+    return result
+
+
+class DoubleTax:
+    """A tax that the compiler does not recognize."""
+
+    def __init__(self, tax: IncomeTax):
+        self.tax = tax
+
+    def calculate(self, earnings: Earnings) -> Money:
+        """Calculates twice the inner tax."""
+        return self.tax.calculate(earnings) * 2
+
+    def calculate_many(self, earnings: Sequence[Earnings]) -> MoneyArray:
+        """Calculates twice the inner tax on each of earnings."""
+        return self.tax.calculate_many(earnings) * 2
+
+
+FLOORED_TAX = FlatTax(
+    0.05,
+    EarningsTaxPolicy(
+        earnings_type=EarningsType.MAGI,
+        category=TaxCategory.LOCAL,
+        floor=Money.of(20000),
+        ceiling=Money.of(400000),
+    ),
+)
+
+
+def example_trees(status: FilingStatus) -> List[IncomeTax]:
+    """Returns tax trees made only of taxes that the compiler recognizes."""
+    federal = FederalIncomeTax(2022, status)
+    fica = FICATax(2022, status)
+    state = MichiganIncomeTax(2022)
+    return [
+        CompositeTax([federal, state, fica]),
+        CompositeTax([CompositeTax([federal, CompositeTax([])]), fica]),
+        MaximumTax([federal, CompositeTax([state, FLOORED_TAX])]),
+        CompositeTax([MaximumTax([fica, FLOORED_TAX]), state]),
+        CompositeTax([]),
+        FLOORED_TAX,
+    ]
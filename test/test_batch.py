@@ -0,0 +1,143 @@
+"""Tests of src/finances/batch.py."""
+
+import io
+import json
+import subprocess
+import sys
+from typing import Dict, Optional, Tuple
+
+from pytest import raises
+
+from finances import Earnings, Money, TaxCategory
+from finances.batch import run_batch
+from finances.tax import DEFAULT_TAX_SYSTEM, FilingStatus
+
+_CSV = """id,gross_income,adjustments,deductions,year,filing_status,state,state_deductions
+a,$85000,$1000,$12950,2022,single,MI,$5000
+b,120000.50,0,25900,2022,MARRIED_FILING_JOINTLY,,
+,50000,0,12550,2021,head_of_household,mi,4900
+"""
+
+
+def _expected_tax(
+    gross_income: Money,
+    adjustments: Money,
+    deductions: Money,
+    state_deductions: Money,
+    key: Tuple[int, FilingStatus, Optional[str]],
+) -> Money:
+    earnings = Earnings(
+        gross_income,
+        dict.fromkeys([TaxCategory.FEDERAL, TaxCategory.STATE], adjustments),
+        {
+            TaxCategory.FEDERAL: deductions,
+            TaxCategory.STATE: state_deductions,
+        },
+        dict.fromkeys([TaxCategory.FEDERAL, TaxCategory.STATE], Money.ZERO),
+    )
+    return DEFAULT_TAX_SYSTEM.compiled_stack(*key).calculate(earnings)
+
+
+def test_run_batch() -> None:
+    """Tests that CSV and JSONL rows are evaluated in order in chunks."""
+    expected = [
+        _expected_tax(
+            Money.of(85000),
+            Money.of(1000),
+            Money.of(12950),
+            Money.of(5000),
+            (2022, FilingStatus.SINGLE, "MI"),
+        ),
+        _expected_tax(
+            Money.of(120000, 50),
+            Money.ZERO,
+            Money.of(25900),
+            Money.ZERO,
+            (2022, FilingStatus.MARRIED_FILING_JOINTLY, None),
+        ),
+        _expected_tax(
+            Money.of(50000),
+            Money.ZERO,
+            Money.of(12550),
+            Money.of(4900),
+            (2021, FilingStatus.HEAD_OF_HOUSEHOLD, "MI"),
+        ),
+    ]
+    for chunk_size in [1, 2, 10]:
+        output = io.StringIO()
+        assert run_batch(io.StringIO(_CSV), output, chunk_size=chunk_size) == 3
+        lines = output.getvalue().splitlines()
+        assert lines[0] == "id,tax,net_income"
+        assert [line.split(",")[:2] for line in lines[1:]] == [
+            ["a", str(expected[0])],
+            ["b", str(expected[1])],
+            ["3", str(expected[2])],
+        ]
+
+    output = io.StringIO()
+    row: Dict[str, object] = {
+        "gross_income": 85000,
+        "adjustments": "1000.00",
+        "deductions": 12950.0,
+        "year": 2022,
+        "filing_status": "SINGLE",
+        "state": "MI",
+        "state_deductions": "$5000",
+    }
+    run_batch(io.StringIO(json.dumps(row) + "\n\n"), output, "jsonl", workers=1)
+    result: object = json.loads(output.getvalue())
+    assert result == {
+        "id": "1",
+        "tax": str(expected[0]),
+        "net_income": str(Money.of(85000) - expected[0]),
+    }
+
+
+def test_run_batch_exceptions() -> None:
+    """Tests that invalid rows are reported with their row numbers."""
+    header = "gross_income,adjustments,deductions,year,filing_status,state\n"
+    for row, message in [
+        (
+            "1,1,1,2022,single,MI\n1,1,,2022,single,MI",
+            "Row 2: Missing deductions",
+        ),
+        ("1,1,1,2022,widowed,MI", "Row 1: Invalid filing status"),
+        ("1,1,1.234,2022,single,MI", "Row 1: Invalid amount"),
+        ("1,1,$1.5,2022,single,MI", "Row 1: Invalid amount"),
+        ("1,1,\u0661,2022,single,MI", "Row 1: Invalid amount"),
+        ("1,1,1,2030,single,MI", "Row 1: No tax data for year 2030"),
+        ("1,1,1,2022,single,ZZ", "Row 1: No income tax data for state ZZ"),
+    ]:
+        with raises(ValueError, match=message):
+            run_batch(io.StringIO(header + row), io.StringIO())
+    for amount in ["1e400", "-1e400", "1e307", "NaN"]:
+        row = (
+            '{"gross_income": 1, "adjustments": 1, "deductions": '
+            + amount
+            + ', "year": 2022, "filing_status": "single", "state": "MI"}'
+        )
+        with raises(ValueError, match="Row 1: Invalid amount"):
+            run_batch(io.StringIO(row), io.StringIO(), "jsonl")
+    with raises(ValueError, match="Chunk size"):
+        run_batch(io.StringIO(header), io.StringIO(), chunk_size=0)
+
+
+def test_run_batch_exceptions_optimized() -> None:
+    """Tests that missing tax data is reported without assert statements."""
+    script = (
+        "import io\n"
+        "from finances.batch import run_batch\n"
+        "run_batch(io.StringIO("
+        "'gross_income,adjustments,deductions,year,filing_status\\n"
+        "1,1,1,2030,single'), io.StringIO())\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-O", "-c", script],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+    assert process.returncode != 0
+    assert process.stderr.splitlines()[-1] == (
+        "ValueError: Row 1: No tax data for year 2030"
+    )
@@ -0,0 +1,106 @@
+"""Tests of src/finances/tax/bracket.py."""
+
+import random
+
+import numpy as np
+
+from finances import (
+    Earnings,
+    EarningsTaxPolicy,
+    EarningsType,
+    Money,
+    MoneyArray,
+    TaxCategory,
+)
+from finances.tax.bracket import Bracket, BracketTax
+
+from .helpers import walk_brackets
+
+POLICY = EarningsTaxPolicy(
+    earnings_type=EarningsType.GROSS_INCOME,
+    category=TaxCategory.FEDERAL,
+)
+
+
+def _earnings(cents: int) -> Earnings:
+    return Earnings(
+        gross_income=Money(cents),
+        adjustments={},
+        deductions={},
+        magi_additions={},
+    )
+
+
+def test_calculate() -> None:
+    """Tests the behavior of BracketTax.calculate."""
+    tax = BracketTax(
+        [Bracket(0.1, Money.ZERO), Bracket(0.2, Money.of(100))], POLICY
+    )
+    assert tax.calculate(_earnings(-500)) == Money.ZERO
+    assert tax.calculate(_earnings(0)) == Money.ZERO
+    assert tax.calculate(_earnings(5)) == Money(0)
+    assert tax.calculate(_earnings(6)) == Money(1)
+    assert tax.calculate(_earnings(10000)) == Money.of(10)
+    assert tax.calculate(_earnings(20000)) == Money.of(30)
+    assert BracketTax([], POLICY).calculate(_earnings(100)) == Money.ZERO
+
+
+def test_calculate_matches_walk() -> None:
+    """Tests that BracketTax.calculate matches walking every bracket."""
+    generator = random.Random(1234)
+    for _ in range(200):
+        # Few distinct thresholds, so that duplicates are common
+        brackets = [
+            Bracket(
+                generator.choice([0.0, 0.1, 0.123, 0.37, 0.5, 1.0]),
+                Money(generator.randrange(-5, 5) * 1337),
+            )
+            for _ in range(generator.randrange(8))
+        ]
+        tax = BracketTax(brackets, POLICY)
+        for _ in range(20):
+            earnings = _earnings(generator.randrange(-10000, 10000))
+            assert tax.calculate(earnings) == walk_brackets(tax, earnings)
+
+
+def test_calculate_many() -> None:
+    """Tests that BracketTax.calculate_many matches calculate."""
+    generator = random.Random(5678)
+    for _ in range(100):
+        brackets = [
+            Bracket(
+                generator.choice([0.0, 0.1, 0.123, 0.37, 0.5, 1.0]),
+                Money(generator.randrange(-5, 5) * 1337),
+            )
+            for _ in range(generator.randrange(8))
+        ]
+        tax = BracketTax(brackets, POLICY)
+        earnings = [
+            _earnings(generator.randrange(-10000, 10000)) for _ in range(50)
+        ]
+        assert list(tax.calculate_many(earnings)) == [
+            tax.calculate(each) for each in earnings
+        ]
+
+    tax = BracketTax(
+        [Bracket(0.5, Money(-(2**62))), Bracket(0.25, Money(2**61))], POLICY
+    )
+    incomes = [2**63 - 1, 2**70, -(2**70), 0, 2**61 + 1]
+    earnings = [_earnings(income) for income in incomes]
+    assert list(tax.calculate_many(earnings)) == [
+        tax.calculate(each) for each in earnings
+    ]
+    assert len(tax.calculate_many([])) == 0
+
+
+def test_calculate_on_taxable() -> None:
+    """Tests the behavior of BracketTax.calculate_on_taxable."""
+    tax = BracketTax(
+        [Bracket(0.1, Money.ZERO), Bracket(0.2, Money.of(100))], POLICY
+    )
+    incomes = MoneyArray(np.array([-500, 0, 5, 6, 10000, 20000]))
+    assert tax.calculate_on_taxable(incomes).equals(
+        MoneyArray([0, 0, 0, 1, 1000, 3000])
+    )
+    empty = BracketTax([], POLICY)
+    assert empty.calculate_on_taxable(incomes).equals(MoneyArray.zeros(6))
@@ -0,0 +1,150 @@
+"""Tests of src/simulate/checkpoint.py."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+from pytest import raises
+
+from finances import Money
+from simulate.checkpoint import Checkpointer
+from simulate.errors import SimulationCheckpointError
+from simulate.montecarlo import (
+    BLOCK_PATHS,
+    MonteCarloConfig,
+    summarize_monte_carlo,
+)
+from simulate.sketch import DEFAULT_ACCURACY, QuantileSketch
+
+
+class _Interrupted(Exception):
+    """Stands in for a simulation that dies."""
+
+
+class _InterruptingCheckpointer(Checkpointer):
+    """A checkpointer whose simulation dies after a number of blocks."""
+
+    def __init__(self, path: Path, blocks: int):
+        super().__init__(path, interval=0.0)
+        self.blocks = blocks
+
+    def update(self, next_block: int, sketch: QuantileSketch) -> None:
+        """Saves a checkpoint, then interrupts the simulation if it is time."""
+        super().update(next_block, sketch)
+        if next_block == self.blocks:
+            raise _Interrupted()
+
+
+def _same(first: QuantileSketch, second: QuantileSketch) -> bool:
+    """Returns whether two sketches have exactly the same state."""
+    first_arrays, second_arrays = first.to_arrays(), second.to_arrays()
+    return first_arrays.keys() == second_arrays.keys() and all(
+        first_arrays[key].tobytes() == second_arrays[key].tobytes()
+        for key in first_arrays
+    )
+
+
+def test_resume(tmp_path: Path) -> None:
+    """Tests that resumed simulations match uninterrupted ones."""
+    config = MonteCarloConfig(2024, 2027, Money.of(100), 3 * BLOCK_PATHS + 1)
+    expected = summarize_monte_carlo(config, exact_limit=0).sketch
+    path = tmp_path / "run.checkpoint"
+    with raises(_Interrupted):
+        summarize_monte_carlo(
+            config,
+            exact_limit=0,
+            checkpointer=_InterruptingCheckpointer(path, 2),
+        )
+    resumed = summarize_monte_carlo(
+        config,
+        workers=2,
+        exact_limit=0,
+        checkpointer=Checkpointer(path, resume=True),
+    ).sketch
+    assert _same(resumed, expected)
+    assert list(tmp_path.iterdir()) == [path]
+
+    # The final checkpoint holds the complete sketch
+    finished = summarize_monte_carlo(
+        config, exact_limit=0, checkpointer=Checkpointer(path, resume=True)
+    ).sketch
+    assert _same(finished, expected)
+
+
+def test_invalid_checkpoints(tmp_path: Path) -> None:
+    """Tests that missing or mismatched checkpoints are rejected."""
+    config = MonteCarloConfig(2024, 2026, Money.of(100), 10)
+    path = tmp_path / "run.checkpoint"
+    with raises(SimulationCheckpointError):
+        summarize_monte_carlo(
+            config, checkpointer=Checkpointer(path, resume=True)
+        )
+    summarize_monte_carlo(config, checkpointer=Checkpointer(path))
+    with raises(SimulationCheckpointError):
+        summarize_monte_carlo(
+            MonteCarloConfig(2024, 2026, Money.of(100), 10, seed=1),
+            checkpointer=Checkpointer(path, resume=True),
+        )
+    with raises(SimulationCheckpointError):
+        summarize_monte_carlo(
+            config,
+            accuracy=DEFAULT_ACCURACY // 2,
+            checkpointer=Checkpointer(path, resume=True),
+        )
+    path.write_bytes(b"not a checkpoint")
+    with raises(SimulationCheckpointError):
+        summarize_monte_carlo(
+            config, checkpointer=Checkpointer(path, resume=True)
+        )
+
+
+def test_out_of_range_checkpoints(tmp_path: Path) -> None:
+    """Tests that next blocks outside the simulation are rejected."""
+    config = MonteCarloConfig(2024, 2026, Money.of(100), BLOCK_PATHS + 10)
+    path = tmp_path / "run.checkpoint"
+    summarize_monte_carlo(config, checkpointer=Checkpointer(path))
+    with np.load(path) as arrays:
+        sketch_arrays = {
+            name: arrays[name] for name in arrays.files if name != "checkpoint"
+        }
+    # The sketch holds every path, so only next_block=2 (the end) matches it
+    for next_block in [-1, 0, 1, 3, 99, True]:
+        header = {
+            "version": 1,
+            "fingerprint": config.fingerprint(),
+            "next_block": next_block,
+        }
+        with open(path, "wb") as file:
+            np.savez(
+                file, checkpoint=np.array(json.dumps(header)), **sketch_arrays
+            )
+        with raises(SimulationCheckpointError):
+            summarize_monte_carlo(
+                config, checkpointer=Checkpointer(path, resume=True)
+            )
+
+
+def test_malformed_checkpoints(tmp_path: Path) -> None:
+    """Tests that checkpoints with malformed contents are rejected."""
+    path = tmp_path / "run.checkpoint"
+    sketch = QuantileSketch(3)
+    arrays = sketch.to_arrays()
+    parameters = json.loads(str(arrays["sketch"]))
+    parameters["generator"] = {"bit_generator": "PCG64", "state": 5}
+    for header, sketch_arrays in [
+        # A header that is not an object
+        ([1], arrays),
+        # A generator state that numpy rejects
+        (
+            {"version": 1, "fingerprint": "", "next_block": 0},
+            {**arrays, "sketch": np.array(json.dumps(parameters))},
+        ),
+    ]:
+        with open(path, "wb") as file:
+            np.savez(
+                file, checkpoint=np.array(json.dumps(header)), **sketch_arrays
+            )
+        with raises(SimulationCheckpointError):
+            Checkpointer(path, resume=True).restore(
+                "", QuantileSketch(3), 10, BLOCK_PATHS
+            )
@@ -0,0 +1,65 @@
+"""Tests of src/finances/tax/compiled.py."""
+
+import random
+
+from pytest import raises
+
+from finances import Earnings, Money, TaxCategory
+from finances.tax import (
+    compile_tax,
+    CompositeTax,
+    FederalIncomeTax,
+    FICATax,
+    FilingStatus,
+    MaximumTax,
+)
+from finances.tax.state.mi import MichiganIncomeTax
+
+from .helpers import DoubleTax, example_trees, FLOORED_TAX, random_earnings
+
+
+def test_compile_tax() -> None:
+    """Tests that compiled taxes match the trees they were compiled from."""
+    generator = random.Random(7)
+    earnings = [random_earnings(generator) for _ in range(300)]
+    for status in FilingStatus:
+        opaque = CompositeTax(
+            [
+                MaximumTax([FICATax(2022, status), FLOORED_TAX]),
+                DoubleTax(MichiganIncomeTax(2022)),
+            ]
+        )
+        for tax in example_trees(status) + [opaque]:
+            compiled = compile_tax(tax)
+            assert [compiled.calculate(each) for each in earnings] == [
+                tax.calculate(each) for each in earnings
+            ]
+            assert compiled.calculate_many(earnings).equals(
+                tax.calculate_many(earnings)
+            )
+
+
+def test_projections() -> None:
+    """Tests that leaves with the same projection share it."""
+    compiled = compile_tax(
+        CompositeTax(
+            [
+                FederalIncomeTax(2022, FilingStatus.SINGLE),
+                MichiganIncomeTax(2022),
+                FICATax(2022, FilingStatus.SINGLE),
+            ]
+        )
+    )
+    assert compiled.leaf_count() == 4
+    assert compiled.projection_count() == 3
+
+
+def test_compile_tax_exception() -> None:
+    """Tests that compiled taxes make the same checks as Earnings."""
+    compiled = compile_tax(MichiganIncomeTax(2022))
+    with raises(AssertionError, match="no adjustments"):
+        compiled.calculate(Earnings(Money.of(1), {}, {}, {}))
+    with raises(AssertionError, match="no deductions"):
+        compiled.calculate(
+            Earnings(Money.of(1), {TaxCategory.STATE: Money.ZERO}, {}, {})
+        )
@@ -0,0 +1,55 @@
+"""Tests of src/finances/tax/cube.py."""
+
+import random
+
+from finances import Earnings, EarningsBatch, Money, TaxCategory
+from finances.tax import evaluate_cube, FilingStatus, TaxSystem
+
+from .helpers import random_earnings
+
+
+def test_evaluate_cube() -> None:
+    """Tests that each cell of a cube matches its tax stack."""
+    generator = random.Random(18)
+    earnings = [random_earnings(generator) for _ in range(200)]
+    system = TaxSystem()
+    years = (2022, 2021)
+    states = (None, "MI")
+    cube = evaluate_cube(earnings, years, states=states, system=system)
+    assert cube.cents.shape == (2, len(FilingStatus), 2, 200)
+    for year in years:
+        for status in FilingStatus:
+            for state in states:
+                stack = system.income_taxes(year, status, state)
+                assert cube.tax(year, status, state).equals(
+                    stack.calculate_many(earnings)
+                )
+
+    # The same results come from columns, and from one taxpayer at a time
+    batch = EarningsBatch.of(earnings)
+    assert (
+        evaluate_cube(batch, years, states=states).cents == cube.cents
+    ).all()
+    single = evaluate_cube(earnings[3], years, states=states)
+    assert (single.cents[..., 0] == cube.cents[..., 3]).all()
+
+
+def test_evaluate_cube_overflow() -> None:
+    """Tests that incomes too large for int64 arithmetic are still exact."""
+    earnings = Earnings(
+        Money(2**70),
+        dict.fromkeys(TaxCategory, Money.ZERO),
+        dict.fromkeys(TaxCategory, Money.ZERO),
+        dict.fromkeys(TaxCategory, Money.ZERO),
+    )
+    cube = evaluate_cube(earnings, [2022], [FilingStatus.SINGLE], ["MI"])
+    expected = TaxSystem().income_taxes(2022, FilingStatus.SINGLE, "MI")
+    assert list(cube.tax(2022, FilingStatus.SINGLE, "MI")) == [
+        expected.calculate(earnings)
+    ]
+    assert evaluate_cube(earnings, []).cents.shape == (
+        0,
+        len(FilingStatus),
+        1,
+        1,
+    )
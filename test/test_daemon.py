@@ -0,0 +1,178 @@
+"""Tests of src/finances/daemon.py."""
+
+import asyncio
+import json
+import socket
+from pathlib import Path
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pytest import MonkeyPatch, raises
+
+from finances import daemon as daemon_module
+from finances.batch import calculate_taxes, parse_taxpayer
+from finances.daemon import (
+    _request,
+    connector,
+    generate_load,
+    percentile,
+    SAMPLE_ROWS,
+    TaxDaemon,
+)
+
+Streams = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def _run_with_daemon(
+    daemon: TaxDaemon,
+    socket_path: Optional[Path],
+    body: Callable[[Callable[[], Awaitable[Streams]]], Awaitable[None]],
+) -> None:
+    """Runs body against a daemon on a Unix socket or an unused TCP port."""
+
+    async def run() -> None:
+        started: asyncio.Future[
+            int
+        ] = asyncio.get_running_loop().create_future()
+
+        def ready(sockets: Sequence[socket.socket]) -> None:
+            if socket_path:
+                started.set_result(0)
+            else:
+                port: int = sockets[0].getsockname()[1]
+                started.set_result(port)
+
+        serving = asyncio.create_task(
+            daemon.serve(
+                port=0,
+                socket_path=None if socket_path is None else str(socket_path),
+                ready=ready,
+            )
+        )
+        port = await started
+        try:
+            await body(
+                connector(
+                    port=port,
+                    socket_path=None
+                    if socket_path is None
+                    else str(socket_path),
+                )
+            )
+        finally:
+            serving.cancel()
+
+    asyncio.run(run())
+
+
+def _expected(rows: Sequence[Mapping[str, object]]) -> List[str]:
+    return [
+        str(tax)
+        for tax in calculate_taxes([parse_taxpayer(row) for row in rows])
+    ]
+
+
+def test_daemon_requests(tmp_path: Path) -> None:
+    """Tests that requests are evaluated in batches, with errors as 400s."""
+    rows = SAMPLE_ROWS[:50]
+
+    async def body(connect: Callable[[], Awaitable[Streams]]) -> None:
+        streams = await connect()
+
+        async def call(
+            method: str, path: str, request: object
+        ) -> Tuple[int, bytes]:
+            return await _request(
+                streams, method, path, json.dumps(request).encode()
+            )
+
+        status, response = await call("POST", "/tax", dict(rows[0], id="x"))
+        assert status == 200
+        single: Dict[str, str] = json.loads(response)
+        assert single["id"] == "x"
+        assert single["tax"] == _expected(rows[:1])[0]
+
+        status, response = await call("POST", "/tax", rows)
+        assert status == 200
+        many: List[Dict[str, str]] = json.loads(response)
+        assert [result["tax"] for result in many] == _expected(rows)
+        assert [result["id"] for result in many] == [
+            str(number) for number in range(1, 51)
+        ]
+
+        status, response = await call("POST", "/tax", [rows[0], {"year": 2022}])
+        assert status == 400
+        error: Dict[str, str] = json.loads(response)
+        assert error["error"].startswith("Row 2: Missing")
+        status, _ = await call("POST", "/tax", dict(rows[0], year=1900))
+        assert status == 400
+        status, _ = await call("GET", "/missing", None)
+        assert status == 404
+
+        status, response = await call("GET", "/stats", None)
+        assert status == 200
+        stats: Dict[str, float] = json.loads(response)
+        assert stats["requests"] == 4
+        assert stats["rows"] == 51
+        assert stats["errors"] == 2
+        assert stats["queue_depth"] == 0
+        assert 0 < stats["p50_ms"] <= stats["p99_ms"]
+        streams[1].close()
+
+    _run_with_daemon(TaxDaemon(max_batch=16), tmp_path / "daemon.sock", body)
+
+
+def test_daemon_failures(monkeypatch: MonkeyPatch) -> None:
+    """Tests that unexpected failures in a batch are 500s."""
+
+    def fail(taxpayers: object) -> None:
+        raise RuntimeError(f"Could not evaluate {taxpayers!r}")
+
+    async def body(connect: Callable[[], Awaitable[Streams]]) -> None:
+        streams = await connect()
+        request = json.dumps(SAMPLE_ROWS[0]).encode()
+        for _ in range(2):
+            status, response = await _request(streams, "POST", "/tax", request)
+            assert status == 500
+            assert b"RuntimeError" in response
+        status, _ = await _request(streams, "GET", "/stats", b"")
+        assert status == 200
+        streams[1].close()
+
+    monkeypatch.setattr(daemon_module, "calculate_taxes", fail)
+    _run_with_daemon(TaxDaemon(), None, body)
+
+
+def test_generate_load() -> None:
+    """Tests that concurrent requests over TCP share batches."""
+
+    async def body(connect: Callable[[], Awaitable[Streams]]) -> None:
+        report = await generate_load(connect, SAMPLE_ROWS, 400, 20)
+        assert report.requests == 400
+        assert report.errors == 0
+        assert report.server_stats["rows"] == 400
+        assert report.server_stats["batches"] < 400
+        assert 0 < report.p50_ms <= report.p99_ms
+
+    _run_with_daemon(TaxDaemon(max_delay=0.005), None, body)
+
+
+def test_percentile() -> None:
+    """Tests nearest-rank percentiles and invalid daemon settings."""
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 0) == 1
+    assert percentile([], 0.5) == 0
+    with raises(ValueError):
+        TaxDaemon(max_batch=0)
+    with raises(ValueError):
+        TaxDaemon(workers=-1)
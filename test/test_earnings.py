@@ -1,10 +1,18 @@
 """Tests of src/finances/earnings.py."""
 
+import array
+import dataclasses
+
+import numpy as np
+from pytest import raises
+
 from finances import (
     Earnings,
+    EarningsBatch,
     EarningsTaxPolicy,
     EarningsType,
     Money,
+    MoneyArray,
     TaxCategory,
 )
 
@@ -88,3 +96,162 @@ def test_taxable_income() -> None:
     assert EARNINGS_1.taxable_income(TAX_POLICY_4) == Money.of(99999)
     assert EARNINGS_1.taxable_income(TAX_POLICY_5) == Money.of(99820)
     assert EARNINGS_1.taxable_income(TAX_POLICY_6) == Money.of(91800)
+
+
+def test_taxable_incomes() -> None:
+    """Tests that Earnings.taxable_incomes matches taxable_income."""
+    earnings_2 = Earnings(
+        gross_income=Money.of(-5),
+        adjustments=dict.fromkeys(TaxCategory, Money.of(250000)),
+        deductions=dict.fromkeys(TaxCategory, Money.ZERO),
+        magi_additions=dict.fromkeys(TaxCategory, Money.of(3)),
+    )
+    earnings = [EARNINGS_1, earnings_2, EARNINGS_1]
+    for policy in [
+        TAX_POLICY_1,
+        TAX_POLICY_2,
+        TAX_POLICY_3,
+        TAX_POLICY_4,
+        TAX_POLICY_5,
+        TAX_POLICY_6,
+    ]:
+        assert list(Earnings.taxable_incomes(earnings, policy)) == [
+            each.taxable_income(policy) for each in earnings
+        ]
+    assert Earnings.taxable_incomes([], TAX_POLICY_1).equals(MoneyArray([]))
+
+    missing = Earnings(Money.of(1), {}, {}, {})
+    with raises(AssertionError):
+        Earnings.taxable_incomes([EARNINGS_1, missing], TAX_POLICY_1)
+
+
+_POLICIES = [
+    TAX_POLICY_1,
+    TAX_POLICY_2,
+    TAX_POLICY_3,
+    TAX_POLICY_4,
+    TAX_POLICY_5,
+    TAX_POLICY_6,
+]
+
+
+def test_earnings_batch() -> None:
+    """Tests that EarningsBatch matches Earnings without copying arrays."""
+    gross = np.array([10000000, -500, 2**62], dtype=np.int64)
+    adjustments = np.array(
+        [[10000, 25000000, 0], [20000, 25000000, 0], [30000, 25000000, 0]],
+        dtype=np.int64,
+    )
+    deductions = array.array("q", [900000, 0, 2**62])
+    batch = EarningsBatch(
+        gross,
+        adjustments,
+        {category: deductions for category in TaxCategory},
+        {category: np.array([1000, 300, 5]) for category in TaxCategory},
+    )
+    assert np.shares_memory(batch.gross_income.all_cents(), gross)
+    assert (
+        np.shares_memory(
+            batch.agi(TaxCategory.STATE).all_cents(),
+            batch.gross_income.all_cents(),
+        )
+        is False
+    )
+    assert batch.agi(TaxCategory.STATE) is batch.agi(TaxCategory.STATE)
+
+    earnings = list(batch)
+    assert earnings[0] == Earnings(
+        Money.of(100000),
+        {
+            TaxCategory.FEDERAL: Money.of(100),
+            TaxCategory.STATE: Money.of(200),
+            TaxCategory.LOCAL: Money.of(300),
+        },
+        dict.fromkeys(TaxCategory, Money.of(9000)),
+        dict.fromkeys(TaxCategory, Money.of(10)),
+    )
+    for policy in _POLICIES:
+        assert list(batch.taxable_income(policy)) == [
+            each.taxable_income(policy) for each in earnings
+        ]
+        assert batch.taxable_income(policy).equals(
+            Earnings.taxable_incomes(earnings, policy)
+        )
+    for earnings_type in EarningsType:
+        assert list(batch.of_type(TaxCategory.LOCAL, earnings_type)) == [
+            each.of_type(TaxCategory.LOCAL, earnings_type) for each in earnings
+        ]
+
+    assert len(batch[1:]) == 2
+    assert batch[1:][0] == earnings[1]
+    assert EarningsBatch.of(batch) is batch
+    assert list(EarningsBatch.of(earnings)[::2]) == earnings[::2]
+
+
+def test_earnings_batch_missing() -> None:
+    """Tests EarningsBatch with missing categories and mismatched columns."""
+    batch = EarningsBatch(
+        array.array("q", [500, 600]),
+        {TaxCategory.FEDERAL: [100, 200]},
+        {},
+        {},
+    )
+    assert list(batch.agi(TaxCategory.FEDERAL)) == [Money(400), Money(400)]
+    assert batch[0] == Earnings(
+        Money(500), {TaxCategory.FEDERAL: Money(100)}, {}, {}
+    )
+    with raises(AssertionError):
+        batch.agi(TaxCategory.STATE)
+    with raises(AssertionError):
+        batch.magi(TaxCategory.FEDERAL)
+    with raises(AssertionError):
+        EarningsBatch([1, 2], {TaxCategory.FEDERAL: [1]}, {}, {})
+    with raises(AssertionError):
+        EarningsBatch([1, 2], np.zeros((2, 2), dtype=np.int64), {}, {})
+
+
+def test_derived_table() -> None:
+    """Tests that derived earnings are calculated once and validated early."""
+    earnings = Earnings(
+        Money.of(500),
+        {TaxCategory.FEDERAL: Money.of(100)},
+        {TaxCategory.FEDERAL: Money.of(50)},
+        {},
+    )
+    agi = earnings.agi(TaxCategory.FEDERAL)
+    assert agi == Money.of(400)
+    assert earnings.agi(TaxCategory.FEDERAL) is agi
+    assert earnings.agi_with_deductions(TaxCategory.FEDERAL) == Money.of(350)
+    assert (
+        earnings.of_type(TaxCategory.LOCAL, EarningsType.GROSS_INCOME)
+        is earnings.gross_income
+    )
+    assert earnings == Earnings(
+        Money.of(500),
+        {TaxCategory.FEDERAL: Money.of(100)},
+        {TaxCategory.FEDERAL: Money.of(50)},
+        {},
+    )
+    # The table is not one of the dataclass's fields
+    assert [each.name for each in dataclasses.fields(earnings)] == [
+        "gross_income",
+        "adjustments",
+        "deductions",
+        "magi_additions",
+    ]
+    assert len(dataclasses.astuple(earnings)) == 4
+    assert "_derived" not in dataclasses.asdict(earnings)
+    assert "_derived" not in repr(earnings)
+    changed = dataclasses.replace(earnings, gross_income=Money.of(600))
+    assert changed.agi(TaxCategory.FEDERAL) == Money.of(500)
+
+    with raises(AssertionError, match="no MAGI additions"):
+        earnings.magi(TaxCategory.FEDERAL)
+    with raises(AssertionError, match="no adjustments"):
+        earnings.agi_with_deductions(TaxCategory.STATE)
+    with raises(AssertionError):
+        Earnings(Money.of(1), {"FEDERAL": Money.of(1)}, {}, {})  # type: ignore
+    with raises(AssertionError):
+        Earnings(Money.of(1), {}, {TaxCategory.STATE: 5}, {})  # type: ignore
+    with raises(AssertionError):
+        Earnings(100, {}, {}, {})  # type: ignore
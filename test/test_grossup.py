@@ -0,0 +1,61 @@
+"""Tests of src/finances/tax/grossup.py."""
+
+import random
+
+from pytest import raises
+
+from finances import (
+    Earnings,
+    EarningsTaxPolicy,
+    EarningsType,
+    Money,
+    MoneyArray,
+    TaxCategory,
+)
+from finances.tax import compile_piecewise, FilingStatus, FlatTax, GrossUpSolver
+
+from .helpers import example_trees
+
+
+def test_gross_up() -> None:
+    """Tests that gross_up finds the smallest sufficient gross income."""
+    template = Earnings(
+        Money.ZERO,
+        dict.fromkeys(TaxCategory, Money.of(1000)),
+        {
+            TaxCategory.FEDERAL: Money.of(12950),
+            TaxCategory.STATE: Money.of(5000),
+        },
+        dict.fromkeys(TaxCategory, Money.ZERO),
+    )
+    generator = random.Random(9)
+    targets = [
+        Money(generator.randrange(-(10**6), 10**8)) for _ in range(200)
+    ]
+    targets += [Money.ZERO, Money(1), Money.of(100000)]
+    for status in [FilingStatus.SINGLE, FilingStatus.MARRIED_FILING_JOINTLY]:
+        for tax in example_trees(status):
+            solver = GrossUpSolver(compile_piecewise(tax, template))
+            grosses = [solver.gross_up(target) for target in targets]
+            for target, gross in zip(targets, grosses):
+                cents = gross.all_cents()
+                assert solver.net_income_cents(cents) >= target.all_cents()
+                for below in range(cents - 50, cents):
+                    assert solver.net_income_cents(below) < target.all_cents()
+            assert solver.gross_up_many(MoneyArray.from_money(targets)).equals(
+                MoneyArray.from_money(grosses)
+            )
+
+
+def test_gross_up_exception() -> None:
+    """Tests that taxes of 100% or more cannot be grossed up."""
+    tax = FlatTax(
+        1.0,
+        EarningsTaxPolicy(
+            earnings_type=EarningsType.GROSS_INCOME,
+            category=TaxCategory.FEDERAL,
+        ),
+    )
+    piecewise = compile_piecewise(tax, Earnings(Money.ZERO, {}, {}, {}))
+    with raises(ValueError, match="100%"):
+        GrossUpSolver(piecewise)
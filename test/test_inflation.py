@@ -0,0 +1,69 @@
+"""Tests of src/finances/inflation/."""
+
+import numpy as np
+from pytest import approx, raises
+
+from finances import Money, MoneyArray, Value
+from finances.inflation import CPI_U, InflationIndex
+
+
+def test_inflation_since_2000() -> None:
+    """Tests looking up inflation in a single year or month."""
+    assert CPI_U.inflation_since_2000(2000) == 0.0
+    assert CPI_U.inflation_since_2000(2022) == approx(292.655 / 172.2 - 1.0)
+    assert CPI_U.inflation_since_2000(2009) < CPI_U.inflation_since_2000(2008)
+    assert CPI_U.inflation_since_2000(2022, 5) == (
+        CPI_U.inflation_since_2000(2022)
+    )
+    assert 2024 in CPI_U.years()
+
+    index = InflationIndex({1999: 90.0, 2000: 100.0}, {(2000, 3): 110.0})
+    assert index.inflation_since_2000(1999) == approx(-0.1)
+    assert index.inflation_since_2000(2000, 3) == approx(0.1)
+    assert index.inflation_since_2000(2000, 4) == 0.0
+
+    with raises(ValueError):
+        CPI_U.inflation_since_2000(1900)
+    with raises(ValueError):
+        CPI_U.inflation_since_2000(2022, 13)
+    with raises(ValueError):
+        InflationIndex({2001: 1.0})
+    with raises(ValueError):
+        InflationIndex({2000: 1.0, 2002: 1.0})
+    with raises(ValueError):
+        InflationIndex({2000: 1.0}, {(2001, 1): 1.0})
+
+
+def test_inflation_since_2000_many() -> None:
+    """Tests looking up inflation in many years or months at once."""
+    years = [2022, 2000, 2009, 2022]
+    assert list(CPI_U.inflation_since_2000_many(years)) == [
+        CPI_U.inflation_since_2000(year) for year in years
+    ]
+
+    index = InflationIndex({2000: 100.0}, {(2000, 3): 110.0})
+    assert list(index.inflation_since_2000_many(2000, [1, 3])) == [
+        0.0,
+        approx(0.1),
+    ]
+
+    with raises(ValueError, match="1999"):
+        CPI_U.inflation_since_2000_many([2000, 1999])
+    with raises(ValueError, match="Invalid month 0"):
+        CPI_U.inflation_since_2000_many([2000], [0])
+
+
+def test_conversions() -> None:
+    """Tests that batch conversions match single conversions."""
+    amounts = [Money.of(100), Money.of(-2, 50), Money(1), Money.of(123456)]
+    years = np.array([2000, 2010, 2022, 2024])
+
+    values = CPI_U.to_values(MoneyArray.from_money(amounts), years)
+    assert list(values) == [
+        CPI_U.to_value(amount, int(year))
+        for amount, year in zip(amounts, years)
+    ]
+    assert CPI_U.to_value(Money.of(100), 2000) == Value(10000)
+
+    inflated = CPI_U.to_money_array(values, 2022)
+    assert list(inflated) == [CPI_U.to_money(value, 2022) for value in values]
@@ -1,5 +1,8 @@
 """Tests of src/finances/money.py."""
 
+import copy
+import pickle
+
 from finances import Money
 
 
@@ -22,6 +25,8 @@ def test_parse() -> None:
     assert Money.parse("$0") == Money.ZERO
     assert Money.parse("-$0") == Money.ZERO
     assert Money.parse("-$923.60") == Money.of(-923, 60)
+    assert Money.parse("-$0.46") == Money.of(Money.NEGATIVE_ZERO, 46)
+    assert Money.parse("  $12.05\n") == Money.of(12, 5)
 
 
 def test_truncated_dollars() -> None:
@@ -113,3 +118,16 @@ def test_grow_and_round() -> None:
     assert Money.of(22000, 78).grow_and_round(12345.6789) == Money.of(
         271614565, 43
     )
+
+
+def test_compact() -> None:
+    """Tests that Money is slotted, interned, and still copyable."""
+    assert not hasattr(Money(5), "__dict__")
+    assert Money.of(42) is Money.of(42)
+    assert Money.of(-7) is Money.of(-7)
+    assert Money.of(3) + Money.of(4) == Money.of(7)
+    for money in [Money.ZERO, Money.of(-314, 15), Money(2**70)]:
+        restored: Money = pickle.loads(pickle.dumps(money))
+        assert restored == money
+        assert copy.copy(money) == money
+        assert copy.deepcopy(money) == money
@@ -0,0 +1,196 @@
+"""Tests of src/finances/money_array.py."""
+
+import numpy as np
+from pytest import raises
+
+from finances import Money, MoneyArray
+
+
+INT64_MAX = 2**63 - 1
+
+
+def test_create() -> None:
+    """Tests creating a MoneyArray."""
+    assert len(MoneyArray([])) == 0
+    assert list(MoneyArray([0, 314, -15])) == [
+        Money.ZERO,
+        Money.of(3, 14),
+        Money(-15),
+    ]
+    assert list(
+        MoneyArray.from_money(
+            [Money.of(-2, 72), Money.of(Money.NEGATIVE_ZERO, 5)]
+        )
+    ) == [Money.of(-2, 72), Money(-5)]
+    assert list(MoneyArray.zeros(3)) == [Money.ZERO] * 3
+    assert list(MoneyArray.full(2, Money.of(7))) == [Money.of(7)] * 2
+
+    cents = np.array([1, 2, 3], dtype=np.int64)
+    array = MoneyArray(cents)
+    assert np.shares_memory(array.all_cents(), cents)
+    with raises(ValueError):
+        array.all_cents()[0] = 5
+
+    with raises(TypeError):
+        MoneyArray([1.5])  # type: ignore[list-item]
+
+
+def test_getitem() -> None:
+    """Tests the behavior of MoneyArray.__getitem__."""
+    array = MoneyArray([100, -250, 99])
+    assert array[0] == Money.of(1)
+    assert array[-1] == Money.of(0, 99)
+    assert isinstance(array[1].all_cents(), int)
+    assert list(array[1:]) == [Money.of(-2, 50), Money.of(0, 99)]
+    assert list(array[array > Money.ZERO]) == [Money.of(1), Money.of(0, 99)]
+    assert len(array) == 3
+
+
+def test_str() -> None:
+    """Tests the behavior of MoneyArray.__str__."""
+    assert str(MoneyArray([])) == "[]"
+    assert str(MoneyArray([314, -2072])) == "[$3.14, -$20.72]"
+
+
+def test_add_and_sub() -> None:
+    """Tests the behavior of MoneyArray.__add__ and MoneyArray.__sub__."""
+    left = MoneyArray([3115, -1902, 0])
+    right = MoneyArray([-2826, 2000, 1])
+    assert (left + right).equals(MoneyArray([289, 98, 1]))
+    assert (left - right).equals(MoneyArray([5941, -3902, -1]))
+    assert (left + Money.of(1)).equals(MoneyArray([3215, -1802, 100]))
+    assert (left - Money.of(1)).equals(MoneyArray([3015, -2002, -100]))
+
+
+def test_mul() -> None:
+    """Tests the behavior of MoneyArray.__mul__."""
+    array = MoneyArray([-16540, 2837, 0])
+    assert (array * -3).equals(MoneyArray([49620, -8511, 0]))
+    assert (22 * array).equals(MoneyArray([-363880, 62414, 0]))
+    assert (array * np.array([0, 1, 5])).equals(MoneyArray([0, 2837, 0]))
+
+
+def test_grow_and_round() -> None:
+    """Tests that MoneyArray.grow_and_round matches Money.grow_and_round."""
+    cents = [0, 1, -1, 5, -5, 15, 25, -95366, 2200078, 123456789, -987654321]
+    ratios = [0.0, 0.5, 1.5, 0.782, 0.1, 12345.6789, -0.3, 1.07]
+    array = MoneyArray(cents)
+    for ratio in ratios:
+        assert list(array.grow_and_round(ratio)) == [
+            Money(each).grow_and_round(ratio) for each in cents
+        ]
+
+    per_element = np.linspace(-2.0, 2.0, num=len(cents))
+    assert list(array.grow_and_round(per_element)) == [
+        Money(each).grow_and_round(float(ratio))
+        for each, ratio in zip(cents, per_element)
+    ]
+
+
+def test_comparisons() -> None:
+    """Tests element-wise comparisons of MoneyArray."""
+    left = MoneyArray([1, 2, 3])
+    right = MoneyArray([3, 2, 1])
+    assert list(left < right) == [True, False, False]
+    assert list(left <= right) == [True, True, False]
+    assert list(left > right) == [False, False, True]
+    assert list(left >= right) == [False, True, True]
+    assert list(left == right) == [False, True, False]
+    assert list(left != right) == [True, False, True]
+    assert list(left > Money(2)) == [False, False, True]
+
+
+def test_reductions() -> None:
+    """Tests the behavior of MoneyArray.min, max, and sum."""
+    array = MoneyArray([-31415, 27182, 0, 16180])
+    assert array.min() == Money.of(-314, 15)
+    assert array.max() == Money.of(271, 82)
+    assert array.sum() == Money(11947)
+    assert MoneyArray([]).sum() == Money.ZERO
+    with raises(ValueError):
+        MoneyArray([]).min()
+    with raises(ValueError):
+        MoneyArray([]).max()
+
+
+def test_maximum_and_minimum() -> None:
+    """Tests the behavior of MoneyArray.maximum and MoneyArray.minimum."""
+    left = MoneyArray([-5, 0, 7])
+    right = MoneyArray([3, -1, 7])
+    assert left.maximum(right).equals(MoneyArray([3, 0, 7]))
+    assert left.minimum(right).equals(MoneyArray([-5, -1, 7]))
+    assert left.maximum(Money.ZERO).equals(MoneyArray([0, 0, 7]))
+    assert left.minimum(Money(2**70)).equals(left)
+    assert list(left.maximum(Money(2**70))) == [Money(2**70)] * 3
+
+
+def test_overflow() -> None:
+    """Tests that MoneyArray falls back to exact ints instead of wrapping."""
+    array = MoneyArray([INT64_MAX, 1])
+    assert array.is_packed()
+
+    grown = array + MoneyArray([INT64_MAX, 1])
+    assert not grown.is_packed()
+    assert list(grown) == [Money(2 * INT64_MAX), Money(2)]
+
+    assert list(array * 4) == [Money(4 * INT64_MAX), Money(4)]
+    assert list(array - Money(-1)) == [Money(INT64_MAX + 1), Money(2)]
+    assert array.sum() == Money(INT64_MAX + 1)
+    assert list(array.grow_and_round(3.0)) == [
+        Money(INT64_MAX).grow_and_round(3.0),
+        Money(3),
+    ]
+
+    shrunk = grown - MoneyArray([INT64_MAX, 0])
+    assert shrunk.is_packed()
+    assert list(shrunk) == [Money(INT64_MAX), Money(2)]
+
+    huge = MoneyArray([2**70, -(2**70)])
+    assert not huge.is_packed()
+    assert huge.max() == Money(2**70)
+    assert huge.sum() == Money.ZERO
+    assert list(huge.grow_and_round(0.5)) == [
+        Money(2**70).grow_and_round(0.5),
+        Money(-(2**70)).grow_and_round(0.5),
+    ]
+
+
+def test_parse() -> None:
+    """Tests that MoneyArray.parse matches Money.parse."""
+    strings = [
+        "$100",
+        "$0.34",
+        "$0",
+        "-$0",
+        "-$923.60",
+        "-$0.46",
+        "  $12.05\r",
+        " $7.00",
+        "$0005.01",
+        "$99999999999999999999.99",
+    ]
+    expected = [Money.parse(string) for string in strings]
+    assert list(MoneyArray.parse(strings)) == expected
+    assert list(MoneyArray.parse(iter(strings))) == expected
+    assert list(MoneyArray.parse("\n".join(strings).encode())) == expected
+    assert list(MoneyArray.parse(f"{strings[0]}\n".encode())) == expected[:1]
+    assert len(MoneyArray.parse([])) == 0
+    assert len(MoneyArray.parse(b"")) == 0
+    assert list(MoneyArray.parse(["$1\n", "$2"])) == [Money.of(1), Money.of(2)]
+
+
+def test_parse_exception() -> None:
+    """Tests that MoneyArray.parse reports the row of invalid values."""
+    invalid = ["$", "$.50", "$5.5", "5", "$5.5.5", "- $5", "$ 5", "$1a", ""]
+    for string in invalid:
+        with raises(ValueError) as money_error:
+            Money.parse(string)
+        with raises(ValueError) as array_error:
+            MoneyArray.parse(["$1", "$2.00", string, "$3"])
+        assert str(array_error.value) == f"Row 2: {money_error.value}"
+        with raises(ValueError) as bytes_error:
+            MoneyArray.parse(f"$1\n$2.00\n{string}\n$3\n".encode())
+        assert str(bytes_error.value) == f"Row 2: {money_error.value}"
+
+    with raises(ValueError, match="Row 1: "):
+        MoneyArray.parse(b"$1\n$\xff\n")
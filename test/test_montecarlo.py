@@ -0,0 +1,122 @@
+"""Tests of src/simulate/montecarlo.py."""
+
+import numpy as np
+from pytest import CaptureFixture, raises
+
+from finances import Money
+from simulate.errors import SimulationParameterError
+from simulate.montecarlo import (
+    BLOCK_PATHS,
+    block_generator,
+    format_summary,
+    LognormalGrowth,
+    MonteCarloConfig,
+    MonteCarloResult,
+    run_monte_carlo,
+    summarize_monte_carlo,
+)
+from simulate.simulation import BasicSimulation
+
+
+def test_run_monte_carlo() -> None:
+    """Tests that paths grow by their block's random factors."""
+    config = MonteCarloConfig(
+        2024, 2029, Money.of(1000, 1), BLOCK_PATHS + 3, LognormalGrowth(), 5
+    )
+    result = run_monte_carlo(config)
+    assert result.balances.shape == (6, BLOCK_PATHS + 3)
+    assert (result.balances[0] == 100001).all()
+
+    # Check the first and last paths against Money arithmetic
+    mean, deviation = config.growth.log_parameters()
+    for block, count, column in ((0, BLOCK_PATHS, 0), (1, 3, 2)):
+        factors = np.exp(
+            block_generator(5, block).standard_normal((5, count)) * deviation
+            + mean
+        )
+        balance = config.starting_balance
+        expected = [balance]
+        for factor in factors[:, column]:
+            balance = balance.grow_and_round(float(factor))
+            expected.append(balance)
+        path = result.balances[:, block * BLOCK_PATHS + column]
+        assert [Money(int(cents)) for cents in path] == expected
+
+    # The same seed gives the same paths
+    assert (run_monte_carlo(config).balances == result.balances).all()
+
+    bands = result.percentile_bands((5, 50, 95))
+    assert bands.shape == (6, 3)
+    assert (bands[:, 0] <= bands[:, 1]).all() and (
+        bands[:, 1] <= bands[:, 2]
+    ).all()
+    assert result.final_percentile(50) == Money(int(bands[-1, 1]))
+    # The mean growth factor is close to growth_rate
+    assert abs(result.final_balances().mean() / 100001 - 1.07**5) < 0.01
+
+
+def test_invalid_configs() -> None:
+    """Tests that invalid parameters are rejected."""
+    with raises(SimulationParameterError):
+        MonteCarloConfig(2025, 2024, Money.ZERO, 1)
+    with raises(SimulationParameterError):
+        MonteCarloConfig(2024, 2025, Money.ZERO, 0)
+    with raises(SimulationParameterError):
+        MonteCarloConfig(2024, 2025, Money.ZERO, 1, seed=-1)
+    with raises(SimulationParameterError):
+        LognormalGrowth(0.0)
+    with raises(SimulationParameterError):
+        LognormalGrowth(1.05, -0.1)
+    with raises(SimulationParameterError):
+        run_monte_carlo(
+            MonteCarloConfig(0, 1000, Money.of(1), 10, LognormalGrowth(2.0))
+        )
+
+
+def test_basic_simulation(capsys: CaptureFixture[str]) -> None:
+    """Tests that BasicSimulation runs and prints its percentile bands."""
+    simulation = BasicSimulation(
+        2024, 2026, Money.of(100), LognormalGrowth(1.1, 0.0)
+    )
+    simulation.run(10, seed=1)
+    assert isinstance(simulation.result, MonteCarloResult)
+    assert list(simulation.result.final_balances()) == [12100] * 10
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Balance starting at $100.00"
+    assert lines[-1].split()[:2] == ["2026", "$121.00"]
+
+
+def test_workers() -> None:
+    """Tests that results do not depend on the number of workers."""
+    config = MonteCarloConfig(2024, 2027, Money.of(500), 2 * BLOCK_PATHS + 7)
+    expected = run_monte_carlo(config).balances
+    for workers in (1, 3):
+        assert (run_monte_carlo(config, workers).balances == expected).all()
+    with raises(SimulationParameterError):
+        run_monte_carlo(config, -1)
+
+
+def test_summarize_monte_carlo() -> None:
+    """Tests that summaries estimate the percentiles of full results."""
+    config = MonteCarloConfig(2024, 2030, Money.of(1000), 5000, seed=3)
+    result = run_monte_carlo(config)
+    summary = summarize_monte_carlo(config)
+    assert summary.sketch.is_exact()
+    assert (summary.percentile_bands() == result.percentile_bands()).all()
+    assert summary.final_percentile(50) == result.final_percentile(50)
+    assert format_summary(summary) == format_summary(result)
+
+    config = MonteCarloConfig(2024, 2030, Money.of(1000), BLOCK_PATHS + 5)
+    result = run_monte_carlo(config)
+    summary = summarize_monte_carlo(config, workers=2)
+    assert not summary.sketch.is_exact()
+    assert summary.sketch.size() < 1000
+    for percentile in (5, 50, 95):
+        lower, upper = summary.final_percentile_bounds(percentile)
+        assert lower <= result.final_percentile(percentile) <= upper
+        assert lower <= summary.final_percentile(percentile) <= upper
+    # The summary does not depend on the number of workers
+    assert (
+        summarize_monte_carlo(config).percentile_bands()
+        == summary.percentile_bands()
+    ).all()
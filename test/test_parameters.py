@@ -0,0 +1,97 @@
+"""Tests of src/finances/tax/parameters.py."""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+from pytest import MonkeyPatch, raises
+
+from finances import Money
+from finances.tax import FilingStatus
+from finances.tax.federal.data import WAGE_BASE_LIMIT_BY_YEAR
+from finances.tax.federal.income import BRACKETS_BY_YEAR
+from finances.tax.parameters import (
+    CACHE_DIR_VARIABLE,
+    cache_dir,
+    get_rate,
+    ParameterFile,
+    YearTable,
+)
+
+
+def _write_parameters(path: Path, version: int = 1) -> None:
+    contents: Dict[str, object] = {
+        "version": version,
+        "jurisdiction": "test",
+        "years": {"2021": {"rate": 0.5}, "2022": {"rate": 0.25}},
+    }
+    path.write_text(json.dumps(contents), encoding="utf-8")
+
+
+def test_year_table(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """Tests that years are built on demand."""
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, "")
+    path = tmp_path / "parameters.json"
+    _write_parameters(path)
+    table = YearTable(
+        ParameterFile(path, "test"), lambda raw: get_rate(raw, "rate")
+    )
+    assert 2021 in table
+    assert 2023 not in table
+    assert list(table) == [2021, 2022]
+    assert table.built_years() == []
+    assert table[2022] == 0.25
+    assert table.built_years() == [2022]
+    with raises(KeyError):
+        table[2023]  # pylint: disable=pointless-statement
+
+
+def test_cache(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """Tests that parsed files are cached and that bad caches are ignored."""
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(tmp_path / "cache"))
+    path = tmp_path / "parameters.json"
+    _write_parameters(path)
+    assert ParameterFile(path, "test").slice(2021) == {"rate": 0.5}
+    (cache_path,) = (tmp_path / "cache").iterdir()
+    assert f"-py{sys.version_info[0]}{sys.version_info[1]}-" in cache_path.name
+
+    cached = ParameterFile(path, "test")
+    assert cached.years() == [2021, 2022]
+    assert cached.slice(2022) == {"rate": 0.25}
+
+    cache_path.write_bytes(b"not marshal data")
+    assert ParameterFile(path, "test").slice(2021) == {"rate": 0.5}
+
+
+def test_cache_is_opt_in(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """Tests that nothing is cached unless a cache directory is configured."""
+    monkeypatch.delenv(CACHE_DIR_VARIABLE, raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert cache_dir() is None
+    path = tmp_path / "parameters.json"
+    _write_parameters(path)
+    assert ParameterFile(path, "test").slice(2021) == {"rate": 0.5}
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_version(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """Tests that data files with unknown versions are rejected."""
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, "")
+    path = tmp_path / "parameters.json"
+    _write_parameters(path, version=2)
+    with raises(ValueError, match="version 2"):
+        ParameterFile(path, "test").years()
+
+
+def test_federal_parameters() -> None:
+    """Tests the federal parameters loaded from the data file."""
+    assert WAGE_BASE_LIMIT_BY_YEAR[2022] == Money.of(147000)
+    brackets = BRACKETS_BY_YEAR[2022]
+    assert (
+        brackets[FilingStatus.SURVIVING_SPOUSE]
+        is brackets[FilingStatus.MARRIED_FILING_JOINTLY]
+    )
+    assert brackets[FilingStatus.SINGLE][-1].threshold == Money.ZERO
+    assert brackets[FilingStatus.SINGLE][0].marginal_rate == 0.37
@@ -0,0 +1,221 @@
+"""Tests of src/finances/tax/piecewise.py."""
+
+import random
+
+import numpy as np
+from pytest import raises
+
+from finances import (
+    Earnings,
+    EarningsTaxPolicy,
+    EarningsType,
+    Money,
+    MoneyArray,
+    TaxCategory,
+)
+from finances.tax import (
+    Bracket,
+    BracketTax,
+    compile_piecewise,
+    compile_tax,
+    CompositeTax,
+    FilingStatus,
+    FlatTax,
+    MaximumTax,
+    sweep,
+)
+from finances.tax.state.mi import MichiganIncomeTax
+
+from .helpers import DoubleTax, example_trees
+
+
+def _with_gross(template: Earnings, gross_income: Money) -> Earnings:
+    return Earnings(
+        gross_income,
+        template.adjustments,
+        template.deductions,
+        template.magi_additions,
+    )
+
+
+def test_compile_piecewise() -> None:
+    """Tests that piecewise taxes match the trees they were compiled from."""
+    template = Earnings(
+        Money.ZERO,
+        {
+            TaxCategory.FEDERAL: Money.of(3000),
+            TaxCategory.STATE: Money.of(1000),
+            TaxCategory.LOCAL: Money.ZERO,
+        },
+        {
+            TaxCategory.FEDERAL: Money.of(12950),
+            TaxCategory.STATE: Money.of(5000),
+        },
+        {TaxCategory.LOCAL: Money.of(500)},
+    )
+    generator = random.Random(8)
+    incomes = [
+        Money(generator.randrange(-(10**6), 10**8)) for _ in range(500)
+    ]
+    incomes += [Money.ZERO, Money.of(20000), Money.of(160200)]
+    for status in FilingStatus:
+        for tax in example_trees(status):
+            piecewise = compile_piecewise(tax, template)
+            compiled = compile_tax(tax)
+            expected = [
+                compiled.calculate(_with_gross(template, income))
+                for income in incomes
+            ]
+            assert [piecewise.tax(income) for income in incomes] == expected
+            assert piecewise.tax_many(MoneyArray.from_money(incomes)).equals(
+                MoneyArray.from_money(expected)
+            )
+            for start in piecewise.breakpoints():
+                for income in [start - Money(1), start]:
+                    assert piecewise.tax(income) == compiled.calculate(
+                        _with_gross(template, income)
+                    )
+
+
+def test_rates_and_breakpoints() -> None:
+    """Tests marginal rates, effective rates, and breakpoints."""
+    tax = CompositeTax(
+        [
+            BracketTax(
+                [
+                    Bracket(0.1, Money.of(0)),
+                    Bracket(0.2, Money.of(10000)),
+                ],
+                EarningsTaxPolicy(
+                    earnings_type=EarningsType.GROSS_INCOME,
+                    category=TaxCategory.FEDERAL,
+                ),
+            ),
+            FlatTax(
+                0.05,
+                EarningsTaxPolicy(
+                    earnings_type=EarningsType.GROSS_INCOME,
+                    category=TaxCategory.STATE,
+                    ceiling=Money.of(50000),
+                ),
+            ),
+        ]
+    )
+    piecewise = compile_piecewise(tax, Earnings(Money.ZERO, {}, {}, {}))
+    assert piecewise.breakpoints() == [
+        Money(1),
+        Money.of(10000) + Money(1),
+        Money.of(50000) + Money(1),
+    ]
+    assert piecewise.segment_count() == 4
+    assert piecewise.next_breakpoint(Money.of(20000)) == Money.of(
+        50000
+    ) + Money(1)
+    assert piecewise.next_breakpoint(Money.of(60000)) is None
+    assert piecewise.marginal_rate(Money.of(-5)) == 0.05
+    assert piecewise.marginal_rate(Money.of(5000)) == 0.1 + 0.05
+    assert piecewise.marginal_rate(Money.of(20000)) == 0.2 + 0.05
+    assert piecewise.marginal_rate(Money.of(60000)) == 0.2
+    assert piecewise.effective_rate(Money.ZERO) == 0.0
+    assert piecewise.effective_rate(Money.of(20000)) == 4000 / 20000
+    incomes = MoneyArray.from_money(
+        [Money.of(-5), Money.of(5000), Money.of(60000)]
+    )
+    assert piecewise.marginal_rate_many(incomes).tolist() == [
+        0.05,
+        0.1 + 0.05,
+        0.2,
+    ]
+    assert piecewise.effective_rate_many(incomes).tolist() == [
+        0.0,
+        piecewise.effective_rate(Money.of(5000)),
+        piecewise.effective_rate(Money.of(60000)),
+    ]
+
+
+def test_maximum_crossing() -> None:
+    """Tests that segments start where a maximum switches operands."""
+    policy = EarningsTaxPolicy(
+        earnings_type=EarningsType.GROSS_INCOME,
+        category=TaxCategory.FEDERAL,
+    )
+    tax = MaximumTax(
+        [
+            FlatTax(0.1, policy),
+            BracketTax([Bracket(0.3, Money.of(1000))], policy),
+        ]
+    )
+    piecewise = compile_piecewise(tax, Earnings(Money.ZERO, {}, {}, {}))
+    assert Money.of(1500) in piecewise.breakpoints()
+    assert piecewise.marginal_rate(Money.of(1499)) == 0.1
+    assert piecewise.marginal_rate(Money.of(1501)) == 0.3
+
+
+def test_compile_piecewise_exception() -> None:
+    """Tests that opaque taxes cannot be compiled into piecewise taxes."""
+    with raises(ValueError, match="Cannot compile DoubleTax"):
+        compile_piecewise(
+            DoubleTax(MichiganIncomeTax(2022)),
+            Earnings(Money.ZERO, {}, {}, {}),
+        )
+
+
+def test_sweep() -> None:
+    """Tests that sweeps match the per-income methods, in any chunk size."""
+    template = Earnings(
+        Money.ZERO,
+        dict.fromkeys(TaxCategory, Money.of(1000)),
+        dict.fromkeys(TaxCategory, Money.of(12950)),
+        dict.fromkeys(TaxCategory, Money.ZERO),
+    )
+    for tax in example_trees(FilingStatus.MARRIED_FILING_SEPARATELY):
+        piecewise = compile_piecewise(tax, template)
+        for start, stop, step in [
+            (Money.of(-3000), Money.of(400000), Money.of(997, 13)),
+            (Money.of(159000), Money.of(161000), Money(1)),
+        ]:
+            chunks = list(piecewise.sweep(start, stop, step, 1000))
+            assert all(len(chunk.taxes) <= 1000 for chunk in chunks)
+            gross = np.concatenate(
+                [chunk.gross_incomes.all_cents() for chunk in chunks]
+            )
+            assert gross.tolist() == list(
+                range(start.all_cents(), stop.all_cents(), step.all_cents())
+            )
+            incomes = MoneyArray(gross)
+            assert (
+                np.concatenate(
+                    [
+                        chunk.taxes.all_cents()
+                        for chunk in sweep(tax, template, start, stop, step)
+                    ]
+                ).tolist()
+                == piecewise.tax_many(incomes).all_cents().tolist()
+            )
+            assert (
+                np.concatenate(
+                    [chunk.taxes.all_cents() for chunk in chunks]
+                ).tolist()
+                == piecewise.tax_many(incomes).all_cents().tolist()
+            )
+            assert np.array_equal(
+                np.concatenate([chunk.marginal_rates for chunk in chunks]),
+                piecewise.marginal_rate_many(incomes),
+            )
+            assert np.array_equal(
+                np.concatenate([chunk.effective_rates for chunk in chunks]),
+                piecewise.effective_rate_many(incomes),
+            )
+
+    piecewise = compile_piecewise(
+        example_trees(FilingStatus.SINGLE)[0], template
+    )
+    assert not list(piecewise.sweep(Money.of(5), Money.of(5), Money(1)))
+    (chunk,) = piecewise.sweep(Money(2**62), Money(2**62 + 3), Money(1))
+    assert list(chunk.taxes) == [
+        piecewise.tax(Money(2**62 + offset)) for offset in range(3)
+    ]
+    with raises(ValueError):
+        next(piecewise.sweep(Money.ZERO, Money.of(5), Money.ZERO))
+    with raises(ValueError):
+        next(piecewise.sweep(Money.ZERO, Money.of(5), Money(1), 0))
@@ -1,5 +1,6 @@
 """Tests of src/simulate/probability.py."""
 
+import pickle
 from fractions import Fraction
 
 from simulate.probability import Probability
@@ -46,3 +47,12 @@ def test_multiply() -> None:
     assert Probability(Fraction(21, 24)) * Probability(
         Fraction(15, 29)
     ) == Probability(Fraction(105, 232))
+
+
+def test_compact() -> None:
+    """Tests that Probability is slotted and still picklable."""
+    half = Probability(Fraction(1, 2))
+    assert not hasattr(half, "__dict__")
+    restored: Probability = pickle.loads(pickle.dumps(half))
+    assert restored == half
+    assert half * half < half
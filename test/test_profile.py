@@ -0,0 +1,115 @@
+"""Tests of src/finances/tax/profile.py."""
+
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Dict, List
+
+from finances import Earnings, EarningsBatch
+from finances.tax import (
+    CompositeTax,
+    FederalIncomeTax,
+    FICATax,
+    FilingStatus,
+    TaxProfiler,
+)
+from finances.tax.state.mi import MichiganIncomeTax
+
+from .helpers import random_earnings
+
+
+def test_profiler() -> None:
+    """Tests that profiles record each tax and that wrappers are removed."""
+    generator = random.Random(19)
+    earnings = [random_earnings(generator) for _ in range(10)]
+    # Fresh copies, whose derived tables are empty
+    generator = random.Random(19)
+    fresh = [random_earnings(generator) for _ in range(10)]
+    fica = FICATax(2022, FilingStatus.SINGLE)
+    tax = CompositeTax(
+        [
+            FederalIncomeTax(2022, FilingStatus.SINGLE),
+            fica,
+            MichiganIncomeTax(2022),
+        ]
+    )
+    expected = [tax.calculate(each) for each in earnings]
+    taxable_income = Earnings.taxable_income
+    taxable_incomes = EarningsBatch.taxable_income
+
+    with TaxProfiler(tax) as profiler:
+        assert [tax.calculate(each) for each in fresh] == expected
+        assert list(tax.calculate_many(fresh)) == expected
+
+    # Nothing is left in the call path
+    for node in [tax, fica, *tax.taxes, *fica.taxes]:
+        attributes: Dict[str, object] = vars(node)
+        assert "calculate" not in attributes
+        assert "calculate_many" not in attributes
+    assert Earnings.taxable_income is taxable_income
+    assert EarningsBatch.taxable_income is taxable_incomes
+
+    root = profiler.root
+    assert (root.calls, root.taxpayers) == (11, 20)
+    assert [child.name for child in root.children] == [
+        "FederalIncomeTax",
+        "FICATax",
+        "MichiganIncomeTax",
+    ]
+    social_security, medicare = root.children[1].children
+    assert (social_security.calls, social_security.taxpayers) == (11, 20)
+    # Medicare shares social security's gross income, so it only recomputes
+    # batches
+    assert (social_security.lookups, social_security.recomputations) == (11, 11)
+    assert (medicare.lookups, medicare.recomputations) == (11, 1)
+    assert root.lookups == 0
+    assert 0 <= root.self_seconds <= root.total_seconds
+
+    assert "    MedicareTax" in profiler.report().splitlines()[-2]
+    tree: Dict[str, List[Dict[str, List[object]]]] = json.loads(
+        profiler.to_json()
+    )
+    assert tree["children"][1]["children"][1] == medicare.to_dict()
+
+
+def test_overlapping_profilers() -> None:
+    """Tests profilers that overlap, share taxes, or run in other threads."""
+    generator = random.Random(23)
+    earnings = [random_earnings(generator) for _ in range(5)]
+    fica = FICATax(2022, FilingStatus.SINGLE)
+    tax = CompositeTax([FederalIncomeTax(2022, FilingStatus.SINGLE), fica])
+    expected = [tax.calculate(each) for each in earnings]
+    expected_fica = [fica.calculate(each) for each in earnings]
+    # An instance attribute that the profilers must put back
+    calculate_many = fica.calculate_many
+    setattr(fica, "calculate_many", calculate_many)
+
+    outer = TaxProfiler(tax)
+    inner = TaxProfiler(fica)
+    outer_scope, inner_scope = ExitStack(), ExitStack()
+    outer_scope.enter_context(outer)
+    inner_scope.enter_context(inner)
+    assert list(tax.calculate_many(earnings)) == expected
+    # Calls in other threads run through the wrappers without being recorded
+    with ThreadPoolExecutor(1) as executor:
+        assert executor.submit(tax.calculate, earnings[0]).result() == (
+            expected[0]
+        )
+    # The outer profiler exits first, but the inner one keeps recording
+    outer_scope.close()
+    assert [fica.calculate(each) for each in earnings] == expected_fica
+    inner_scope.close()
+
+    attributes: Dict[str, object] = vars(fica)
+    assert attributes["calculate_many"] is calculate_many
+    assert "calculate" not in attributes
+    attributes = vars(tax)
+    assert "calculate" not in attributes
+
+    assert (outer.root.calls, outer.root.taxpayers) == (1, 5)
+    assert (outer.root.children[1].calls, inner.root.calls) == (1, 6)
+    assert inner.root.taxpayers == 10
+    social_security = outer.root.children[1].children[0]
+    assert social_security.lookups == 1
+    assert inner.root.children[0].lookups == 6
@@ -1,5 +1,7 @@
 """Tests of src/finances/utilities/range.py."""
 
+import pickle
+
 from pytest import raises
 
 from finances import Money
@@ -176,3 +178,12 @@ def test_union() -> None:
         to_be=Range(Range.NEGATIVE_INFINITY, Range.POSITIVE_INFINITY),
     )
     expect_union(Range(1, 5), Range(1, 5), to_be=Range(1, 5))
+
+
+def test_compact() -> None:
+    """Tests that Range is slotted and still picklable."""
+    money_range = Range(Money.of(3), Range.POSITIVE_INFINITY)
+    assert not hasattr(money_range, "__dict__")
+    restored: Range[Money] = pickle.loads(pickle.dumps(money_range))
+    assert restored == money_range
+    assert Range(0, 3).intersection(Range(5, 8)) == Range(5, 5)
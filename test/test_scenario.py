@@ -0,0 +1,113 @@
+"""Tests of src/finances/tax/scenario.py."""
+
+import random
+from typing import List, Mapping, Optional
+
+from finances import Earnings, EarningsTaxPolicy, EarningsType, Money
+from finances import TaxCategory
+from finances.tax import (
+    CompositeTax,
+    FederalIncomeTax,
+    FICATax,
+    FilingStatus,
+    FlatTax,
+    MaximumTax,
+    Scenario,
+)
+from finances.tax.state.mi import MichiganIncomeTax
+
+from .helpers import DoubleTax, example_trees, random_earnings
+
+
+class _CountingTax(FlatTax):
+    """A flat tax that counts how many times it is levied."""
+
+    def __init__(self, rate: float, policy: EarningsTaxPolicy):
+        super().__init__(rate, policy)
+        self.count = 0
+
+    def calculate_on_taxable_cents(self, taxable_cents: int) -> int:
+        """Counts the call, then calculates the tax."""
+        self.count += 1
+        return super().calculate_on_taxable_cents(taxable_cents)
+
+
+def test_scenario() -> None:
+    """Tests that scenarios match their trees after random updates."""
+    generator = random.Random(17)
+    for status in FilingStatus:
+        trees = example_trees(status) + [
+            CompositeTax(
+                [DoubleTax(MichiganIncomeTax(2022)), FICATax(2022, status)]
+            )
+        ]
+        for tax in trees:
+            baseline = random_earnings(generator)
+            scenario = Scenario(tax, baseline)
+            assert scenario.total() == tax.calculate(baseline)
+            for _ in range(30):
+                other = random_earnings(generator)
+                category = generator.choice(list(TaxCategory))
+                # Adjustments, deductions, MAGI additions, or gross income
+                component = generator.randrange(4)
+                if component == 3:
+                    scenario.update(gross_income=other.gross_income)
+                else:
+                    updates: List[Optional[Mapping[TaxCategory, Money]]] = [
+                        None
+                    ] * 3
+                    updates[component] = {category: other.deductions[category]}
+                    scenario.update(None, *updates)
+                expected = tax.calculate(scenario.earnings)
+                assert scenario.total() == expected
+                assert scenario.delta() == expected - tax.calculate(baseline)
+            scenario.reset()
+            assert scenario.total() == scenario.baseline()
+            assert not scenario.deltas()
+
+
+def test_dependencies() -> None:
+    """Tests that only the taxes that depend on a changed input are levied."""
+    federal = FederalIncomeTax(2022, FilingStatus.SINGLE)
+    state = _CountingTax(
+        0.0425,
+        EarningsTaxPolicy(EarningsType.AGI_WITH_DEDUCTIONS, TaxCategory.STATE),
+    )
+    local = _CountingTax(
+        0.01, EarningsTaxPolicy(EarningsType.MAGI, TaxCategory.LOCAL)
+    )
+    fica = FICATax(2022, FilingStatus.SINGLE)
+    tax = CompositeTax([federal, MaximumTax([state, local]), fica])
+    earnings = Earnings(
+        Money.of(100000),
+        dict.fromkeys(TaxCategory, Money.ZERO),
+        dict.fromkeys(TaxCategory, Money.of(10000)),
+        dict.fromkeys(TaxCategory, Money.ZERO),
+    )
+    scenario = Scenario(tax, earnings)
+    assert scenario.dependents("deductions", TaxCategory.FEDERAL) == [federal]
+    assert scenario.dependents("adjustments", TaxCategory.LOCAL) == [local]
+    assert len(scenario.dependents("gross_income")) == 5
+
+    state.count = local.count = 0
+    scenario.update(deductions={TaxCategory.FEDERAL: Money.of(20000)})
+    assert (state.count, local.count) == (0, 0)
+    assert scenario.deltas() == [
+        (tax, Money(-221850)),
+        (federal, Money(-221850)),
+    ]
+
+    # Unchanged inputs are not recalculated
+    scenario.update(deductions={TaxCategory.STATE: Money.of(10000)})
+    assert state.count == 0
+
+    scenario.update(magi_additions={TaxCategory.LOCAL: Money.of(500)})
+    assert (state.count, local.count) == (0, 1)
+    assert scenario.total() == tax.calculate(scenario.earnings)
+
+    scenario.commit()
+    assert scenario.delta() == Money.ZERO
+    assert scenario.baseline_earnings is scenario.earnings
+    scenario.update(gross_income=Money.of(90000))
+    assert (state.count, local.count) == (1, 2)
+    assert scenario.total() == tax.calculate(scenario.earnings)
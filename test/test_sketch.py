@@ -0,0 +1,71 @@
+"""Tests of src/simulate/sketch.py."""
+
+import numpy as np
+from pytest import raises
+
+from simulate.errors import SimulationParameterError
+from simulate.sketch import QuantileSketch
+
+_PERCENTILES = (0, 1, 5, 25, 50, 75, 95, 99, 100)
+
+
+def test_exact() -> None:
+    """Tests that small sketches match numpy.percentile exactly."""
+    values = np.random.default_rng(3).integers(-(10**9), 10**9, (4, 1000))
+    sketch = QuantileSketch(4, exact_limit=1000)
+    for start in range(0, 1000, 300):
+        sketch.update(values[:, start : start + 300])
+    assert sketch.is_exact() and sketch.rank_error() == 0.0
+    expected = np.percentile(values, _PERCENTILES, axis=1).T
+    assert (sketch.percentiles(_PERCENTILES) == expected).all()
+    lower, upper = sketch.percentile_bounds(_PERCENTILES)
+    assert (lower == expected).all() and (upper == expected).all()
+
+
+def test_rank_error() -> None:
+    """Tests that estimates are within the rank error of the true ranks."""
+    generator = np.random.default_rng(5)
+    values = generator.lognormal(15.0, 1.0, (3, 200000)).astype(np.int64)
+    sketch = QuantileSketch(3, accuracy=100, exact_limit=0, seed=1)
+    for start in range(0, 200000, 30000):
+        sketch.update(values[:, start : start + 30000])
+    assert sketch.count == 200000 and not sketch.is_exact()
+    # Memory depends on the accuracy, not the number of values
+    assert sketch.size() < 400
+
+    estimates = sketch.percentiles(_PERCENTILES)
+    for row in range(3):
+        ranks = np.searchsorted(
+            np.sort(values[row]), estimates[row], side="right"
+        )
+        errors = np.abs(ranks / 200000 - np.array(_PERCENTILES) / 100)
+        assert errors.max() <= sketch.rank_error()
+    lower, upper = sketch.percentile_bounds(_PERCENTILES)
+    exact = np.percentile(values, _PERCENTILES, axis=1).T
+    assert (lower <= exact).all() and (exact <= upper).all()
+
+
+def test_merge() -> None:
+    """Tests that merged sketches are as accurate as one sketch."""
+    values = np.random.default_rng(7).integers(0, 10**6, (2, 100000))
+    merged = QuantileSketch(2, exact_limit=50000, seed=2)
+    merged.update(values[:, :50000])
+    assert merged.is_exact()
+    other = QuantileSketch(2, exact_limit=50000, seed=3)
+    other.update(values[:, 50000:])
+    merged.merge(other)
+    assert merged.count == 100000 and not merged.is_exact()
+    assert merged.size() < 1000
+    medians = merged.percentiles((50,))[:, 0]
+    for row in range(2):
+        rank = (values[row] <= medians[row]).mean()
+        assert abs(rank - 0.5) <= merged.rank_error()
+
+    with raises(SimulationParameterError):
+        merged.merge(QuantileSketch(2, accuracy=100, exact_limit=50000))
+    with raises(SimulationParameterError):
+        merged.update(values[0])
+    with raises(SimulationParameterError):
+        merged.update(np.zeros((3, 1), dtype=np.int64))
+    with raises(SimulationParameterError):
+        QuantileSketch(1).percentiles((50,))
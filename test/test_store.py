@@ -0,0 +1,97 @@
+"""Tests of src/simulate/store.py."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+from pytest import raises
+
+from finances import Money
+from simulate.errors import SimulationParameterError
+from simulate.montecarlo import BLOCK_PATHS, MonteCarloConfig, run_monte_carlo
+from simulate.simulation import BasicSimulation
+from simulate.store import metadata_path, open_balances, store_monte_carlo
+
+
+def test_store_monte_carlo(tmp_path: Path) -> None:
+    """Tests that stores hold the same balances as in-memory results."""
+    config = MonteCarloConfig(
+        2024, 2028, Money.of(250), BLOCK_PATHS + 9, seed=4
+    )
+    expected = run_monte_carlo(config).balances
+    path = tmp_path / "balances.npy"
+    store = store_monte_carlo(config, path, workers=2)
+    assert store.complete and store.config == config
+    assert isinstance(store.balances, np.memmap)
+    assert store.balances.shape == (5, BLOCK_PATHS + 9, 1)
+    assert (store.balances[:, :, 0] == expected).all()
+    assert (store.year(2026)[:, 0] == expected[2]).all()
+    for year in (2023, 2029):
+        with raises(SimulationParameterError):
+            store.year(year)
+    assert (store.path_balances(BLOCK_PATHS + 3)[:, 0] == expected[:, -6]).all()
+    for path_index in (-1, BLOCK_PATHS + 9):
+        with raises(SimulationParameterError):
+            store.path_balances(path_index)
+    assert (
+        store.result().percentile_bands()
+        == run_monte_carlo(config).percentile_bands()
+    ).all()
+
+    # The file is a plain .npy file, described by its metadata
+    assert (np.load(path)[:, :, 0] == expected).all()
+    metadata = json.loads(metadata_path(path).read_text(encoding="utf-8"))
+    assert metadata["units"] == "cents"
+    assert metadata["config"]["seed"] == 4
+    assert metadata["years"] == [2024, 2025, 2026, 2027, 2028]
+    assert metadata_path(path) == tmp_path / "balances.npy.json"
+
+    # A store whose name ends in .json does not overwrite its own metadata
+    other = tmp_path / "balances.json"
+    assert (
+        store_monte_carlo(config, other).balances == expected[..., None]
+    ).all()
+    assert (open_balances(other).balances == store.balances).all()
+
+    reopened = open_balances(path)
+    assert reopened.config == config
+    assert (reopened.balances == store.balances).all()
+
+
+def test_invalid_stores(tmp_path: Path) -> None:
+    """Tests that stores without matching metadata are rejected."""
+    path = tmp_path / "balances.npy"
+    np.save(path, np.zeros((2, 3, 1), dtype=np.int64))
+    with raises(SimulationParameterError):
+        open_balances(path)
+    store_monte_carlo(MonteCarloConfig(2024, 2025, Money.of(1), 4), path)
+    np.save(path, np.zeros((2, 3, 1), dtype=np.int64))
+    with raises(SimulationParameterError):
+        open_balances(path)
+    metadata_path(path).write_text("[]", encoding="utf-8")
+    with raises(SimulationParameterError):
+        open_balances(path)
+
+    # Balances that are missing or are not a .npy file
+    store_monte_carlo(MonteCarloConfig(2024, 2025, Money.of(1), 4), path)
+    path.write_bytes(b"not an array")
+    with raises(SimulationParameterError):
+        open_balances(path)
+    path.unlink()
+    with raises(SimulationParameterError):
+        open_balances(path)
+
+
+def test_basic_simulation_store(tmp_path: Path) -> None:
+    """Tests that BasicSimulation can store its paths on disk."""
+    simulation = BasicSimulation(2024, 2026, Money.of(100))
+    simulation.store_path = tmp_path / "balances.npy"
+    simulation.run(20, seed=2)
+    assert simulation.result is not None
+    expected = run_monte_carlo(
+        MonteCarloConfig(2024, 2026, Money.of(100), 20, seed=2)
+    )
+    assert (
+        simulation.result.percentile_bands() == expected.percentile_bands()
+    ).all()
+    assert open_balances(simulation.store_path).complete
@@ -0,0 +1,101 @@
+"""Tests of src/finances/bench/suite.py."""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+from pytest import CaptureFixture, raises
+
+from finances.bench.suite import (
+    Case,
+    CaseResult,
+    compare,
+    load_baseline,
+    main,
+    measure,
+    run_suite,
+    to_baseline,
+)
+from simulate.bench import suite_cases
+
+
+def test_baseline() -> None:
+    """Tests that baselines round-trip and that regressions are flagged."""
+    baseline = {
+        "fast": CaseResult(1000.0, 10, 100),
+        "lean": CaseResult(1000.0, 10, 100),
+        "small": CaseResult(1000.0, 0, 0),
+        "removed": CaseResult(1000.0, 10, 100),
+    }
+    assert load_baseline(json.dumps(to_baseline(baseline))) == baseline
+    with raises(ValueError):
+        load_baseline('{"results": {"fast": {"peak_bytes": 1}}}')
+    with raises(ValueError):
+        load_baseline(
+            '{"results": {"fast": '
+            '{"operations_per_second": 1, "peak_bytes": 1}}}'
+        )
+    with raises(ValueError):
+        load_baseline("[]")
+    for speed, retained_blocks, peak in [
+        (0, 1, 1),
+        (-1.5, 1, 1),
+        (float("nan"), 1, 1),
+        (True, 1, 1),
+        (1, -1, 1),
+        (1, 1, -1),
+    ]:
+        entry: Dict[str, object] = {
+            "operations_per_second": speed,
+            "retained_blocks": retained_blocks,
+            "peak_bytes": peak,
+        }
+        document: Dict[str, object] = {"results": {"fast": entry}}
+        with raises(ValueError, match="for fast"):
+            load_baseline(json.dumps(document))
+
+    current = {
+        "fast": CaseResult(700.0, 10, 100),
+        "lean": CaseResult(900.0, 100, 2000),
+        # Growth from nothing is only flagged above the floors
+        "small": CaseResult(1000.0, 8, 1024),
+        "added": CaseResult(1.0, 10**6, 10**9),
+    }
+    assert compare(baseline, current, 0.2) == [
+        "fast: 30% slower",
+        "lean: retained blocks grew from 10 to 100",
+        "lean: peak memory grew from 100 to 2000 bytes",
+    ]
+    assert not compare(baseline, current, 20.0)
+    current["small"] = CaseResult(1000.0, 9, 1025)
+    assert compare(baseline, current, 20.0) == [
+        "small: retained blocks grew from 0 to 9",
+        "small: peak memory grew from 0 to 1025 bytes",
+    ]
+
+
+def test_measure() -> None:
+    """Tests that measure counts operations and memory."""
+    result = measure(Case("list", lambda: [0] * 1000, 1000), repeat=1)
+    assert result.operations_per_second > 0
+    assert result.retained_blocks >= 1
+    assert result.peak_bytes >= 8000
+
+    results = run_suite(["distribution.deep"], 1, suite_cases())
+    assert list(results) == ["distribution.deep"]
+
+
+def test_main_errors(tmp_path: Path, capsys: CaptureFixture[str]) -> None:
+    """Tests that invalid cases and baselines are reported, not raised."""
+    assert main(["bogus"]) == 1
+    assert capsys.readouterr().err == (
+        "python -m finances.bench suite: Unknown case bogus\n"
+    )
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        '{"results": {"money.add": {"operations_per_second": 0, '
+        '"retained_blocks": 0, "peak_bytes": 0}}}',
+        encoding="utf-8",
+    )
+    assert main(["money.add", "--compare", str(baseline)]) == 1
+    assert "Invalid speed for money.add" in capsys.readouterr().err
@@ -0,0 +1,101 @@
+"""Tests of src/finances/tax/system.py."""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+
+from pytest import raises
+
+from finances import Money
+from finances.tax import (
+    Bracket,
+    CacheStats,
+    CompositeTax,
+    FederalIncomeTax,
+    FICATax,
+    FilingStatus,
+    TaxSystem,
+)
+from finances.tax.state.mi import MichiganIncomeTax
+
+from .helpers import random_earnings
+
+
+def test_shared_taxes() -> None:
+    """Tests that taxes are built once and then shared."""
+    system = TaxSystem()
+    federal = system.federal_income_tax(2022, FilingStatus.SINGLE)
+    assert isinstance(federal, FederalIncomeTax)
+    assert system.federal_income_tax(2022, FilingStatus.SINGLE) is federal
+    assert system.federal_income_tax(2021, FilingStatus.SINGLE) is not federal
+    assert system.stats() == CacheStats(
+        hits=1, misses=2, evictions=0, size=2, max_size=1024
+    )
+
+    stack = system.income_taxes(2022, FilingStatus.SINGLE, "MI")
+    assert stack.taxes[0] is federal
+    assert isinstance(stack.taxes[1], MichiganIncomeTax)
+    assert isinstance(stack.taxes[2], FICATax)
+    # Shared stacks cannot be rearranged
+    assert isinstance(stack.taxes, tuple)
+    assert len(system.income_taxes(2022, FilingStatus.SINGLE, None).taxes) == 2
+
+    compiled = system.compiled_stack(2022, FilingStatus.SINGLE, "MI")
+    assert system.compiled_stack(2022, FilingStatus.SINGLE, "MI") is compiled
+    reference = CompositeTax(
+        [
+            FederalIncomeTax(2022, FilingStatus.SINGLE),
+            MichiganIncomeTax(2022),
+            FICATax(2022, FilingStatus.SINGLE),
+        ]
+    )
+    earnings = random_earnings(random.Random(11))
+    assert compiled.calculate(earnings) == reference.calculate(earnings)
+
+    system.clear()
+    assert system.stats().hit_rate() == 0.0
+    assert system.stats().size == 0
+
+
+def test_eviction() -> None:
+    """Tests that the least recently used tax is evicted first."""
+    system = TaxSystem(max_size=2)
+    single = system.fica_tax(2022, FilingStatus.SINGLE)
+    system.fica_tax(2022, FilingStatus.HEAD_OF_HOUSEHOLD)
+    assert system.fica_tax(2022, FilingStatus.SINGLE) is single
+    system.fica_tax(2021, FilingStatus.SINGLE)
+    assert system.stats().evictions == 1
+    assert system.fica_tax(2022, FilingStatus.SINGLE) is single
+    assert system.stats().hit_rate() == 2 / 5
+
+
+def test_threads() -> None:
+    """Tests that concurrent lookups keep the cache consistent."""
+    system = TaxSystem(max_size=3)
+    keys = [
+        (year, status, state)
+        for year in (2021, 2022)
+        for status in FilingStatus
+        for state in (None, "MI")
+    ]
+
+    def look_up(seed: int) -> None:
+        generator = random.Random(seed)
+        for _ in range(500):
+            system.compiled_stack(*generator.choice(keys))
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(look_up, range(8)))
+    stats = system.stats()
+    assert stats.hits + stats.misses >= 4000
+    assert stats.size == 3
+
+
+def test_exceptions() -> None:
+    """Tests unknown states and the immutability of brackets."""
+    with raises(ValueError, match="state ZZ"):
+        TaxSystem().state_income_tax(2022, "ZZ")
+    with raises(AssertionError):
+        TaxSystem(max_size=0)
+    with raises(FrozenInstanceError):
+        Bracket(0.1, Money.ZERO).marginal_rate = 0.2  # type: ignore[misc]
@@ -0,0 +1,70 @@
+"""Tests of the taxes in src/finances/tax/."""
+
+import random
+from typing import Callable, List, Mapping
+
+from finances import Earnings, EarningsBatch, Money, TaxCategory
+from finances.tax import (
+    compile_tax,
+    CompositeTax,
+    FederalIncomeTax,
+    FICATax,
+    FilingStatus,
+    IncomeTax,
+    MaximumTax,
+)
+from finances.tax.state.mi import MichiganIncomeTax
+
+from .helpers import random_earnings
+
+
+# The components of earnings that are split by category
+_COMPONENTS: List[Callable[[Earnings], Mapping[TaxCategory, Money]]] = [
+    lambda earnings: earnings.adjustments,
+    lambda earnings: earnings.deductions,
+    lambda earnings: earnings.magi_additions,
+]
+
+
+def test_calculate_many() -> None:
+    """Tests that calculate_many matches calculate for each kind of tax."""
+    generator = random.Random(42)
+    earnings = [random_earnings(generator) for _ in range(500)]
+    batch = EarningsBatch(
+        [each.gross_income.all_cents() for each in earnings],
+        *(
+            {
+                category: [
+                    component(each)[category].all_cents() for each in earnings
+                ]
+                for category in TaxCategory
+            }
+            for component in _COMPONENTS
+        ),
+    )
+    for year in [2021, 2022]:
+        for status in FilingStatus:
+            federal = FederalIncomeTax(year, status)
+            fica = FICATax(year, status)
+            state = MichiganIncomeTax(year)
+            taxes: List[IncomeTax] = [
+                federal,
+                fica,
+                state,
+                CompositeTax([federal, fica, state]),
+                MaximumTax([federal, state]),
+            ]
+            for tax in taxes:
+                assert list(tax.calculate_many(earnings)) == [
+                    tax.calculate(each) for each in earnings
+                ]
+                assert tax.calculate_many(batch).equals(
+                    tax.calculate_many(earnings)
+                )
+                assert (
+                    compile_tax(tax)
+                    .calculate_many(batch)
+                    .equals(tax.calculate_many(earnings))
+                )
+
+    assert len(CompositeTax([]).calculate_many(earnings)) == len(earnings)
@@ -0,0 +1,60 @@
+"""Tests of src/finances/value_array.py."""
+
+import numpy as np
+from pytest import raises
+
+from finances import Money, MoneyArray, Value, ValueArray
+
+CENTS = [0, 1, -1, 5, -5, 15, 25, -95366, 2200078, 123456789, -987654321]
+INFLATIONS = [0.0, 0.5, -0.25, 0.782, 0.1, 1.07, 3.0]
+
+
+def test_of_inflated_money() -> None:
+    """Tests that ValueArray.of_inflated_money matches Value's."""
+    money = MoneyArray(CENTS)
+    for inflation in INFLATIONS:
+        assert list(ValueArray.of_inflated_money(money, inflation)) == [
+            Value.of_inflated_money(Money(cents), inflation) for cents in CENTS
+        ]
+
+    per_element = np.linspace(-0.5, 2.0, num=len(CENTS))
+    assert list(ValueArray.of_inflated_money(money, per_element)) == [
+        Value.of_inflated_money(Money(cents), float(inflation))
+        for cents, inflation in zip(CENTS, per_element)
+    ]
+
+    huge = MoneyArray([2**70, 3])
+    assert list(ValueArray.of_inflated_money(huge, 0.5)) == [
+        Value.of_inflated_money(Money(2**70), 0.5),
+        Value.of_inflated_money(Money(3), 0.5),
+    ]
+
+    with raises(ZeroDivisionError):
+        ValueArray.of_inflated_money(money, -1.0)
+
+
+def test_inflate() -> None:
+    """Tests that ValueArray.inflate matches Value.inflate."""
+    values = ValueArray(CENTS)
+    for inflation in INFLATIONS:
+        assert list(values.inflate(inflation)) == [
+            Value(cents).inflate(inflation) for cents in CENTS
+        ]
+
+    per_element = np.linspace(-0.5, 2.0, num=len(CENTS))
+    assert list(values.inflate(per_element)) == [
+        Value(cents).inflate(float(inflation))
+        for cents, inflation in zip(CENTS, per_element)
+    ]
+
+
+def test_getitem() -> None:
+    """Tests the behavior of ValueArray.__getitem__."""
+    values = ValueArray([100, -250, 99])
+    assert values[0] == Value(100)
+    assert values[-1] == Value(99)
+    assert values[1:].equals(ValueArray([-250, 99]))
+    assert len(values) == 3
+    assert str(values) == (
+        "[$1.00 @ 2000-01-01, -$2.50 @ 2000-01-01, $0.99 @ 2000-01-01]"
+    )